@@ -18,11 +18,42 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-# TODO: Implement __init__.py
-def placeholder_function():
-    # TODO: Replace with actual code
-    pass
-
-# TODO: Content to be added
-# TODO: Content to be added
-# TODO: Content to be added
+"""
+Qiskit API package.
+
+The public functions are resolved on first attribute access so that
+``import Qiskit_API`` (and therefore every CLI invocation and worker cold
+start) does not pay for importing qiskit until a circuit is actually built.
+"""
+
+import importlib
+
+# Public name -> submodule that defines it
+_LAZY_ATTRIBUTES = {
+    'CheckpointStore': '.execute.checkpoint',
+    'create_quantum_circuit': '.qiskit_api',
+    'exact_expectation_values': '.execute.exact',
+    'exact_statevectors': '.execute.exact',
+    'render_circuit': '.visualizations.circuit',
+    'render_histogram': '.visualizations.results',
+    'resume_batch': '.execute.checkpoint',
+    'run_cut_circuit': '.execute.cutting',
+    'run_quantum_circuit': '.qiskit_api',
+    'visualize_circuit': '.qiskit_api',
+    'visualize_results': '.qiskit_api',
+}
+
+__all__ = sorted(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # Cache so later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
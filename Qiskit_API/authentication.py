@@ -21,10 +21,12 @@
 import bcrypt
 import secrets
 import logging
+import uuid
 
-# Setup basic logging configuration
-logging.basicConfig(filename='authentication.log', level=logging.INFO,
-                    format='%(asctime)s:%(levelname)s:%(message)s')
+from .metrics import AUTHENTICATIONS
+
+# Output is configured once per process by structured_logging.setup_logging
+logger = logging.getLogger('QiskitAPI.Authentication')
 
 # Simulated function for getting a user's hashed password (this would interact with a real database)
 def get_user_hashed_password_from_db(username):
@@ -41,10 +43,26 @@ def validate_credentials(username, password):
     # Use bcrypt to check provided password against the hashed password
     return bcrypt.checkpw(password.encode('utf-8'), hashed_password)
 
+# Issued session tokens mapped to their username (this would be a shared store in a real scenario)
+_session_tokens = {}
+
 # Creates a session token for the user (this would be stored and managed in a real scenario)
 def create_session_token(username):
     # Generate a unique session token using uuid4
-    return str(uuid.uuid4())
+    token = str(uuid.uuid4())
+    _session_tokens[token] = username
+    return token
+
+# Checks a session token, accepting either the bare token or an 'Authorization: Bearer <token>' value
+def authenticate_user(token):
+    if not token:
+        AUTHENTICATIONS.inc('missing')
+        return False
+    if token.startswith('Bearer '):
+        token = token[len('Bearer '):]
+    authenticated = token in _session_tokens
+    AUTHENTICATIONS.inc('accepted' if authenticated else 'rejected')
+    return authenticated
 
 # Generates a quantum-safe random number (simulated as a placeholder for a real quantum RNG)
 def quantum_safe_random():
@@ -53,7 +71,8 @@ def quantum_safe_random():
 
 # Log an authentication attempt
 def log_authentication_attempt(username, successful):
+    fields = {'event': 'authentication', 'username': username, 'successful': successful}
     if successful:
-        logging.info(f'User {username} authenticated successfully.')
+        logger.info(f'User {username} authenticated successfully.', extra=fields)
     else:
-        logging.error(f'Failed authentication attempt for user {username}.')
+        logger.error(f'Failed authentication attempt for user {username}.', extra=fields)
@@ -0,0 +1,90 @@
+def _backend_attribute(backend, name):
+    # BackendV1 exposes name()/configuration(); BackendV2 exposes plain attributes
+    value = getattr(backend, name)
+    return value() if callable(value) else value
+
+
+def backend_key(backend):
+    """
+    Identify a backend and its calibration, for caching circuits transpiled for it.
+
+    Unlike id(backend), the key is the same for backend objects re-fetched for one
+    device and cannot be reused by another backend once the object is collected.
+
+    Args:
+        backend (Backend): A BackendV1 or BackendV2 instance, or None.
+
+    Returns:
+        tuple: The backend name, version and calibration timestamp, or None without a backend.
+    """
+    if backend is None:
+        return None
+    if hasattr(backend, 'configuration'):
+        version = backend.configuration().backend_version
+    else:
+        version = getattr(backend, 'backend_version', None)
+    # Noise-aware layout depends on the calibration, so a new calibration is a new target
+    try:
+        properties = backend.properties() if hasattr(backend, 'properties') else None
+    except Exception:
+        properties = None
+    stamp = getattr(properties, 'last_update_date', None)
+    return _backend_attribute(backend, 'name'), version, None if stamp is None else str(stamp)
+
+
+def describe_backend(backend):
+    """
+    Summarize a backend in a JSON-serializable form.
+
+    Args:
+        backend (Backend): A BackendV1 or BackendV2 instance.
+
+    Returns:
+        dict: The backend name, qubit count, whether it is a simulator and whether it is operational.
+    """
+    if hasattr(backend, 'configuration'):
+        configuration = backend.configuration()
+        num_qubits = configuration.n_qubits
+        simulator = configuration.simulator
+    else:
+        num_qubits = backend.num_qubits
+        simulator = 'simulator' in _backend_attribute(backend, 'name')
+    try:
+        operational = backend.status().operational
+    except Exception:
+        operational = None
+    return {
+        'name': _backend_attribute(backend, 'name'),
+        'num_qubits': num_qubits,
+        'simulator': simulator,
+        'operational': operational,
+    }
+
+
+def get_backend_details(backend_name, token=None):
+    """
+    Retrieve details about a single local or IBM Quantum backend.
+
+    Args:
+        backend_name (str): Name of the backend.
+        token (str, optional): IBMQ token, required for IBM Quantum backends.
+
+    Returns:
+        dict: The backend summary, plus its basis gates when the backend publishes them.
+    """
+    if token:
+        from qiskit import IBMQ
+
+        IBMQ.enable_account(token)
+        backend = IBMQ.get_provider(hub='ibm-q').get_backend(backend_name)
+    else:
+        from qiskit import Aer
+
+        backend = Aer.get_backend(backend_name)
+
+    details = describe_backend(backend)
+    if hasattr(backend, 'configuration'):
+        details['basis_gates'] = backend.configuration().basis_gates
+    else:
+        details['basis_gates'] = sorted(backend.operation_names)
+    return details
@@ -0,0 +1,23 @@
+from .details import describe_backend
+
+
+def list_backends(token=None):
+    """
+    List the local Aer backends and, when a token is given, the IBM Quantum backends.
+
+    Args:
+        token (str, optional): IBMQ token for listing IBM Quantum backends.
+
+    Returns:
+        list: One summary dict per backend (see describe_backend), tagged with its provider.
+    """
+    from qiskit import Aer
+
+    backends = [dict(describe_backend(backend), provider='aer') for backend in Aer.backends()]
+    if token:
+        from qiskit import IBMQ
+
+        IBMQ.enable_account(token)
+        provider = IBMQ.get_provider(hub='ibm-q')
+        backends.extend(dict(describe_backend(backend), provider='ibmq') for backend in provider.backends())
+    return backends
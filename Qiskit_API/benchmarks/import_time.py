@@ -0,0 +1,118 @@
+"""
+Import-time benchmark for the Qiskit_API package.
+
+Each target is imported in a fresh interpreter with ``-X importtime`` so the
+numbers reflect a real cold start. The benchmark fails (exit status 1) when a
+target exceeds its time budget or eagerly imports one of the heavy modules
+that are supposed to load on first use.
+
+Usage (from the repository root):
+    python -m Qiskit_API.benchmarks.import_time [--repeat N] [--output FILE]
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Modules that must never be imported as a side effect of importing a target
+HEAVY_MODULES = (
+    'matplotlib',
+    'qiskit.visualization',
+    'qiskit_aer',
+    'qiskit.providers.aer',
+    'qiskit.providers.ibmq',
+    'qiskit_ibm_provider',
+)
+
+# Target module -> cumulative import time budget in milliseconds
+TARGETS = {
+    'Qiskit_API': 50,
+    'Qiskit_API.utilities': 50,
+    'Qiskit_API.qiskit_api': 3000,
+}
+
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s+(\s*)(\S+)$')
+
+
+def measure_import(module_name):
+    """
+    Imports a module in a fresh interpreter.
+
+    Parameters:
+        module_name (str): Dotted name of the module to import.
+
+    Returns:
+        dict: Cumulative import time in milliseconds and the heavy modules that got loaded.
+    """
+    probe = (
+        f"import sys, json, {module_name}\n"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', probe],
+        cwd=REPO_ROOT, capture_output=True, text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {module_name} failed:\n{completed.stderr.strip().splitlines()[-1]}")
+
+    cumulative_us = 0
+    for line in completed.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match and match.group(4) == module_name:
+            cumulative_us = int(match.group(2))
+    return {
+        'cumulative_ms': cumulative_us / 1000.0,
+        'heavy_modules': json.loads(completed.stdout.strip().splitlines()[-1]),
+    }
+
+
+def run_benchmark(targets=None, repeat=5):
+    """
+    Measures every target several times and checks it against its budget.
+
+    Parameters:
+        targets (dict): Module name -> budget in milliseconds (defaults to TARGETS).
+        repeat (int): Number of fresh-interpreter imports per target.
+
+    Returns:
+        list of dict: One report entry per target.
+    """
+    report = []
+    for module_name, budget_ms in (targets or TARGETS).items():
+        samples = [measure_import(module_name) for _ in range(repeat)]
+        median_ms = statistics.median(sample['cumulative_ms'] for sample in samples)
+        heavy_modules = sorted({name for sample in samples for name in sample['heavy_modules']})
+        report.append({
+            'module': module_name,
+            'median_ms': round(median_ms, 3),
+            'min_ms': round(min(sample['cumulative_ms'] for sample in samples), 3),
+            'budget_ms': budget_ms,
+            'heavy_modules': heavy_modules,
+            'passed': median_ms <= budget_ms and not heavy_modules,
+        })
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Qiskit API import-time benchmark')
+    parser.add_argument('--repeat', type=int, default=5, help='Fresh imports per target')
+    parser.add_argument('--output', type=str, help='Write the JSON report to this file')
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(repeat=args.repeat)
+    text = json.dumps(report, indent=4)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(text)
+    print(text)
+    return 0 if all(entry['passed'] for entry in report) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
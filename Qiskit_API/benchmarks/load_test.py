@@ -0,0 +1,362 @@
+"""
+Load-testing harness for the REST API.
+
+Worker threads send execute requests drawn from a weighted circuit mix, each
+worker sending its next request as soon as the previous one is answered, for
+a fixed number of requests or a fixed duration. The report gives throughput,
+p50/p95/p99 latency and status counts, overall and per mix entry. The
+benchmark fails (exit status 1) when throughput is below --min-rps or p99
+latency is above --max-p99.
+
+By default requests go through web_interface.app in-process. With
+--fake-latency the Aer backend is replaced by FakeExecutor, so the web, auth
+and rate-limit layers are measured without simulating circuits (and without
+needing qiskit). --url drives a running server instead. --serve starts the
+development server with the chosen backend, for a load generator on another
+machine to drive.
+
+Usage (from the repository root):
+    python -m Qiskit_API.benchmarks.load_test [--concurrency N] [--requests N | --duration S]
+        [--mix 2x10:5,8x50:3,16x100:1 | --mix-file FILE] [--fake-latency S [--fake-jitter S]]
+        [--clients N] [--no-rate-limit] [--url URL --token TOKEN] [--serve PORT]
+        [--min-rps R] [--max-p99 S] [--output FILE]
+"""
+
+import argparse
+import itertools
+import json
+import math
+import random
+import re
+import ssl
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter, defaultdict
+
+from Qiskit_API.benchmarks.suite import random_layers
+
+DEFAULT_MIX = '2x10:5,8x50:3,16x100:1'
+
+_QREG = re.compile(r'qreg\s+\w+\[(\d+)\]')
+
+
+class FakeExecutor:
+    """
+    Stand-in for the Aer backend of the execute endpoint.
+
+    Each call sleeps for the configured latency and returns all shots on the
+    all-zeros outcome. The qubit count is read from the OpenQASM qreg
+    declarations, so qiskit is never imported.
+
+    Attributes:
+        latency (float): Mean simulated execution time in seconds.
+        jitter (float): Half-width in seconds of the uniform noise added to the latency.
+        shots (int): Shots reported in the counts.
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, shots=1024, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.shots = shots
+        self._random = random.Random(seed)
+
+    def __call__(self, circuit_data):
+        delay = self.latency + (self._random.uniform(-self.jitter, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+        num_qubits = sum(int(size) for size in _QREG.findall(circuit_data['qasm']))
+        return {'0' * num_qubits: self.shots}
+
+
+def layers_qasm(num_qubits, depth):
+    """
+    Writes the random circuit of suite.random_layers as OpenQASM 2 without importing qiskit.
+
+    Parameters:
+        num_qubits (int): Number of qubits.
+        depth (int): Number of layers.
+
+    Returns:
+        str: The OpenQASM 2 source, measuring every qubit at the end.
+    """
+    lines = ['OPENQASM 2.0;', 'include "qelib1.inc";', f"qreg q[{num_qubits}];", f"creg c[{num_qubits}];"]
+    for name, qubits, params in zip(*random_layers(num_qubits, depth)):
+        arguments = ','.join(f"q[{qubit}]" for qubit in (qubits if isinstance(qubits, tuple) else (qubits,)))
+        lines.append(f"{name}({params[0]!r}) {arguments};" if params else f"{name} {arguments};")
+    lines.append('measure q -> c;')
+    return '\n'.join(lines) + '\n'
+
+
+def parse_mix(spec):
+    """
+    Parses a request mix of the form "QUBITSxDEPTH:WEIGHT,...".
+
+    Parameters:
+        spec (str): The mix, e.g. "2x10:5,16x100:1" (the weight defaults to 1).
+
+    Returns:
+        list of dict: Mix entries with a name, weight and request payload.
+    """
+    mix = []
+    for item in spec.split(','):
+        shape, _, weight = item.strip().partition(':')
+        num_qubits, depth = (int(value) for value in shape.split('x'))
+        mix.append({'name': shape, 'weight': float(weight or 1),
+                    'payload': {'circuit': {'qasm': layers_qasm(num_qubits, depth)}}})
+    return mix
+
+
+def load_mix(path):
+    """
+    Reads a request mix from a JSON file: a list of {"name", "weight", "payload"} objects.
+
+    Parameters:
+        path (str): Path of the JSON file.
+
+    Returns:
+        list of dict: The mix entries.
+    """
+    with open(path) as file:
+        mix = json.load(file)
+    for position, entry in enumerate(mix):
+        if 'payload' not in entry:
+            raise ValueError(f"Mix entry {position} has no payload")
+        entry.setdefault('name', f"entry{position}")
+        entry.setdefault('weight', 1)
+    return mix
+
+
+def _load_app(executor, rate_limit):
+    from Qiskit_API import web_interface
+
+    app = web_interface.app
+    # SSLify does not redirect testing apps to https
+    app.config['TESTING'] = True
+    if executor is not None:
+        app.config['CIRCUIT_EXECUTOR'] = executor
+    web_interface.limiter.enabled = rate_limit
+    return app
+
+
+def _session_token():
+    from Qiskit_API import authentication
+
+    return authentication.create_session_token('load-test')
+
+
+def in_process_sender(app, token, clients=1):
+    """
+    Builds a send function that posts to the app through per-thread Flask test clients.
+
+    Parameters:
+        app (Flask): The application.
+        token (str): Session token for the Authorization header.
+        clients (int): Number of distinct client addresses to spread requests over
+            (the rate limiter keys on the remote address).
+
+    Returns:
+        callable: send(payload) -> HTTP status code.
+    """
+    headers = {'Authorization': f"Bearer {token}"}
+    local = threading.local()
+    addresses = itertools.cycle(f"10.0.{index // 256}.{index % 256}" for index in range(clients))
+    lock = threading.Lock()
+
+    def send(payload):
+        client = getattr(local, 'client', None)
+        if client is None:
+            client = local.client = app.test_client()
+        with lock:
+            address = next(addresses)
+        response = client.post('/api/v1/execute', json=payload, headers=headers, base_url='https://localhost',
+                               environ_base={'REMOTE_ADDR': address})
+        return response.status_code
+    return send
+
+
+def http_sender(url, token, insecure=False):
+    """
+    Builds a send function that posts to a running server.
+
+    Parameters:
+        url (str): Base URL of the server, e.g. https://localhost:443.
+        token (str): Session token for the Authorization header.
+        insecure (bool): Skip TLS certificate verification.
+
+    Returns:
+        callable: send(payload) -> HTTP status code.
+    """
+    endpoint = url.rstrip('/') + '/api/v1/execute'
+    context = ssl._create_unverified_context() if insecure else None
+    headers = {'Authorization': f"Bearer {token}", 'Content-Type': 'application/json'}
+
+    def send(payload):
+        request = urllib.request.Request(endpoint, data=json.dumps(payload).encode('utf-8'), headers=headers,
+                                         method='POST')
+        try:
+            with urllib.request.urlopen(request, context=context) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+    return send
+
+
+def percentile(sorted_values, fraction):
+    """
+    Nearest-rank percentile of sorted values.
+
+    Parameters:
+        sorted_values (list): Values in ascending order.
+        fraction (float): Percentile as a fraction, e.g. 0.95.
+
+    Returns:
+        float: The percentile, or None for an empty list.
+    """
+    if not sorted_values:
+        return None
+    return sorted_values[max(1, math.ceil(len(sorted_values) * fraction)) - 1]
+
+
+def _summary(latencies, statuses):
+    latencies = sorted(latencies)
+    return {
+        'requests': len(latencies),
+        'p50_seconds': percentile(latencies, 0.50),
+        'p95_seconds': percentile(latencies, 0.95),
+        'p99_seconds': percentile(latencies, 0.99),
+        'max_seconds': latencies[-1] if latencies else None,
+        'status_counts': {str(status): count for status, count in sorted(statuses.items())},
+    }
+
+
+def run_load(send, mix, concurrency=8, requests=1000, duration=None, seed=1234):
+    """
+    Drives send with closed-loop worker threads and measures every request.
+
+    Parameters:
+        send (callable): send(payload) -> HTTP status code.
+        mix (list of dict): Mix entries with a name, weight and payload.
+        concurrency (int): Number of worker threads.
+        requests (int): Total number of requests (ignored when duration is given).
+        duration (float, optional): Run for this many seconds instead of a request count.
+        seed (int): Seed for drawing mix entries.
+
+    Returns:
+        dict: Throughput and latency summary, overall and per mix entry.
+    """
+    names = [entry['name'] for entry in mix]
+    payloads = [entry['payload'] for entry in mix]
+    weights = [entry['weight'] for entry in mix]
+    remaining = itertools.count()
+    lock = threading.Lock()
+    latencies = defaultdict(list)
+    statuses = defaultdict(Counter)
+    errors = Counter()
+
+    def worker(worker_index, deadline):
+        generator = random.Random(seed + worker_index)
+        local_latencies = defaultdict(list)
+        local_statuses = defaultdict(Counter)
+        while True:
+            if deadline is not None:
+                if time.perf_counter() >= deadline:
+                    break
+            elif next(remaining) >= requests:
+                break
+            index = generator.choices(range(len(mix)), weights)[0]
+            start = time.perf_counter()
+            try:
+                status = send(payloads[index])
+            except Exception as e:
+                status = 'error'
+                with lock:
+                    errors[type(e).__name__] += 1
+            local_latencies[names[index]].append(time.perf_counter() - start)
+            local_statuses[names[index]][status] += 1
+        with lock:
+            for name, values in local_latencies.items():
+                latencies[name].extend(values)
+                statuses[name].update(local_statuses[name])
+
+    start = time.perf_counter()
+    deadline = start + duration if duration is not None else None
+    threads = [threading.Thread(target=worker, args=(index, deadline)) for index in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    all_statuses = sum(statuses.values(), Counter())
+    report = _summary(all_latencies, all_statuses)
+    report.update({
+        'concurrency': concurrency,
+        'elapsed_seconds': elapsed,
+        'throughput_rps': len(all_latencies) / elapsed if elapsed else 0.0,
+        'errors': dict(errors),
+        'mix': {name: dict(_summary(latencies[name], statuses[name]), weight=weight)
+                for name, weight in zip(names, weights)},
+    })
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Qiskit API load-testing harness')
+    parser.add_argument('--concurrency', type=int, default=8, help='Worker threads (default: 8)')
+    parser.add_argument('--requests', type=int, default=1000, help='Total requests (default: 1000)')
+    parser.add_argument('--duration', type=float, help='Run for this many seconds instead of a request count')
+    parser.add_argument('--mix', type=str, default=DEFAULT_MIX, help=f"QUBITSxDEPTH:WEIGHT,... (default: {DEFAULT_MIX})")
+    parser.add_argument('--mix-file', type=str, help='JSON list of {"name", "weight", "payload"} request entries')
+    parser.add_argument('--fake-latency', type=float, help='Replace Aer with a fake backend taking this many seconds')
+    parser.add_argument('--fake-jitter', type=float, default=0.0, help='Uniform +/- noise on the fake latency')
+    parser.add_argument('--clients', type=int, default=1, help='Distinct client addresses (in-process only)')
+    parser.add_argument('--no-rate-limit', action='store_true', help='Disable the rate limiter (in-process and --serve)')
+    parser.add_argument('--url', type=str, help='Drive a running server at this base URL instead')
+    parser.add_argument('--token', type=str, help='Session token for --url')
+    parser.add_argument('--insecure', action='store_true', help='Skip TLS certificate verification for --url')
+    parser.add_argument('--serve', type=int, metavar='PORT', help='Serve the app with the chosen backend and exit on ^C')
+    parser.add_argument('--min-rps', type=float, help='Fail when throughput is below this')
+    parser.add_argument('--max-p99', type=float, help='Fail when p99 latency in seconds is above this')
+    parser.add_argument('--output', type=str, help='Write the JSON report to this file')
+    args = parser.parse_args(argv)
+
+    executor = None
+    if args.fake_latency is not None:
+        executor = FakeExecutor(args.fake_latency, args.fake_jitter)
+    if args.serve is not None:
+        app = _load_app(executor, not args.no_rate_limit)
+        # Print a token that the load generator can pass with --token
+        print(json.dumps({'token': _session_token(), 'port': args.serve}), flush=True)
+        app.run(host='0.0.0.0', port=args.serve, threaded=True)
+        return 0
+
+    if args.url:
+        if not args.token:
+            parser.error('--url needs --token')
+        send = http_sender(args.url, args.token, args.insecure)
+    else:
+        app = _load_app(executor, not args.no_rate_limit)
+        send = in_process_sender(app, _session_token(), args.clients)
+
+    mix = load_mix(args.mix_file) if args.mix_file else parse_mix(args.mix)
+    report = run_load(send, mix, concurrency=args.concurrency, requests=args.requests, duration=args.duration)
+    report['backend'] = 'remote' if args.url else ('fake' if executor is not None else 'aer')
+    if executor is not None:
+        report['fake_latency_seconds'] = args.fake_latency
+    text = json.dumps(report, indent=4)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(text)
+    print(text)
+    passed = (args.min_rps is None or report['throughput_rps'] >= args.min_rps) and \
+             (args.max_p99 is None or (report['p99_seconds'] or 0) <= args.max_p99)
+    return 0 if passed else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""
+Validation and sanitization benchmark for large request payloads.
+
+A synthetic payload with about a million leaf fields (circuit records with
+names, shot counts and parameter lists) is checked with the batch helpers,
+utilities.validate_payload and utilities.sanitize_payload, and with the
+per-field helpers validate_input and sanitize_parameter on a sample. The
+benchmark fails (exit status 1) when a batch helper exceeds its budget.
+
+Usage (from the repository root):
+    python -m Qiskit_API.benchmarks.payload_validation [--fields N] [--repeat N] [--output FILE]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+
+from Qiskit_API.utilities import (compile_schema, sanitize_parameter, sanitize_payload, validate_input,
+                                  validate_payload)
+
+# Leaf fields per circuit record built by build_payload
+_FIELDS_PER_RECORD = 10
+
+PAYLOAD_SCHEMA = {
+    'backend': str,
+    'circuits': [{
+        'name': str,
+        'shots': int,
+        'tag': str,
+        'params': [(int, float)],
+    }],
+}
+
+# Batch helper -> budget in seconds per million fields
+BUDGETS = {
+    'validate_payload': 1.0,
+    'sanitize_payload': 1.5,
+}
+
+
+def build_payload(fields):
+    """
+    Builds a payload with roughly the given number of leaf fields.
+
+    Parameters:
+        fields (int): Number of leaf fields to generate.
+
+    Returns:
+        dict: The payload, matching PAYLOAD_SCHEMA.
+    """
+    return {
+        'backend': 'qasm_simulator',
+        'circuits': [
+            {'name': f"circuit{index}", 'shots': 1024, 'tag': 'bench-run' if index % 10 == 0 else 'bench',
+             'params': [0.1 * position for position in range(_FIELDS_PER_RECORD - 3)]}
+            for index in range(max(1, fields // _FIELDS_PER_RECORD))
+        ],
+    }
+
+
+def _leaves(payload):
+    # The per-field baseline walks the same fields the batch helpers do
+    if isinstance(payload, dict):
+        for value in payload.values():
+            yield from _leaves(value)
+    elif isinstance(payload, list):
+        for value in payload:
+            yield from _leaves(value)
+    else:
+        yield payload
+
+
+def _time(function, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def run_benchmark(fields=1_000_000, repeat=3, sample=100_000):
+    """
+    Times the batch helpers on a full payload and the per-field helpers on a sample.
+
+    Parameters:
+        fields (int): Number of leaf fields in the payload.
+        repeat (int): Timed runs per helper (the median is reported).
+        sample (int): Number of fields the per-field baseline is timed on.
+
+    Returns:
+        list of dict: One report entry per helper, with seconds per million fields.
+    """
+    payload = build_payload(fields)
+    leaves = list(_leaves(payload))
+    schema = compile_schema(PAYLOAD_SCHEMA)
+    per_million = 1_000_000 / len(leaves)
+    sample_leaves = leaves[:sample]
+    sample_per_million = 1_000_000 / len(sample_leaves)
+
+    timings = {
+        'validate_payload': _time(lambda: validate_payload(payload, schema), repeat) * per_million,
+        'sanitize_payload': _time(lambda: sanitize_payload(payload), repeat) * per_million,
+        'validate_input (per field)': _time(
+            lambda: [validate_input(leaf, (str, int, float)) for leaf in sample_leaves], repeat
+        ) * sample_per_million,
+        'sanitize_parameter (per field)': _time(
+            lambda: [sanitize_parameter(leaf) for leaf in sample_leaves], repeat
+        ) * sample_per_million,
+    }
+    report = []
+    for name, seconds in timings.items():
+        budget = BUDGETS.get(name)
+        report.append({
+            'helper': name,
+            'fields': len(leaves) if name in BUDGETS else len(sample_leaves),
+            'seconds_per_million_fields': round(seconds, 4),
+            'budget_seconds': budget,
+            'passed': budget is None or seconds <= budget,
+        })
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Qiskit API payload validation benchmark')
+    parser.add_argument('--fields', type=int, default=1_000_000, help='Leaf fields in the payload')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per helper')
+    parser.add_argument('--output', type=str, help='Write the JSON report to this file')
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(fields=args.fields, repeat=args.repeat)
+    text = json.dumps(report, indent=4)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(text)
+    print(text)
+    return 0 if all(entry['passed'] for entry in report) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
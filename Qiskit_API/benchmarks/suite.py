@@ -0,0 +1,359 @@
+"""
+Performance suite for circuit construction, transpilation, execution, the web
+endpoint and the crypto primitives.
+
+Every benchmark is swept over the requested qubit counts, depths and batch
+sizes and timed several times; the median and minimum are written to a JSON
+report together with the commit and library versions, so reports from two
+commits can be compared. With --compare the suite fails (exit status 1) when a
+benchmark's median is slower than the baseline's by more than --tolerance.
+Benchmarks whose third-party dependencies are not installed are reported as skipped.
+
+Usage (from the repository root):
+    python -m Qiskit_API.benchmarks.suite [--only NAME ...] [--qubits 2,8,16] [--depths 10,100]
+        [--batches 1,16] [--repeat N] [--output FILE] [--compare BASELINE] [--tolerance 0.2]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DEFAULT_QUBITS = (2, 8, 16)
+DEFAULT_DEPTHS = (10, 100)
+DEFAULT_BATCHES = (1, 16)
+PAYLOAD_SIZES = (1024, 64 * 1024, 1024 * 1024)
+WEB_CONCURRENCY = (1, 8)
+
+# Third-party packages whose absence skips a benchmark; any other ImportError is a failure
+OPTIONAL_DEPENDENCIES = ('qiskit', 'qiskit_aer', 'flask', 'flask_limiter', 'flask_sslify', 'Crypto', 'bcrypt')
+
+# Very fast calls are repeated until one timed run takes at least this long
+_MIN_RUN_SECONDS = 0.05
+
+
+def random_layers(num_qubits, depth, seed=1234):
+    """
+    Builds gate lists for a layered random circuit, in the form QuantumCircuitBuilder.add_gates takes.
+
+    Each layer applies a random single-qubit gate (h, x, rz or sx) to every qubit,
+    then cx on disjoint neighbouring pairs.
+
+    Parameters:
+        num_qubits (int): Number of qubits.
+        depth (int): Number of layers.
+        seed (int): Random seed, so every commit benchmarks the same circuits.
+
+    Returns:
+        tuple: (gates, qubits, params) lists of equal length.
+    """
+    generator = random.Random(seed)
+    gates, qubits, params = [], [], []
+    for layer in range(depth):
+        for qubit in range(num_qubits):
+            name = generator.choice(('h', 'x', 'rz', 'sx'))
+            gates.append(name)
+            qubits.append(qubit)
+            params.append([generator.uniform(0, 6.283)] if name == 'rz' else None)
+        for qubit in range(layer % 2, num_qubits - 1, 2):
+            gates.append('cx')
+            qubits.append((qubit, qubit + 1))
+            params.append(None)
+    return gates, qubits, params
+
+
+def build_circuit(num_qubits, depth, name='bench', measure=True):
+    """
+    Builds the random circuit of random_layers with QuantumCircuitBuilder.
+
+    Parameters:
+        num_qubits (int): Number of qubits.
+        depth (int): Number of layers.
+        name (str): Circuit name.
+        measure (bool): Measure every qubit at the end.
+
+    Returns:
+        QuantumCircuit: The circuit.
+    """
+    from Qiskit_API.circuits.create import QuantumCircuitBuilder
+
+    builder = QuantumCircuitBuilder(num_qubits, name=name, compact=True)
+    builder.add_gates(*random_layers(num_qubits, depth))
+    circuit = builder.build()
+    if measure:
+        circuit.measure(range(num_qubits), range(num_qubits))
+    return circuit
+
+
+def _measure(function, repeat):
+    # Calibrate how many calls make one timed run, then time `repeat` runs
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= _MIN_RUN_SECONDS or number >= 1 << 20:
+            break
+        number *= 2 if elapsed * 10 > _MIN_RUN_SECONDS else 10
+    samples = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        samples.append((time.perf_counter() - start) / number)
+    return samples
+
+
+def bench_create_circuit(sweep, repeat):
+    from Qiskit_API.qiskit_api import create_quantum_circuit
+
+    for num_qubits in sweep['qubits']:
+        yield {'qubits': num_qubits}, _measure(lambda: create_quantum_circuit(num_qubits), repeat)
+
+
+def bench_builder(sweep, repeat):
+    from Qiskit_API.circuits.create import QuantumCircuitBuilder
+
+    for num_qubits in sweep['qubits']:
+        for depth in sweep['depths']:
+            gates, qubits, params = random_layers(num_qubits, depth)
+
+            def build():
+                QuantumCircuitBuilder(num_qubits, compact=True).add_gates(gates, qubits, params)
+            yield {'qubits': num_qubits, 'depth': depth, 'gates': len(gates)}, _measure(build, repeat)
+
+
+def bench_transpile(sweep, repeat):
+    from qiskit import Aer, transpile
+
+    backend = Aer.get_backend('qasm_simulator')
+    for num_qubits in sweep['qubits']:
+        for depth in sweep['depths']:
+            circuit = build_circuit(num_qubits, depth)
+            yield {'qubits': num_qubits, 'depth': depth}, _measure(lambda: transpile(circuit, backend), repeat)
+
+
+def bench_aer_execute(sweep, repeat):
+    from qiskit import Aer, transpile
+
+    backend = Aer.get_backend('qasm_simulator')
+    for num_qubits in sweep['qubits']:
+        for depth in sweep['depths']:
+            for batch in sweep['batches']:
+                circuits = transpile([build_circuit(num_qubits, depth, name=f"bench{index}")
+                                      for index in range(batch)], backend)
+
+                def run():
+                    backend.run(circuits, shots=1024).result().get_counts()
+                yield {'qubits': num_qubits, 'depth': depth, 'batch': batch}, _measure(run, repeat)
+
+
+def bench_counts(sweep, repeat):
+    from Qiskit_API.circuits.fingerprint import remap_counts
+
+    generator = random.Random(1234)
+    for num_qubits in sweep['qubits']:
+        # A 1024-shot run has at most 1024 distinct outcomes
+        outcomes = min(1 << num_qubits, 1024)
+        counts = {format(generator.getrandbits(num_qubits), f"0{num_qubits}b"): 1 for _ in range(outcomes)}
+        identity = tuple(range(num_qubits))
+        reversed_map = identity[::-1]
+        for batch in sweep['batches']:
+            batch_counts = [counts] * batch
+
+            def handle():
+                totals = {}
+                for item in batch_counts:
+                    for bitstring, count in remap_counts(item, identity, reversed_map).items():
+                        totals[bitstring] = totals.get(bitstring, 0) + count
+            yield {'qubits': num_qubits, 'batch': batch, 'outcomes': len(counts)}, _measure(handle, repeat)
+
+
+def bench_web_execute(sweep, repeat):
+    from Qiskit_API import authentication, web_interface
+    from Qiskit_API.circuits.serialization import circuit_to_qasm
+
+    app = web_interface.app
+    app.config['TESTING'] = True
+    web_interface.limiter.enabled = False
+    headers = {'Authorization': f"Bearer {authentication.create_session_token('benchmark')}"}
+    local = threading.local()
+
+    def post(payload):
+        # Flask test clients are not shared between threads
+        client = getattr(local, 'client', None)
+        if client is None:
+            client = local.client = app.test_client()
+        return client.post('/api/v1/execute', json=payload, headers=headers, base_url='https://localhost')
+
+    for num_qubits in sweep['qubits']:
+        for depth in sweep['depths']:
+            payload = {'circuit': {'qasm': circuit_to_qasm(build_circuit(num_qubits, depth))}}
+            status = post(payload).status_code
+            for concurrency in WEB_CONCURRENCY:
+                for batch in sweep['batches']:
+                    requests = batch * concurrency
+                    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+
+                        def burst():
+                            list(executor.map(post, [payload] * requests))
+                        samples = _measure(burst, repeat)
+                    # Report seconds per request, so throughput is 1 / median
+                    yield ({'qubits': num_qubits, 'depth': depth, 'concurrency': concurrency, 'requests': requests,
+                            'status': status}, [sample / requests for sample in samples])
+
+
+def bench_crypto(sweep, repeat):
+    from Crypto.PublicKey import RSA
+
+    from Qiskit_API.cryptography import open_envelope, seal_envelope
+
+    key = RSA.generate(2048)
+    public_key, private_key = key.publickey().export_key(format='DER'), key.export_key(format='DER')
+    for size in PAYLOAD_SIZES:
+        data = os.urandom(size)
+        envelope = seal_envelope(data, public_key)
+        yield {'operation': 'seal', 'bytes': size}, _measure(lambda: seal_envelope(data, public_key), repeat)
+        yield {'operation': 'open', 'bytes': size}, _measure(lambda: open_envelope(envelope, private_key), repeat)
+
+
+# Benchmark name -> generator of (params, per-call seconds samples)
+BENCHMARKS = {
+    'create_quantum_circuit': bench_create_circuit,
+    'builder_add_gates': bench_builder,
+    'transpile': bench_transpile,
+    'aer_execute': bench_aer_execute,
+    'counts_handling': bench_counts,
+    'web_execute': bench_web_execute,
+    'crypto_envelope': bench_crypto,
+}
+
+
+def _environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=REPO_ROOT, capture_output=True,
+                                text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    versions = {}
+    for module_name in ('qiskit', 'qiskit_aer', 'flask', 'Crypto'):
+        try:
+            versions[module_name] = __import__(module_name).__version__
+        except (ImportError, AttributeError):
+            versions[module_name] = None
+    return {
+        'commit': commit,
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'versions': versions,
+    }
+
+
+def run_benchmark(only=None, qubits=DEFAULT_QUBITS, depths=DEFAULT_DEPTHS, batches=DEFAULT_BATCHES, repeat=5):
+    """
+    Runs the selected benchmarks over the parameter sweep.
+
+    Parameters:
+        only (iterable, optional): Benchmark names to run (defaults to all of BENCHMARKS).
+        qubits (sequence): Qubit counts to sweep.
+        depths (sequence): Circuit depths (layers) to sweep.
+        batches (sequence): Batch sizes to sweep (circuits per job, counts per batch, requests per worker).
+        repeat (int): Timed runs per parameter combination.
+
+    Returns:
+        dict: The environment and one result entry per benchmark and parameter combination.
+    """
+    sweep = {'qubits': qubits, 'depths': depths, 'batches': batches}
+    results = []
+    for name in only or BENCHMARKS:
+        try:
+            for params, samples in BENCHMARKS[name](sweep, repeat):
+                results.append({
+                    'benchmark': name,
+                    'params': params,
+                    'median_seconds': statistics.median(samples),
+                    'min_seconds': min(samples),
+                    'repeat': len(samples),
+                })
+        except ImportError as e:
+            if (e.name or '').split('.')[0] not in OPTIONAL_DEPENDENCIES:
+                raise
+            results.append({'benchmark': name, 'skipped': str(e)})
+    return {'environment': _environment(), 'results': results}
+
+
+def compare_reports(report, baseline, tolerance=0.2):
+    """
+    Compares a report with a baseline report, matching entries by benchmark and parameters.
+
+    Parameters:
+        report (dict): Report returned by run_benchmark.
+        baseline (dict): An earlier report.
+        tolerance (float): Allowed relative slowdown of the median (0.2 is 20%).
+
+    Returns:
+        list of dict: One entry per benchmark found in both reports, with the ratio and a passed flag.
+    """
+    def key(entry):
+        return entry['benchmark'], json.dumps(entry['params'], sort_keys=True)
+
+    baseline_medians = {key(entry): entry['median_seconds'] for entry in baseline['results'] if 'skipped' not in entry}
+    comparison = []
+    for entry in report['results']:
+        if 'skipped' in entry or key(entry) not in baseline_medians:
+            continue
+        ratio = entry['median_seconds'] / baseline_medians[key(entry)]
+        comparison.append({
+            'benchmark': entry['benchmark'],
+            'params': entry['params'],
+            'ratio': round(ratio, 3),
+            'passed': ratio <= 1 + tolerance,
+        })
+    return comparison
+
+
+def _int_list(text):
+    return tuple(int(value) for value in text.split(','))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Qiskit API performance suite')
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), help='Run only these benchmarks')
+    parser.add_argument('--qubits', type=_int_list, default=DEFAULT_QUBITS, help='Comma-separated qubit counts')
+    parser.add_argument('--depths', type=_int_list, default=DEFAULT_DEPTHS, help='Comma-separated circuit depths')
+    parser.add_argument('--batches', type=_int_list, default=DEFAULT_BATCHES, help='Comma-separated batch sizes')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per parameter combination')
+    parser.add_argument('--output', type=str, help='Write the JSON report to this file')
+    parser.add_argument('--compare', type=str, help='Baseline JSON report to check for regressions')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed relative slowdown (default: 0.2)')
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(only=args.only, qubits=args.qubits, depths=args.depths, batches=args.batches,
+                           repeat=args.repeat)
+    passed = True
+    if args.compare:
+        with open(args.compare) as file:
+            report['comparison'] = compare_reports(report, json.load(file), args.tolerance)
+        passed = all(entry['passed'] for entry in report['comparison'])
+    text = json.dumps(report, indent=4)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(text)
+    print(text)
+    return 0 if passed else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
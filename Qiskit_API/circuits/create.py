@@ -1,6 +1,15 @@
-from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister, Instruction, transpile, Aer, execute, qasm
+from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister
+from qiskit.circuit import Gate, Instruction
 import json
 
+from .fingerprint import circuit_fingerprint
+from .incremental import IncrementalTranspiler
+from .serialization import STANDARD_OPERATIONS, circuit_to_qasm, circuit_to_dict, write_circuit_archive
+
+# Integer gate codes accepted by QuantumCircuitBuilder.add_gates, e.g. from a numpy array
+GATE_CODES = ('id', 'x', 'y', 'z', 'h', 's', 'sdg', 't', 'tdg', 'sx', 'rx', 'ry', 'rz', 'p', 'u',
+              'cx', 'cy', 'cz', 'swap', 'cp', 'crx', 'cry', 'crz', 'rzz', 'ccx', 'cswap')
+
 class QuantumCircuitBuilder:
     """
     QuantumCircuitBuilder class for constructing quantum circuits.
@@ -10,22 +19,43 @@ class QuantumCircuitBuilder:
         name (str): Name of the circuit.
         qregs (list): List of QuantumRegister objects.
         cregs (list): List of ClassicalRegister objects.
+        compact (bool): Whether the circuit uses a single flat quantum and classical register.
         circuit (QuantumCircuit): The quantum circuit being built.
+        transpiler (IncrementalTranspiler): Reuses earlier transpile results as the circuit is edited.
     """
 
-    def __init__(self, num_qubits=1, name="my_circuit"):
+    def __init__(self, num_qubits=1, name="my_circuit", compact=False):
         """
         Initialize a QuantumCircuitBuilder instance.
 
+        By default every qubit index gets its own num_qubits-wide register, so the
+        circuit holds num_qubits ** 2 qubits. With compact=True the circuit holds a
+        single register of num_qubits qubits and one of num_qubits clbits, and the
+        add_* methods address individual qubits and bits.
+
         Args:
             num_qubits (int): Number of qubits in the circuit (default is 1).
             name (str): Name of the circuit (default is "my_circuit").
+            compact (bool): Use one flat quantum and classical register (default is False).
         """
         self.num_qubits = num_qubits
         self.name = name
-        self.qregs = [QuantumRegister(num_qubits, f"q{i}") for i in range(num_qubits)]
-        self.cregs = [ClassicalRegister(num_qubits, f"c{i}") for i in range(num_qubits)]
+        self.compact = compact
+        if compact:
+            self.qregs = [QuantumRegister(num_qubits, "q")]
+            self.cregs = [ClassicalRegister(num_qubits, "c")]
+        else:
+            self.qregs = [QuantumRegister(num_qubits, f"q{i}") for i in range(num_qubits)]
+            self.cregs = [ClassicalRegister(num_qubits, f"c{i}") for i in range(num_qubits)]
         self.circuit = QuantumCircuit(*self.qregs, *self.cregs, name=name)
+        self.transpiler = IncrementalTranspiler()
+
+    def _qubit(self, index):
+        # Compact mode addresses single qubits; the legacy layout addresses whole registers
+        return self.circuit.qubits[index] if self.compact else self.qregs[index]
+
+    def _clbit(self, index):
+        return self.circuit.clbits[index] if self.compact else self.cregs[index]
 
     def add_hadamard(self, target_qubit):
         """
@@ -34,7 +64,7 @@ class QuantumCircuitBuilder:
         Args:
             target_qubit (int): Index of the target qubit.
         """
-        self.circuit.h(self.qregs[target_qubit])
+        self.circuit.h(self._qubit(target_qubit))
 
     def add_cnot(self, control_qubit, target_qubit):
         """
@@ -44,7 +74,7 @@ class QuantumCircuitBuilder:
             control_qubit (int): Index of the control qubit.
             target_qubit (int): Index of the target qubit.
         """
-        self.circuit.cx(self.qregs[control_qubit], self.qregs[target_qubit])
+        self.circuit.cx(self._qubit(control_qubit), self._qubit(target_qubit))
 
     def add_measurement(self, qubit, bit):
         """
@@ -54,7 +84,7 @@ class QuantumCircuitBuilder:
             qubit (int): Index of the qubit to measure.
             bit (int): Index of the classical bit to store the measurement result.
         """
-        self.circuit.measure(self.qregs[qubit], self.cregs[bit])
+        self.circuit.measure(self._qubit(qubit), self._clbit(bit))
 
     def add_custom_gate(self, gate_name, qubits, parameters=None, condition_bits=None, condition_values=None):
         """
@@ -77,6 +107,77 @@ class QuantumCircuitBuilder:
         custom_gate = Instruction(gate_name, len(qubits), len(condition_bits), parameters, condition_bits, condition_values)
         self.circuit.append(custom_gate, qubits)
 
+    def add_gates(self, gates, qubits, params=None):
+        """
+        Append many standard gates in one call.
+
+        Qubit indices refer to self.circuit.qubits, i.e. single qubits of the flat
+        register in compact mode. Every gate is checked before any is appended, so
+        invalid input leaves the circuit unchanged. The gates are then appended
+        without append()'s broadcasting, and parameterless gates share one instance,
+        so building a large circuit costs a few list operations per gate.
+
+        Args:
+            gates (sequence): Gate names or integer codes into GATE_CODES (lists or numpy arrays).
+            qubits (sequence): For each gate, its qubit index or a sequence of qubit indices
+                (e.g. an (n, 2) array for two-qubit gates).
+            params (sequence, optional): For each gate, its list of numeric parameters
+                (None or empty for parameterless gates).
+
+        Returns:
+            int: The number of gates appended.
+
+        Raises:
+            ValueError: If the inputs have different lengths, a gate is unknown or is not a
+                unitary gate (measure, reset, delay, ...), or a gate gets the wrong number of
+                qubits or parameters.
+        """
+        gates = gates.tolist() if hasattr(gates, 'tolist') else list(gates)
+        qubits = qubits.tolist() if hasattr(qubits, 'tolist') else list(qubits)
+        if params is not None:
+            params = params.tolist() if hasattr(params, 'tolist') else list(params)
+        if len(qubits) != len(gates) or (params is not None and len(params) != len(gates)):
+            raise ValueError("gates, qubits and params must have the same length.")
+
+        circuit_qubits = self.circuit.qubits
+        num_qubits = len(circuit_qubits)
+        instructions = []
+        for position, gate in enumerate(gates):
+            if isinstance(gate, str):
+                name = gate
+            elif isinstance(gate, int) and not isinstance(gate, bool) and 0 <= gate < len(GATE_CODES):
+                name = GATE_CODES[gate]
+            else:
+                name = None
+            if name not in STANDARD_OPERATIONS:
+                raise ValueError(f"Unknown gate {gate!r} at position {position}; expected a gate name or a "
+                                 f"code from 0 to {len(GATE_CODES) - 1}.")
+            gate_class, operation = STANDARD_OPERATIONS[name]
+            if not isinstance(operation, Gate) or operation.num_clbits:
+                # Appended without clbits or checks, so only unitary gates are accepted
+                raise ValueError(f"Operation {name!r} at position {position} is not a gate; add_gates only "
+                                 f"appends unitary gates.")
+            gate_params = (params[position] if params is not None else None) or ()
+            if len(gate_params) != len(operation.params):
+                raise ValueError(f"Gate {name!r} at position {position} takes {len(operation.params)} "
+                                 f"parameters, got {len(gate_params)}.")
+            if gate_params:
+                # Parameterized gates are mutable (label, condition), so each gets its own instance
+                operation = gate_class(*gate_params)
+
+            targets = qubits[position]
+            if isinstance(targets, int):
+                targets = (targets,)
+            if len(targets) != operation.num_qubits or len(set(targets)) != len(targets) \
+                    or not all(0 <= target < num_qubits for target in targets):
+                raise ValueError(f"Invalid qubits {targets!r} for gate {name!r} at position {position}.")
+            instructions.append((operation, [circuit_qubits[target] for target in targets]))
+
+        append = self.circuit._append
+        for operation, targets in instructions:
+            append(operation, targets, [])
+        return len(gates)
+
     def build(self):
         """
         Build and return the quantum circuit.
@@ -86,6 +187,31 @@ class QuantumCircuitBuilder:
         """
         return self.circuit
 
+    def transpile(self, backend=None, **options):
+        """
+        Transpile the circuit, reusing the previous transpile for the unchanged prefix.
+
+        Args:
+            backend (Backend, optional): The backend to transpile for.
+            **options: Further keyword arguments for qiskit.transpile.
+
+        Returns:
+            QuantumCircuit: The transpiled circuit.
+        """
+        return self.transpiler.transpile(self.circuit, backend, **options)
+
+    def fingerprint(self):
+        """
+        Compute the circuit's canonical fingerprint.
+
+        Circuits that only differ by qubit labels or the order of commuting gates
+        share a fingerprint (see circuits.fingerprint.circuit_fingerprint).
+
+        Returns:
+            CircuitFingerprint: The digest and the canonical index of every qubit and clbit.
+        """
+        return circuit_fingerprint(self.circuit)
+
     def export_to_qasm(self, filename):
         """
         Export the quantum circuit to a QASM file.
@@ -93,7 +219,7 @@ class QuantumCircuitBuilder:
         Args:
             filename (str): Name of the QASM file to save.
         """
-        qasm_str = qasm(self.circuit)
+        qasm_str = circuit_to_qasm(self.circuit)
         with open(filename, 'w') as file:
             file.write(qasm_str)
 
@@ -104,10 +230,28 @@ class QuantumCircuitBuilder:
         Args:
             filename (str): Name of the JSON file to save.
         """
-        circuit_dict = self.circuit.data(1)
+        circuit_dict = circuit_to_dict(self.circuit)
         with open(filename, 'w') as file:
             json.dump(circuit_dict, file, indent=4)
 
+    @staticmethod
+    def export_many(builders, filename):
+        """
+        Export many circuits into a single indexed archive file.
+
+        Use CircuitArchive to read them back by index or name.
+
+        Args:
+            builders (iterable): QuantumCircuitBuilder or QuantumCircuit objects.
+            filename (str): Name of the archive file to save.
+
+        Returns:
+            int: The number of circuits written.
+        """
+        return write_circuit_archive(filename, (
+            builder.build() if isinstance(builder, QuantumCircuitBuilder) else builder for builder in builders
+        ))
+
 def create_custom_circuit():
     """
     Create a custom quantum circuit.
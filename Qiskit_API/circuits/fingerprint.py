@@ -0,0 +1,315 @@
+import hashlib
+import heapq
+import json
+from collections import namedtuple
+
+# Gates whose qubit arguments can be swapped freely
+_SYMMETRIC_GATES = frozenset({'cz', 'cp', 'cu1', 'rzz', 'rxx', 'ryy', 'swap', 'ccz', 'barrier'})
+
+# Gate name -> qubit argument positions on which the gate is diagonal (commutes with Z).
+# Two gates that are both diagonal on every wire they share commute.
+_DIAGONAL_QUBITS = {
+    'id': (0,), 'z': (0,), 's': (0,), 'sdg': (0,), 't': (0,), 'tdg': (0,), 'rz': (0,), 'p': (0,), 'u1': (0,),
+    'cz': (0, 1), 'cp': (0, 1), 'cu1': (0, 1), 'crz': (0, 1), 'rzz': (0, 1), 'ccz': (0, 1, 2),
+    'cx': (0,), 'cy': (0,), 'ch': (0,), 'csx': (0,), 'crx': (0,), 'cry': (0,), 'cu': (0,),
+    'ccx': (0, 1), 'cswap': (0,),
+}
+
+# Rounds of wire-colour refinement; enough to separate wires in typical circuits
+_REFINEMENT_ROUNDS = 3
+
+CircuitFingerprint = namedtuple('CircuitFingerprint', ['digest', 'qubit_map', 'clbit_map'])
+CircuitFingerprint.__doc__ = """
+Canonical fingerprint of a circuit.
+
+Attributes:
+    digest (str): Hex SHA-256 digest of the circuit's canonical form.
+    qubit_map (tuple): Canonical index of each of the circuit's qubits.
+    clbit_map (tuple): Canonical index of each of the circuit's clbits.
+"""
+
+
+def _param_key(param):
+    try:
+        # Round away float noise from parameter arithmetic so equal angles compare equal
+        return round(float(param), 10)
+    except TypeError:
+        return str(param)
+
+
+def _hash(value):
+    return hashlib.blake2b(repr(value).encode('utf-8'), digest_size=8).digest()
+
+
+def circuit_fingerprint(circuit):
+    """
+    Compute a canonical fingerprint that ignores qubit naming and commuting gate order.
+
+    The circuit is turned into a commutation DAG, where gates on disjoint wires and
+    gates that are diagonal on all wires they share are unordered. Wires get
+    labels from the gates acting on them rather than from their register or index.
+    The DAG is then serialized in a deterministic topological order, with qubits
+    and clbits numbered by first use. The digest hashes that serialization, so two
+    circuits with the same digest are equivalent up to relabeling and commutation.
+    The reverse is not guaranteed: circuits with symmetric, indistinguishable
+    wires can get different digests, which costs a cache miss but never a wrong hit.
+
+    Args:
+        circuit (QuantumCircuit): The circuit to fingerprint.
+
+    Returns:
+        CircuitFingerprint: The digest and the canonical index of every qubit and clbit.
+    """
+    qubit_indices = {bit: index for index, bit in enumerate(circuit.qubits)}
+    clbit_indices = {bit: index for index, bit in enumerate(circuit.clbits)}
+    num_qubits = len(qubit_indices)
+
+    # Gates as (label, wires) with clbits numbered after the qubits
+    nodes = []
+    for instruction in circuit.data:
+        operation = instruction.operation
+        clbits = list(instruction.clbits)
+        condition = getattr(operation, 'condition', None)
+        if condition is not None:
+            # The condition's bits become wires so the gate stays ordered after the measurements it reads
+            target, value = condition
+            clbits += [target] if target in clbit_indices else list(target)
+            condition = ('c_if', int(value))
+        label = (operation.name, tuple(_param_key(param) for param in operation.params), condition)
+        wires = tuple(qubit_indices[qubit] for qubit in instruction.qubits) + \
+            tuple(num_qubits + clbit_indices[clbit] for clbit in clbits)
+        nodes.append((label, wires))
+
+    # Commutation DAG: on each wire, a run of gates that are diagonal there forms an
+    # unordered block between the surrounding non-diagonal gates
+    predecessors = [set() for _ in nodes]
+    successors = [set() for _ in nodes]
+    frontier = {}
+    blocks = {}
+    for index, (label, wires) in enumerate(nodes):
+        diagonal = _DIAGONAL_QUBITS.get(label[0], ()) if label[2] is None else ()
+        for position, wire in enumerate(wires):
+            block = blocks.setdefault(wire, [])
+            if position in diagonal:
+                depends_on = frontier.get(wire, ())
+                block.append(index)
+            else:
+                depends_on = block or frontier.get(wire, ())
+                frontier[wire] = (index,)
+                blocks[wire] = []
+            for previous in depends_on:
+                predecessors[index].add(previous)
+                successors[previous].add(index)
+
+    # Wire colours: refine from the gates touching each wire, ignoring wire indices
+    num_wires = num_qubits + len(clbit_indices)
+    colors = [_hash(wire >= num_qubits) for wire in range(num_wires)]
+    wire_nodes = [[] for _ in range(num_wires)]
+    for index, (label, wires) in enumerate(nodes):
+        for position, wire in enumerate(wires):
+            wire_nodes[wire].append((index, 0 if label[0] in _SYMMETRIC_GATES else position))
+    for _ in range(_REFINEMENT_ROUNDS):
+        node_colors = [_hash((label, sorted(colors[wire] for wire in wires)) if label[0] in _SYMMETRIC_GATES
+                             else (label, tuple(colors[wire] for wire in wires)))
+                       for label, wires in nodes]
+        colors = [_hash((colors[wire], sorted((node_colors[index], position) for index, position in wire_nodes[wire])))
+                  for wire in range(num_wires)]
+
+    # Deterministic topological order: always emit the smallest ready gate by label and wire colours
+    def sort_key(index):
+        label, wires = nodes[index]
+        wire_colors = [colors[wire] for wire in wires]
+        return repr(label), sorted(wire_colors) if label[0] in _SYMMETRIC_GATES else wire_colors
+
+    pending = [len(predecessors[index]) for index in range(len(nodes))]
+    ready = [(sort_key(index), index) for index in range(len(nodes)) if not pending[index]]
+    heapq.heapify(ready)
+    canonical_wires = {}
+    canonical_qubits = 0
+    canonical_clbits = 0
+    serialized = []
+    while ready:
+        _, index = heapq.heappop(ready)
+        label, wires = nodes[index]
+        ordered = sorted(wires, key=lambda wire: colors[wire]) if label[0] in _SYMMETRIC_GATES else wires
+        for wire in ordered:
+            if wire not in canonical_wires:
+                if wire < num_qubits:
+                    canonical_wires[wire] = canonical_qubits
+                    canonical_qubits += 1
+                else:
+                    canonical_wires[wire] = canonical_clbits
+                    canonical_clbits += 1
+        qargs = [canonical_wires[wire] for wire in wires if wire < num_qubits]
+        cargs = [canonical_wires[wire] for wire in wires if wire >= num_qubits]
+        if label[0] in _SYMMETRIC_GATES:
+            qargs.sort()
+        serialized.append([label[0], list(label[1]), label[2], qargs, cargs])
+        for successor in successors[index]:
+            pending[successor] -= 1
+            if not pending[successor]:
+                heapq.heappush(ready, (sort_key(successor), successor))
+
+    # Idle wires come last, in their original order
+    for wire in range(num_wires):
+        if wire not in canonical_wires:
+            if wire < num_qubits:
+                canonical_wires[wire] = canonical_qubits
+                canonical_qubits += 1
+            else:
+                canonical_wires[wire] = canonical_clbits
+                canonical_clbits += 1
+
+    digest = hashlib.sha256(json.dumps([num_qubits, len(clbit_indices), serialized],
+                                       separators=(',', ':')).encode('utf-8')).hexdigest()
+    return CircuitFingerprint(
+        digest,
+        tuple(canonical_wires[wire] for wire in range(num_qubits)),
+        tuple(canonical_wires[wire] for wire in range(num_qubits, num_wires)),
+    )
+
+
+def remap_counts(counts, source_clbit_map, target_clbit_map, register_sizes=None):
+    """
+    Translate measurement counts between two circuits with the same fingerprint.
+
+    Args:
+        counts (dict): Counts measured on the source circuit, keyed by bitstrings
+            (clbit 0 rightmost, as qiskit prints them).
+        source_clbit_map (tuple): The source circuit's CircuitFingerprint.clbit_map.
+        target_clbit_map (tuple): The target circuit's CircuitFingerprint.clbit_map.
+        register_sizes (sequence, optional): Sizes of the target circuit's classical
+            registers, in order; keys are then separated by register as get_counts prints them.
+
+    Returns:
+        dict: The counts keyed by the target circuit's bitstrings (without register
+            separators unless register_sizes is given).
+    """
+    num_clbits = len(target_clbit_map)
+    # Target clbit -> canonical clbit -> source clbit
+    source_of_canonical = {canonical: clbit for clbit, canonical in enumerate(source_clbit_map)}
+    sources = [source_of_canonical[target_clbit_map[clbit]] for clbit in range(num_clbits)]
+    identity = sources == list(range(num_clbits))
+    split = register_sizes is not None and len(register_sizes) > 1
+    remapped = {}
+    for bitstring, count in counts.items():
+        key = bitstring.replace(' ', '')
+        if not identity:
+            bits = key[::-1]
+            key = ''.join(bits[sources[clbit]] for clbit in reversed(range(num_clbits)))
+        if split:
+            key = _split_registers(key, register_sizes)
+        remapped[key] = remapped.get(key, 0) + count
+    return remapped
+
+
+def _split_registers(key, register_sizes):
+    # The first register holds the rightmost bits
+    parts = []
+    end = len(key)
+    for size in register_sizes:
+        parts.append(key[end - size:end])
+        end -= size
+    return ' '.join(reversed(parts))
+
+
+class FingerprintIndex:
+    """
+    Maps circuits to stored values (transpiled circuits, results, ...) of equivalent circuits.
+
+    Every stored value keeps the fingerprint of the circuit it was computed for,
+    so callers can tell an exact hit (same qubit and clbit maps) from a hit on a
+    relabeled equivalent and translate results with remap_counts. Values that
+    also depend on how the circuit was run (backend, shots, ...) are stored
+    under a context, and only lookups with an equal context find them.
+
+    Attributes:
+        entries (dict): (context, fingerprint digest) -> (CircuitFingerprint, value).
+        hits (int): Number of lookups that found an equivalent circuit.
+        misses (int): Number of lookups that did not.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty FingerprintIndex.
+        """
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def add(self, circuit, value, fingerprint=None, context=None):
+        """
+        Store a value for a circuit, replacing any value stored for an equivalent circuit.
+
+        Args:
+            circuit (QuantumCircuit): The circuit the value was computed for.
+            value: The value to store.
+            fingerprint (CircuitFingerprint, optional): The circuit's fingerprint, if already computed.
+            context (hashable, optional): What else the value depends on, e.g. (backend, shots).
+
+        Returns:
+            CircuitFingerprint: The circuit's fingerprint.
+        """
+        fingerprint = fingerprint or circuit_fingerprint(circuit)
+        self.entries[(context, fingerprint.digest)] = (fingerprint, value)
+        return fingerprint
+
+    def lookup(self, circuit, fingerprint=None, context=None):
+        """
+        Find the value stored for an equivalent circuit.
+
+        Args:
+            circuit (QuantumCircuit): The incoming circuit.
+            fingerprint (CircuitFingerprint, optional): The circuit's fingerprint, if already computed.
+            context (hashable, optional): The context the value was stored under.
+
+        Returns:
+            tuple: (stored CircuitFingerprint, value), or None if no equivalent circuit is stored.
+        """
+        fingerprint = fingerprint or circuit_fingerprint(circuit)
+        entry = self.entries.get((context, fingerprint.digest))
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, circuit):
+        return (None, circuit_fingerprint(circuit).digest) in self.entries
+
+
+def dedupe_report(circuits, names=None):
+    """
+    Measure how much redundant work a workload contains.
+
+    Args:
+        circuits (iterable): The workload's circuits.
+        names (iterable, optional): Names to report for the circuits (default is circuit.name).
+
+    Returns:
+        dict: "total" and "unique" circuit counts, "duplicates", "redundant_fraction",
+            and "groups": one {"fingerprint", "count", "names"} entry per fingerprint
+            shared by several circuits, largest first.
+    """
+    groups = {}
+    total = 0
+    names = iter(names) if names is not None else None
+    for circuit in circuits:
+        name = next(names) if names is not None else circuit.name
+        groups.setdefault(circuit_fingerprint(circuit).digest, []).append(name)
+        total += 1
+    duplicates = total - len(groups)
+    return {
+        'total': total,
+        'unique': len(groups),
+        'duplicates': duplicates,
+        'redundant_fraction': duplicates / total if total else 0.0,
+        'groups': [
+            {'fingerprint': digest, 'count': len(group), 'names': group}
+            for digest, group in sorted(groups.items(), key=lambda item: -len(item[1]))
+            if len(group) > 1
+        ],
+    }
@@ -0,0 +1,135 @@
+from collections import namedtuple
+
+from qiskit import transpile
+
+from ..backends.details import backend_key
+
+# One transpiled run of source instructions: source[start:stop] became `circuit`,
+# leaving virtual qubit i on physical qubit layout[i]
+_Segment = namedtuple('_Segment', ['start', 'stop', 'circuit', 'layout'])
+
+
+def _instruction_keys(circuit):
+    qubit_indices = {bit: index for index, bit in enumerate(circuit.qubits)}
+    clbit_indices = {bit: index for index, bit in enumerate(circuit.clbits)}
+    return [
+        (instruction.operation.name, tuple(map(str, instruction.operation.params)),
+         tuple(qubit_indices[qubit] for qubit in instruction.qubits),
+         tuple(clbit_indices[clbit] for clbit in instruction.clbits),
+         str(getattr(instruction.operation, 'condition', None)))
+        for instruction in circuit.data
+    ]
+
+
+def _final_layout(transpiled, num_qubits):
+    layout = getattr(transpiled, 'layout', None)
+    if layout is None:
+        # No layout stage ran (e.g. a simulator without a coupling map): qubits stay in place
+        return list(range(num_qubits))
+    if hasattr(layout, 'final_index_layout'):
+        return layout.final_index_layout()
+    return None
+
+
+class IncrementalTranspiler:
+    """
+    Transpiles successive edits of a circuit, reusing the work done for the unchanged prefix.
+
+    The transpiled circuit is kept as a list of segments, one per transpile call. When
+    a circuit arrives, the segments that lie entirely within its unchanged prefix are
+    reused; the remaining instructions are transpiled on their own, starting from the
+    layout the last reused segment ended in, and appended. Appending a gate or
+    changing a recent parameter therefore only transpiles the tail of the circuit.
+    Each segment keeps the combined circuit up to its end, so memory grows with
+    max_segments.
+
+    A full transpile is done on the first call, when the circuit's width or the
+    transpile options change, when nothing can be reused, when qiskit does not
+    report final layouts, and after max_segments segments so that optimizations
+    can act across segment boundaries again.
+
+    Attributes:
+        max_segments (int): Segment count that triggers a consolidating full transpile.
+        full_transpiles (int): Number of full transpiles performed.
+        incremental_transpiles (int): Number of transpiles that reused a prefix.
+    """
+
+    def __init__(self, max_segments=32):
+        """
+        Initialize an IncrementalTranspiler.
+
+        Args:
+            max_segments (int): Segment count that triggers a consolidating full transpile (default is 32).
+        """
+        self.max_segments = max_segments
+        self.full_transpiles = 0
+        self.incremental_transpiles = 0
+        self._options_key = None
+        self._keys = []
+        self._segments = []
+
+    def transpile(self, circuit, backend=None, **options):
+        """
+        Transpile a circuit, reusing the previous result for its unchanged prefix.
+
+        Args:
+            circuit (QuantumCircuit): The circuit to transpile.
+            backend (Backend, optional): The backend to transpile for.
+            **options: Further keyword arguments for qiskit.transpile (initial_layout is
+                only honoured on full transpiles).
+
+        Returns:
+            QuantumCircuit: The transpiled circuit.
+        """
+        keys = _instruction_keys(circuit)
+        options_key = (backend_key(backend), circuit.num_qubits, circuit.num_clbits,
+                       tuple(sorted((name, repr(value)) for name, value in options.items())))
+
+        reused = []
+        if options_key == self._options_key and len(self._segments) < self.max_segments:
+            prefix = 0
+            for old, new in zip(self._keys, keys):
+                if old != new:
+                    break
+                prefix += 1
+            reused = [segment for segment in self._segments if segment.stop <= prefix]
+            if reused and reused[-1].stop == len(keys) and len(keys) == len(self._keys):
+                # Nothing changed
+                return reused[-1].circuit
+
+        start = reused[-1].stop if reused else 0
+        suffix = circuit.copy_empty_like()
+        for instruction in circuit.data[start:]:
+            suffix._append(instruction.operation, instruction.qubits, instruction.clbits)
+
+        segment_options = dict(options)
+        if reused:
+            segment_options['initial_layout'] = reused[-1].layout
+        transpiled = transpile(suffix, backend, **segment_options)
+        layout = _final_layout(transpiled, circuit.num_qubits)
+
+        if reused and (layout is None or transpiled.num_qubits != reused[-1].circuit.num_qubits):
+            # The segment cannot be stitched onto the prefix; start over
+            reused = []
+            transpiled = transpile(circuit, backend, **options)
+            layout = _final_layout(transpiled, circuit.num_qubits)
+        if reused:
+            combined = reused[-1].circuit.compose(transpiled)
+            self.incremental_transpiles += 1
+        else:
+            combined = transpiled
+            self.full_transpiles += 1
+
+        self._options_key = options_key
+        self._keys = keys
+        # Without a final layout no later segment can start from this one
+        self._segments = reused + [_Segment(start, len(keys), combined, layout)] if layout is not None else []
+        return combined
+
+    def reset(self):
+        """
+        Forget the previous transpile results.
+        """
+        self._options_key = None
+        self._keys = []
+        self._segments = []
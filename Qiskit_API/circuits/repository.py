@@ -0,0 +1,315 @@
+import json
+import sqlite3
+import time
+
+from .serialization import circuit_content_hash, circuit_from_dict, circuit_to_dict
+from .update import apply_circuit_diff, diff_circuit_dicts, is_empty_diff
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS circuits (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    num_qubits INTEGER NOT NULL,
+    num_clbits INTEGER NOT NULL,
+    depth INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS circuits_num_qubits ON circuits (num_qubits);
+CREATE INDEX IF NOT EXISTS circuits_depth ON circuits (depth);
+CREATE INDEX IF NOT EXISTS circuits_content_hash ON circuits (content_hash);
+CREATE TABLE IF NOT EXISTS circuit_tags (
+    circuit_id INTEGER NOT NULL REFERENCES circuits (id) ON DELETE CASCADE,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (tag, circuit_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS circuit_tags_circuit ON circuit_tags (circuit_id);
+CREATE TABLE IF NOT EXISTS circuit_versions (
+    circuit_id INTEGER NOT NULL REFERENCES circuits (id) ON DELETE CASCADE,
+    version INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    diff TEXT NOT NULL,
+    PRIMARY KEY (circuit_id, version)
+) WITHOUT ROWID;
+"""
+
+_SUMMARY_COLUMNS = 'id, name, num_qubits, num_clbits, depth, content_hash, version, created_at, updated_at'
+
+
+class CircuitRepository:
+    """
+    Persistent circuit store with CRUD operations, indexed lookups and version history.
+
+    Circuits are stored in SQLite in their circuit_to_dict form. The latest version
+    of each circuit is stored in full; older versions are stored as reverse diffs
+    against the version after them, so an update costs the size of the edit and
+    reading the latest version never replays history. Name, tags, qubit count,
+    depth and content hash are indexed columns, so listing never parses circuits.
+
+    Attributes:
+        path (str): Path of the SQLite database, or ":memory:".
+    """
+
+    def __init__(self, path=':memory:'):
+        """
+        Open (and create if needed) a circuit repository.
+
+        Args:
+            path (str): Path of the SQLite database file (default is an in-memory database).
+        """
+        self.path = path
+        self._connection = sqlite3.connect(path)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.execute('PRAGMA foreign_keys = ON')
+        if path != ':memory:':
+            self._connection.execute('PRAGMA journal_mode = WAL')
+        self._connection.executescript(_SCHEMA)
+
+    def create(self, circuit, name=None, tags=None):
+        """
+        Store a new circuit.
+
+        Args:
+            circuit (QuantumCircuit): The circuit to store.
+            name (str, optional): Name to store it under (default is the circuit's name).
+            tags (iterable, optional): Tags to index the circuit by.
+
+        Returns:
+            dict: The stored circuit's summary (see list).
+
+        Raises:
+            ValueError: If a circuit with that name already exists.
+        """
+        name = name or circuit.name
+        data = dict(circuit_to_dict(circuit), name=name)
+        content_hash = circuit_content_hash(data)
+        now = time.time()
+        try:
+            with self._connection:
+                cursor = self._connection.execute(
+                    'INSERT INTO circuits (name, num_qubits, num_clbits, depth, content_hash, version, '
+                    'created_at, updated_at, data) VALUES (?, ?, ?, ?, ?, 1, ?, ?, ?)',
+                    (name, circuit.num_qubits, circuit.num_clbits, circuit.depth(), content_hash, now, now,
+                     json.dumps(data, separators=(',', ':'))),
+                )
+                self._set_tags(cursor.lastrowid, tags or ())
+        except sqlite3.IntegrityError:
+            raise ValueError(f"A circuit named {name!r} already exists.")
+        return self.get_summary(name)
+
+    def get(self, name, version=None):
+        """
+        Fetch a stored circuit.
+
+        Args:
+            name (str): Name of the circuit.
+            version (int, optional): Version to fetch (default is the latest).
+
+        Returns:
+            QuantumCircuit: The circuit, or None if it (or that version) does not exist.
+        """
+        data = self.get_data(name, version)
+        return circuit_from_dict(data) if data is not None else None
+
+    def get_data(self, name, version=None):
+        """
+        Fetch the serialized form of a stored circuit without building it.
+
+        Args:
+            name (str): Name of the circuit.
+            version (int, optional): Version to fetch (default is the latest).
+
+        Returns:
+            dict: The serialized circuit (see circuit_to_dict), or None if it does not exist.
+        """
+        row = self._connection.execute('SELECT id, version, data FROM circuits WHERE name = ?', (name,)).fetchone()
+        if row is None or (version is not None and not 1 <= version <= row['version']):
+            return None
+        data = json.loads(row['data'])
+        if version is None or version == row['version']:
+            return data
+        # Walk the reverse diffs back from the latest version
+        diffs = self._connection.execute(
+            'SELECT diff FROM circuit_versions WHERE circuit_id = ? AND version >= ? ORDER BY version DESC',
+            (row['id'], version),
+        )
+        for (diff,) in diffs:
+            data = apply_circuit_diff(data, json.loads(diff))
+        return data
+
+    def get_summary(self, name):
+        """
+        Fetch the indexed attributes of a stored circuit.
+
+        Args:
+            name (str): Name of the circuit.
+
+        Returns:
+            dict: The circuit's summary (see list), or None if it does not exist.
+        """
+        row = self._connection.execute(f'SELECT {_SUMMARY_COLUMNS} FROM circuits WHERE name = ?', (name,)).fetchone()
+        return self._summary(row) if row is not None else None
+
+    def list(self, tag=None, num_qubits=None, min_depth=None, max_depth=None, content_hash=None,
+             limit=None, offset=0):
+        """
+        List stored circuits matching all of the given filters, ordered by name.
+
+        Args:
+            tag (str, optional): Only circuits with this tag.
+            num_qubits (int, optional): Only circuits with this many qubits.
+            min_depth (int, optional): Only circuits at least this deep.
+            max_depth (int, optional): Only circuits at most this deep.
+            content_hash (str, optional): Only circuits with this content hash.
+            limit (int, optional): Maximum number of circuits to return.
+            offset (int): Number of matching circuits to skip.
+
+        Returns:
+            list: Summaries with the circuit's name, num_qubits, num_clbits, depth,
+                content_hash, version, created_at, updated_at and tags.
+        """
+        conditions, arguments = [], []
+        if tag is not None:
+            conditions.append('id IN (SELECT circuit_id FROM circuit_tags WHERE tag = ?)')
+            arguments.append(tag)
+        for condition, value in (('num_qubits = ?', num_qubits), ('depth >= ?', min_depth),
+                                 ('depth <= ?', max_depth), ('content_hash = ?', content_hash)):
+            if value is not None:
+                conditions.append(condition)
+                arguments.append(value)
+        query = f'SELECT {_SUMMARY_COLUMNS} FROM circuits'
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        query += ' ORDER BY name LIMIT ? OFFSET ?'
+        arguments += [limit if limit is not None else -1, offset]
+        rows = self._connection.execute(query, arguments).fetchall()
+        tags = self._tags([row['id'] for row in rows])
+        return [self._summary(row, tags.get(row['id'], [])) for row in rows]
+
+    def update(self, name, circuit=None, tags=None):
+        """
+        Store a new version of a circuit and/or replace its tags.
+
+        Only the diff back to the previous version is kept, so unchanged circuits
+        do not create a new version.
+
+        Args:
+            name (str): Name of the circuit.
+            circuit (QuantumCircuit, optional): The new version of the circuit.
+            tags (iterable, optional): Tags replacing the current ones.
+
+        Returns:
+            dict: The updated circuit's summary (see list).
+
+        Raises:
+            ValueError: If no circuit with that name exists.
+        """
+        if circuit is not None:
+            # Everything that does not depend on the stored version is computed outside the lock
+            new = dict(circuit_to_dict(circuit), name=name)
+            depth = circuit.depth()
+        with self._connection:
+            # The current version is read inside the write transaction, so concurrent updates
+            # cannot both diff against the same version and write the same version number
+            self._connection.execute('BEGIN IMMEDIATE')
+            row = self._connection.execute('SELECT id, version, content_hash, data FROM circuits WHERE name = ?',
+                                           (name,)).fetchone()
+            if row is None:
+                raise ValueError(f"No circuit named {name!r}.")
+            if circuit is not None:
+                old = json.loads(row['data'])
+                reverse_diff = diff_circuit_dicts(new, old)
+                if not is_empty_diff(reverse_diff):
+                    now = time.time()
+                    self._connection.execute(
+                        'INSERT INTO circuit_versions (circuit_id, version, content_hash, diff) VALUES (?, ?, ?, ?)',
+                        (row['id'], row['version'], row['content_hash'],
+                         json.dumps(reverse_diff, separators=(',', ':'))),
+                    )
+                    self._connection.execute(
+                        'UPDATE circuits SET num_qubits = ?, num_clbits = ?, depth = ?, content_hash = ?, '
+                        'version = ?, updated_at = ?, data = ? WHERE id = ?',
+                        (circuit.num_qubits, circuit.num_clbits, depth, circuit_content_hash(new), row['version'] + 1,
+                         now, json.dumps(new, separators=(',', ':')), row['id']),
+                    )
+            if tags is not None:
+                self._connection.execute('DELETE FROM circuit_tags WHERE circuit_id = ?', (row['id'],))
+                self._set_tags(row['id'], tags)
+        return self.get_summary(name)
+
+    def history(self, name):
+        """
+        List the versions of a stored circuit.
+
+        Args:
+            name (str): Name of the circuit.
+
+        Returns:
+            list: {"version", "content_hash"} dicts, oldest first
+                (empty if the circuit does not exist).
+        """
+        row = self._connection.execute('SELECT id, version, content_hash FROM circuits WHERE name = ?',
+                                       (name,)).fetchone()
+        if row is None:
+            return []
+        versions = self._connection.execute(
+            'SELECT version, content_hash FROM circuit_versions WHERE circuit_id = ? ORDER BY version', (row['id'],)
+        )
+        history = [{'version': version, 'content_hash': content_hash} for version, content_hash in versions]
+        history.append({'version': row['version'], 'content_hash': row['content_hash']})
+        return history
+
+    def delete(self, name):
+        """
+        Delete a stored circuit with its tags and history.
+
+        Args:
+            name (str): Name of the circuit.
+
+        Returns:
+            bool: True if the circuit was deleted, False if it did not exist.
+        """
+        with self._connection:
+            cursor = self._connection.execute('DELETE FROM circuits WHERE name = ?', (name,))
+        return cursor.rowcount > 0
+
+    def __len__(self):
+        return self._connection.execute('SELECT COUNT(*) FROM circuits').fetchone()[0]
+
+    def __contains__(self, name):
+        return self._connection.execute('SELECT 1 FROM circuits WHERE name = ?', (name,)).fetchone() is not None
+
+    def close(self):
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _set_tags(self, circuit_id, tags):
+        self._connection.executemany('INSERT OR IGNORE INTO circuit_tags (circuit_id, tag) VALUES (?, ?)',
+                                     [(circuit_id, tag) for tag in tags])
+
+    def _tags(self, circuit_ids):
+        tags = {}
+        # Stay under SQLite's bound-parameter limit on large pages
+        for start in range(0, len(circuit_ids), 500):
+            chunk = circuit_ids[start:start + 500]
+            rows = self._connection.execute(
+                f"SELECT circuit_id, tag FROM circuit_tags WHERE circuit_id IN ({','.join('?' * len(chunk))}) "
+                'ORDER BY tag', chunk,
+            )
+            for circuit_id, tag in rows:
+                tags.setdefault(circuit_id, []).append(tag)
+        return tags
+
+    def _summary(self, row, tags=None):
+        summary = dict(row)
+        summary.pop('id')
+        summary['tags'] = tags if tags is not None else self._tags([row['id']]).get(row['id'], [])
+        return summary
@@ -0,0 +1,377 @@
+import base64
+import hashlib
+import io
+import json
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from qiskit import ClassicalRegister, QuantumCircuit, QuantumRegister, qpy
+from qiskit.circuit import Barrier, Parameter, ParameterExpression
+from qiskit.circuit.library import get_standard_gate_name_mapping
+
+from ..metrics import timed
+
+ARCHIVE_INDEX_SUFFIX = '.idx'
+ARCHIVE_INDEX_VERSION = 1
+
+# Gate name -> (class, shared instance); only the parameterless instances are meant to be shared
+STANDARD_OPERATIONS = {name: (type(op), op) for name, op in get_standard_gate_name_mapping().items()}
+
+
+def circuit_to_qasm(circuit):
+    """
+    Return the OpenQASM 2 source of a circuit on both old and new qiskit versions.
+    """
+    try:
+        from qiskit import qasm2
+    except ImportError:
+        return circuit.qasm()
+    return qasm2.dumps(circuit)
+
+
+def circuit_to_dict(circuit):
+    """
+    Convert a circuit into a compact, JSON-serializable dictionary.
+
+    Circuits made of standard gates with numeric or plain Parameter arguments are
+    stored as an instruction list, which is much faster to load than OpenQASM.
+    Their registers are kept as [name, size] pairs, so counts keep their
+    register layout after a round trip, and so are the global phase and delay
+    units. Anything else (custom gates, classical conditions, parameter
+    expressions, bits outside registers) falls back to the OpenQASM 2 source, or
+    to base64-encoded QPY when the circuit cannot be expressed in OpenQASM 2 or
+    has a parameterized global phase.
+
+    Args:
+        circuit (QuantumCircuit): The circuit to convert.
+
+    Returns:
+        dict: The circuit name, width, "global_phase" when it is not 0, and either "qregs",
+            "cregs" and "instructions", or one of "qasm" or "qpy".
+    """
+    qubit_indices = {bit: index for index, bit in enumerate(circuit.qubits)}
+    clbit_indices = {bit: index for index, bit in enumerate(circuit.clbits)}
+    data = {
+        'name': circuit.name,
+        'num_qubits': circuit.num_qubits,
+        'num_clbits': circuit.num_clbits,
+    }
+    if circuit.metadata:
+        data['metadata'] = circuit.metadata
+    if isinstance(circuit.global_phase, ParameterExpression):
+        return _fallback_dict(circuit, data, qasm=False)
+    if circuit.global_phase:
+        # Recorded for every form, since OpenQASM 2 drops the global phase
+        data['global_phase'] = float(circuit.global_phase)
+
+    qregs = _register_layout(circuit.qregs, circuit.qubits)
+    cregs = _register_layout(circuit.cregs, circuit.clbits)
+    if qregs is None or cregs is None:
+        return _fallback_dict(circuit, data)
+    data['qregs'] = qregs
+    data['cregs'] = cregs
+
+    instructions = []
+    for instruction in circuit.data:
+        operation = instruction.operation
+        if (operation.name not in STANDARD_OPERATIONS and operation.name != 'barrier') \
+                or getattr(operation, 'condition', None) is not None \
+                or any(isinstance(param, ParameterExpression) and not isinstance(param, Parameter)
+                       for param in operation.params):
+            return _fallback_dict(circuit, data)
+        # [name, qubits, clbits, params(, unit)] with empty trailing fields dropped to keep records small
+        encoded = [
+            operation.name,
+            [qubit_indices[qubit] for qubit in instruction.qubits],
+            [clbit_indices[clbit] for clbit in instruction.clbits],
+            [{'parameter': param.name} if isinstance(param, Parameter) else float(param)
+             for param in operation.params],
+        ]
+        if operation.name == 'delay':
+            encoded.append(operation.unit)
+        while len(encoded) > 2 and not encoded[-1]:
+            encoded.pop()
+        instructions.append(encoded)
+    data['instructions'] = instructions
+    return data
+
+
+def circuit_content_hash(data):
+    """
+    Hash the content of a serialized circuit, ignoring its name and metadata.
+
+    Args:
+        data (dict): A serialized circuit (see circuit_to_dict).
+
+    Returns:
+        str: Hex SHA-256 digest of the circuit's width, registers and instructions.
+    """
+    content = {key: value for key, value in data.items() if key not in ('name', 'metadata')}
+    return hashlib.sha256(json.dumps(content, sort_keys=True, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+
+def _register_layout(registers, bits):
+    # [[name, size], ...] when the registers hold exactly the circuit's bits, in order
+    if [bit for register in registers for bit in register] != list(bits):
+        return None
+    return [[register.name, register.size] for register in registers]
+
+
+def _fallback_dict(circuit, data, qasm=True):
+    if qasm:
+        try:
+            data['qasm'] = circuit_to_qasm(circuit)
+            return data
+        except Exception:
+            pass
+    buffer = io.BytesIO()
+    qpy.dump(circuit, buffer)
+    data['qpy'] = base64.b64encode(buffer.getvalue()).decode('ascii')
+    return data
+
+
+def circuit_from_dict(data):
+    """
+    Rebuild a circuit from a dictionary produced by circuit_to_dict.
+
+    Args:
+        data (dict): The serialized circuit.
+
+    Returns:
+        QuantumCircuit: The reconstructed circuit.
+    """
+    if 'qpy' in data:
+        circuit = qpy.load(io.BytesIO(base64.b64decode(data['qpy'])))[0]
+    elif 'qasm' in data:
+        circuit = QuantumCircuit.from_qasm_str(data['qasm'])
+    else:
+        if 'qregs' in data:
+            circuit = QuantumCircuit(*[QuantumRegister(size, name) for name, size in data['qregs']],
+                                     *[ClassicalRegister(size, name) for name, size in data['cregs']])
+        else:
+            # Written before registers were recorded
+            circuit = QuantumCircuit(data['num_qubits'], data['num_clbits'])
+        qubits, clbits = circuit.qubits, circuit.clbits
+        parameters = {}
+        for encoded in data['instructions']:
+            name, qargs = encoded[0], encoded[1]
+            cargs = encoded[2] if len(encoded) > 2 else ()
+            params = encoded[3] if len(encoded) > 3 else None
+            if name == 'barrier':
+                operation = Barrier(len(qargs))
+            elif not params:
+                operation = STANDARD_OPERATIONS[name][1]
+            else:
+                params = [parameters.setdefault(param['parameter'], Parameter(param['parameter']))
+                          if isinstance(param, dict) else param
+                          for param in params]
+                # Parameterized gates are mutable (label, condition), so each gets its own instance
+                if len(encoded) > 4:
+                    operation = STANDARD_OPERATIONS[name][0](*params, unit=encoded[4])
+                else:
+                    operation = STANDARD_OPERATIONS[name][0](*params)
+            # The indices come from a valid circuit, so skip append()'s broadcasting and checks
+            circuit._append(operation, [qubits[index] for index in qargs], [clbits[index] for index in cargs])
+    circuit.name = data.get('name') or circuit.name
+    if data.get('metadata'):
+        circuit.metadata = data['metadata']
+    if 'global_phase' in data:
+        circuit.global_phase = data['global_phase']
+    return circuit
+
+
+class CircuitArchiveWriter:
+    """
+    Streams circuits into a JSONL archive with a byte-offset index.
+
+    Each circuit is written as one line produced by circuit_to_dict. The offsets
+    and names are written to a sidecar ``<path>.idx`` file on close, which is
+    what gives CircuitArchive constant-time random access.
+
+    Attributes:
+        path (str): Path of the archive file.
+        offsets (list): Byte offset of every record written so far.
+        names (list): Name of every record written so far.
+    """
+
+    def __init__(self, path, append=False):
+        """
+        Open an archive for writing.
+
+        Args:
+            path (str): Path of the archive file.
+            append (bool): Add to an existing archive instead of truncating it.
+        """
+        self.path = path
+        self.offsets = []
+        self.names = []
+        if append and os.path.exists(path):
+            index = _read_index(path)
+            self.offsets, self.names = index['offsets'], index['names']
+        self._file = open(path, 'ab' if append else 'wb')
+
+    def write(self, circuit):
+        """
+        Append a circuit (or an already serialized circuit dict) to the archive.
+
+        Args:
+            circuit (QuantumCircuit or dict): The circuit to store.
+        """
+        data = circuit if isinstance(circuit, dict) else circuit_to_dict(circuit)
+        self.offsets.append(self._file.tell())
+        self.names.append(data.get('name'))
+        self._file.write(json.dumps(data, separators=(',', ':')).encode('utf-8') + b'\n')
+
+    def close(self):
+        """
+        Flush the records and write the offset index.
+        """
+        end = self._file.tell()
+        self._file.close()
+        with open(self.path + ARCHIVE_INDEX_SUFFIX, 'w') as file:
+            json.dump({'version': ARCHIVE_INDEX_VERSION, 'offsets': self.offsets + [end], 'names': self.names}, file)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _read_index(path):
+    index_path = path + ARCHIVE_INDEX_SUFFIX
+    if os.path.exists(index_path) and os.path.getmtime(index_path) >= os.path.getmtime(path):
+        with open(index_path) as file:
+            index = json.load(file)
+        if index.get('version') == ARCHIVE_INDEX_VERSION:
+            index['offsets'] = index['offsets'][:-1]
+            return index
+
+    # No usable index: rebuild it with a single scan over the newlines
+    offsets, names = [], []
+    with open(path, 'rb') as file:
+        offset = 0
+        for line in file:
+            if line.strip():
+                offsets.append(offset)
+                names.append(json.loads(line).get('name'))
+            offset += len(line)
+    return {'version': ARCHIVE_INDEX_VERSION, 'offsets': offsets, 'names': names}
+
+
+def _load_archive_range(path, start, stop):
+    # Worker entry point: each process maps the archive itself instead of receiving the bytes
+    with CircuitArchive(path) as archive:
+        return [archive[index] for index in range(start, stop)]
+
+
+class CircuitArchive:
+    """
+    Memory-mapped, random-access reader for archives written by CircuitArchiveWriter.
+
+    Only the index is loaded up front; records are located by offset and parsed
+    on access, so opening a 100k-circuit archive costs one index read.
+
+    Attributes:
+        path (str): Path of the archive file.
+        names (list): Name of every record, in archive order.
+    """
+
+    def __init__(self, path):
+        """
+        Open an archive for reading.
+
+        Args:
+            path (str): Path of the archive file.
+        """
+        self.path = path
+        index = _read_index(path)
+        self._offsets = index['offsets']
+        self.names = index['names']
+        self._name_to_index = {}
+        for position, name in enumerate(self.names):
+            self._name_to_index.setdefault(name, position)
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self._offsets else b''
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def record(self, key):
+        """
+        Return the serialized form of a circuit without building it.
+
+        Args:
+            key (int or str): Position in the archive or circuit name.
+
+        Returns:
+            dict: The serialized circuit (see circuit_to_dict).
+        """
+        index = self._name_to_index[key] if isinstance(key, str) else range(len(self))[key]
+        start = self._offsets[index]
+        end = self._offsets[index + 1] if index + 1 < len(self._offsets) else len(self._map)
+        return json.loads(self._map[start:end])
+
+    def __getitem__(self, key):
+        return circuit_from_dict(self.record(key))
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    @timed('archive_load')
+    def load(self, workers=None, chunk_size=1000):
+        """
+        Parse every circuit in the archive, optionally across worker processes.
+
+        Args:
+            workers (int, optional): Number of worker processes; parses in-process when None or 1.
+            chunk_size (int): Number of records parsed per worker task.
+
+        Returns:
+            list: The circuits, in archive order.
+        """
+        if not workers or workers == 1:
+            return list(self)
+        bounds = [(start, min(start + chunk_size, len(self))) for start in range(0, len(self), chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunks = executor.map(_load_archive_range, [self.path] * len(bounds),
+                                  [start for start, _ in bounds], [stop for _, stop in bounds])
+            return [circuit for chunk in chunks for circuit in chunk]
+
+    def close(self):
+        if self._offsets:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+@timed('archive_write')
+def write_circuit_archive(path, circuits):
+    """
+    Write many circuits into a single archive file.
+
+    Args:
+        path (str): Path of the archive file.
+        circuits (iterable): QuantumCircuits (or serialized circuit dicts) to store.
+
+    Returns:
+        int: The number of circuits written.
+    """
+    with CircuitArchiveWriter(path) as writer:
+        for circuit in circuits:
+            writer.write(circuit)
+        return len(writer.offsets)
+
+
+def is_circuit_archive(path):
+    """
+    Check whether a path is a circuit archive (i.e. has an offset index next to it).
+    """
+    return os.path.isfile(path) and os.path.exists(path + ARCHIVE_INDEX_SUFFIX)
@@ -0,0 +1,71 @@
+import difflib
+import json
+
+# Fields that describe the circuit rather than its instructions; diffs replace them wholesale
+_CIRCUIT_FIELDS = ('name', 'num_qubits', 'num_clbits', 'qregs', 'cregs', 'global_phase', 'metadata', 'qasm', 'qpy')
+
+
+def diff_circuit_dicts(old, new):
+    """
+    Compute an incremental diff that turns one serialized circuit into another.
+
+    Both arguments are dictionaries produced by circuits.serialization.circuit_to_dict.
+    Instruction lists are diffed as sequences, so editing a few gates of a large
+    circuit produces a diff of a few instructions.
+
+    Args:
+        old (dict): The serialized circuit to diff from.
+        new (dict): The serialized circuit to diff to.
+
+    Returns:
+        dict: {"fields": {...}, "ops": [[start, end, instructions], ...]}. Fields set to
+            None are removed; each op replaces old instructions[start:end].
+    """
+    fields = {key: new.get(key) for key in _CIRCUIT_FIELDS if old.get(key) != new.get(key)}
+    old_instructions = old.get('instructions')
+    new_instructions = new.get('instructions')
+    ops = []
+    if old_instructions is None or new_instructions is None:
+        if old_instructions != new_instructions:
+            fields['instructions'] = new_instructions
+    else:
+        # Compare encoded instructions so the nested lists become hashable
+        matcher = difflib.SequenceMatcher(None, [json.dumps(item) for item in old_instructions],
+                                          [json.dumps(item) for item in new_instructions], autojunk=False)
+        for tag, start, end, new_start, new_end in matcher.get_opcodes():
+            if tag != 'equal':
+                ops.append([start, end, new_instructions[new_start:new_end]])
+    return {'fields': fields, 'ops': ops}
+
+
+def apply_circuit_diff(data, diff):
+    """
+    Apply a diff produced by diff_circuit_dicts.
+
+    Args:
+        data (dict): The serialized circuit the diff was computed from. It is not modified.
+        diff (dict): The diff to apply.
+
+    Returns:
+        dict: The serialized circuit the diff was computed to.
+    """
+    result = dict(data)
+    for key, value in diff['fields'].items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = value
+    if diff['ops']:
+        instructions = list(result['instructions'])
+        # Apply back to front so earlier offsets stay valid
+        for start, end, replacement in reversed(diff['ops']):
+            instructions[start:end] = replacement
+        result['instructions'] = instructions
+    return result
+
+
+def is_empty_diff(diff):
+    """
+    Check whether a diff leaves the circuit unchanged.
+    """
+    return not diff['fields'] and not diff['ops']
@@ -18,20 +18,340 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-# TODO: Implement cli_interface.py
-def placeholder_function():
-    # TODO: Replace with actual code
-    pass
+import argparse
+import json
+import logging
+import os
+import sys
 
+from .execute.optimize import OPTIMIZATION_PRESETS
+from .execute.simulation import SIMULATION_METHODS
+from .structured_logging import setup_logging
 
-def parse_command_line_arguments():
-    # TODO: Implement command-line argument parsing
-    pass
+# Command handlers import qiskit (through the execute/ and backends/ modules) on
+# demand, so `--help` and argument errors return immediately.
 
-def parse_command_line_arguments():
-    # TODO: Implement command-line argument parsing
-    pass
+DEFAULTS = {
+    'backend': 'qasm_simulator',
+    'shots': 1024,
+    'concurrency': 4,
+    'token': None,
+    'preset': None,
+    'mimic': None,
+    'mimic_token': None,
+    'method': 'auto',
+    'mitigate': None,
+    'checkpoint': None,
+}
 
-def parse_command_line_arguments():
-    # TODO: Implement command-line argument parsing
-    pass
+
+def parse_command_line_arguments(argv=None):
+    parser = argparse.ArgumentParser(description='Qiskit API Command-Line Interface')
+
+    # Verbosity control
+    parser.add_argument('-v', '--verbose', action='store_true', help='Increase output verbosity')
+
+    # Config file option
+    parser.add_argument('--config', type=str, help='Path to a JSON file with default option values')
+
+    # Version option
+    parser.add_argument('--version', action='version', version='Qiskit API version 1.0')
+
+    # Subparsers for different functionalities
+    subparsers = parser.add_subparsers(title='Commands', dest='command')
+    subparsers.required = True
+
+    # Options shared by every command that talks to a backend
+    backend_options = argparse.ArgumentParser(add_help=False)
+    backend_options.add_argument('--token', type=str, help='IBMQ token (defaults to the local Aer simulators)')
+
+    execution_options = argparse.ArgumentParser(add_help=False, parents=[backend_options])
+    execution_options.add_argument('--backend', type=str, help='Backend name (default: qasm_simulator)')
+    execution_options.add_argument('--shots', type=int, help='Shots per circuit (default: 1024)')
+    execution_options.add_argument('--output', type=str, help='Write results to this file instead of stdout')
+    execution_options.add_argument('--preset', type=str, choices=['auto', *OPTIMIZATION_PRESETS],
+                                   help='Optimization preset (default: a plain transpile)')
+    execution_options.add_argument('--mimic', type=str,
+                                   help='Simulate with the noise of this device: a fake backend name '
+                                        '(e.g. fake_manila), a calibration snapshot file, or a live device '
+                                        'name with --mimic-token')
+    execution_options.add_argument('--mimic-token', type=str,
+                                   help='IBMQ token used only to read the calibration of a live --mimic device')
+    execution_options.add_argument('--method', type=str, choices=['auto', *SIMULATION_METHODS],
+                                   help='Local simulation method (default: auto, chosen per circuit)')
+    execution_options.add_argument('--mitigate', action='append', choices=['readout', 'zne'],
+                                   help='Error mitigation stage; repeat for both (default: none)')
+
+    run_parser = subparsers.add_parser('run', parents=[execution_options], help='Execute a single circuit')
+    run_parser.add_argument('circuit', type=str, help='Path to a .qasm or .json circuit file')
+    run_parser.add_argument('--async', dest='async_mode', action='store_true',
+                            help='Submit the job and print its ID instead of waiting for results')
+    run_parser.add_argument('--memory', type=str,
+                            help='Write every shot, bit-packed, to this .npy file (run in chunks of shots)')
+    run_parser.add_argument('--packing', type=str, choices=['uint8', 'uint64'], default='uint8',
+                            help='Per-shot packing for --memory (default: uint8)')
+
+    batch_parser = subparsers.add_parser('batch', parents=[execution_options],
+                                         help='Execute many circuits in parallel, streaming JSONL results')
+    batch_parser.add_argument('source', type=str,
+                              help="Directory of circuit files, a JSONL file, or '-' for JSONL on stdin")
+    batch_parser.add_argument('-j', '--concurrency', type=int, help='Number of parallel workers (default: 4)')
+    batch_parser.add_argument('--threads', action='store_true',
+                              help='Use worker threads instead of processes')
+    batch_parser.add_argument('--checkpoint', type=str,
+                              help='Record each finished circuit in this SQLite file so the batch can be resumed')
+    batch_parser.add_argument('--idempotency-key', type=str,
+                              help='With --checkpoint, continue the batch started under this key instead of '
+                                   'starting a new one')
+
+    resume_parser = subparsers.add_parser('resume', parents=[backend_options],
+                                          help='Run the circuits a checkpointed batch has not completed')
+    resume_parser.add_argument('batch_id', type=str, help='ID of a checkpointed batch')
+    resume_parser.add_argument('--checkpoint', type=str, help='SQLite file the batch was checkpointed to')
+    resume_parser.add_argument('--mimic-token', type=str,
+                               help='IBMQ token for the batch\'s live --mimic device (never checkpointed)')
+    resume_parser.add_argument('--output', type=str, help='Write results to this file instead of stdout')
+    resume_parser.add_argument('--all', dest='include_completed', action='store_true',
+                               help='Also write the outcomes of circuits completed by earlier runs')
+    resume_parser.add_argument('--no-retry', dest='retry_failed', action='store_false',
+                               help='Do not run circuits that failed in earlier runs again')
+
+    dedupe_parser = subparsers.add_parser('dedupe', help='Report equivalent circuits in a workload')
+    dedupe_parser.add_argument('source', type=str,
+                               help="Directory of circuit files, a JSONL file, or '-' for JSONL on stdin")
+    dedupe_parser.add_argument('--output', type=str, help='Write the report to this file instead of stdout')
+
+    status_parser = subparsers.add_parser('status', parents=[backend_options], help='Show the status of a job')
+    status_parser.add_argument('job_id', type=str, help='ID of a submitted job')
+
+    results_parser = subparsers.add_parser('results', parents=[backend_options], help='Fetch the counts of a job')
+    results_parser.add_argument('job_id', type=str, help='ID of a submitted job')
+
+    backends_parser = subparsers.add_parser('backends', parents=[backend_options], help='List or describe backends')
+    backends_parser.add_argument('name', type=str, nargs='?', help='Show details for this backend only')
+
+    profiles_parser = subparsers.add_parser('profiles', help='List or show captured request profiles')
+    profiles_parser.add_argument('profile_id', type=str, nargs='?', help='Show this profile only')
+    profiles_parser.add_argument('--dir', dest='profile_dir', type=str,
+                                 help='Profile directory (default: $QISKIT_API_PROFILE_DIR)')
+    profiles_parser.add_argument('--collapsed', action='store_true',
+                                 help='Print sampled stacks in the collapsed format flame graph tools read')
+    profiles_parser.add_argument('--output', type=str, help='Write to this file instead of stdout')
+
+    # Parse the arguments
+    args = parser.parse_args(argv)
+
+    # Fill options that were not given on the command line from the config file, then the defaults
+    config = {}
+    if args.config:
+        with open(args.config) as file:
+            config = json.load(file)
+    for option, default in DEFAULTS.items():
+        if getattr(args, option, default) is None:
+            setattr(args, option, config.get(option, default))
+
+    return args
+
+
+def _open_output(path):
+    return open(path, 'w') if path else sys.stdout
+
+
+def _write_json(document, path=None):
+    output = _open_output(path)
+    try:
+        output.write(json.dumps(document, indent=4) + '\n')
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+def run_command(args):
+    from .execute.execute import load_circuit, iter_circuit_records
+    from .execute.simulation import SimulationSelector
+    from .qiskit_api import run_quantum_circuit
+
+    record = next(iter_circuit_records(args.circuit))
+    circuit = load_circuit(record)
+    pipeline = None
+    if args.preset:
+        from .execute.optimize import OptimizationPipeline
+
+        pipeline = OptimizationPipeline(args.preset)
+    selector = SimulationSelector(None if args.method == 'auto' else args.method)
+    mitigation = None
+    if args.mitigate:
+        from .execute.mitigation import ErrorMitigation
+
+        mitigation = ErrorMitigation.from_stages(args.mitigate)
+    if args.async_mode:
+        job = run_quantum_circuit(circuit, backend_name=args.backend, shots=args.shots,
+                                  token=args.token, async_mode=True, pipeline=pipeline, mimic_backend=args.mimic,
+                                  simulation=selector, mimic_token=args.mimic_token)
+        document = {'name': record['name'], 'job_id': job.job_id()}
+    elif args.memory:
+        from .execute.memory import save_shots
+
+        save_shots(circuit, args.memory, args.shots, packing=args.packing, backend_name=args.backend,
+                   token=args.token, pipeline=pipeline, mimic_backend=args.mimic, simulation=selector,
+                   mimic_token=args.mimic_token)
+        document = {'name': record['name'], 'memory': args.memory, 'shots': args.shots,
+                    'num_clbits': circuit.num_clbits, 'packing': args.packing}
+    else:
+        counts = run_quantum_circuit(circuit, backend_name=args.backend, shots=args.shots,
+                                     token=args.token, monitor=False, pipeline=pipeline,
+                                     mimic_backend=args.mimic, simulation=selector, mitigation=mitigation,
+                                     mimic_token=args.mimic_token)
+        document = {'name': record['name'], 'counts': counts}
+        if mitigation is not None:
+            document['mitigation'] = mitigation.last_report
+    if pipeline is not None:
+        document['optimization'] = pipeline.last_report
+    if selector.last_plan is not None:
+        document['simulation'] = selector.last_plan._asdict()
+    _write_json(document, args.output)
+    return 0
+
+
+def _write_outcomes(outcomes, path):
+    output = _open_output(path)
+    failures = 0
+    try:
+        # One JSON document per line, flushed as soon as each circuit finishes
+        for outcome in outcomes:
+            failures += outcome['status'] != 'ok'
+            output.write(json.dumps(outcome) + '\n')
+            output.flush()
+    finally:
+        # Lets a checkpointed batch release its claim before the store closes
+        outcomes.close()
+        if output is not sys.stdout:
+            output.close()
+    logging.info(f"Batch finished with {failures} failed circuits.")
+    return 1 if failures else 0
+
+
+def batch_command(args):
+    from .execute.execute import execute_batch, iter_circuit_records
+
+    options = dict(concurrency=args.concurrency, backend_name=args.backend, shots=args.shots,
+                   use_processes=not args.threads, preset=args.preset, mimic_backend=args.mimic,
+                   method=args.method, mitigation=args.mitigate)
+    if args.checkpoint is None:
+        if args.idempotency_key is not None:
+            raise ValueError("--idempotency-key needs --checkpoint.")
+        return _write_outcomes(execute_batch(iter_circuit_records(args.source), token=args.token,
+                                             mimic_token=args.mimic_token, **options), args.output)
+
+    from .execute.checkpoint import CheckpointStore, resume_batch
+
+    with CheckpointStore(args.checkpoint) as store:
+        batch_id = store.open_batch(args.source, options, idempotency_key=args.idempotency_key)
+        # The ID is needed to resume, so it is shown whatever the verbosity
+        sys.stderr.write(f"Checkpointing batch {batch_id} to {args.checkpoint}\n")
+        return _write_outcomes(resume_batch(store, batch_id, token=args.token, mimic_token=args.mimic_token),
+                               args.output)
+
+
+def resume_command(args):
+    from .execute.checkpoint import CheckpointStore, resume_batch
+
+    if args.checkpoint is None:
+        raise ValueError("--checkpoint is required (or set \"checkpoint\" in the config file).")
+    if not os.path.exists(args.checkpoint):
+        raise ValueError(f"No checkpoint file {args.checkpoint!r}.")
+    with CheckpointStore(args.checkpoint) as store:
+        outcomes = resume_batch(store, args.batch_id, token=args.token, include_completed=args.include_completed,
+                                retry_failed=args.retry_failed, mimic_token=args.mimic_token)
+        return _write_outcomes(outcomes, args.output)
+
+
+def dedupe_command(args):
+    from .circuits.fingerprint import dedupe_report
+    from .execute.execute import load_circuit, iter_circuit_records
+
+    # load_circuit names each circuit after its record, which is what the report lists
+    report = dedupe_report(load_circuit(record) for record in iter_circuit_records(args.source))
+    _write_json(report, args.output)
+    return 0
+
+
+def status_command(args):
+    from .execute.status import get_job_status
+
+    _write_json(get_job_status(args.job_id, token=args.token))
+    return 0
+
+
+def results_command(args):
+    from .execute.results import get_job_results
+
+    _write_json(get_job_results(args.job_id, token=args.token))
+    return 0
+
+
+def backends_command(args):
+    if args.name:
+        from .backends.details import get_backend_details
+
+        _write_json(get_backend_details(args.name, token=args.token))
+    else:
+        from .backends.list import list_backends
+
+        _write_json(list_backends(token=args.token))
+    return 0
+
+
+def profiles_command(args):
+    from .profiling import ProfileStore
+
+    directory = args.profile_dir or os.environ.get('QISKIT_API_PROFILE_DIR')
+    if not directory or not os.path.isdir(directory):
+        raise ValueError('No profile directory; pass --dir or set QISKIT_API_PROFILE_DIR')
+    store = ProfileStore(directory)
+    if not args.profile_id:
+        _write_json(store.list(), args.output)
+        return 0
+    profile = store.load(args.profile_id)
+    if profile is None:
+        raise ValueError(f"Profile {args.profile_id} not found (it may have been evicted)")
+    if args.collapsed:
+        if 'stacks' not in profile:
+            raise ValueError(f"Profile {args.profile_id} was captured with {profile['method']}, not the stack sampler")
+        output = _open_output(args.output)
+        try:
+            for stack, count in profile['stacks'].items():
+                output.write(f"{stack} {count}\n")
+        finally:
+            if output is not sys.stdout:
+                output.close()
+    else:
+        _write_json(profile, args.output)
+    return 0
+
+
+COMMANDS = {
+    'run': run_command,
+    'batch': batch_command,
+    'resume': resume_command,
+    'dedupe': dedupe_command,
+    'status': status_command,
+    'results': results_command,
+    'backends': backends_command,
+    'profiles': profiles_command,
+}
+
+
+def main(argv=None):
+    args = parse_command_line_arguments(argv)
+    # Logs go to stderr so stdout only carries results
+    setup_logging(stream=sys.stderr, level=logging.INFO if args.verbose else logging.WARNING, json_format=False)
+    try:
+        return COMMANDS[args.command](args)
+    except Exception as e:
+        logging.error(f"{args.command} failed: {e}")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
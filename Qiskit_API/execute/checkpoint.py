@@ -0,0 +1,421 @@
+import hashlib
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS batches (
+    id TEXT PRIMARY KEY,
+    idempotency_key TEXT UNIQUE,
+    request_hash TEXT NOT NULL,
+    source TEXT NOT NULL,
+    options TEXT NOT NULL,
+    status TEXT NOT NULL,
+    owner TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS batch_items (
+    batch_id TEXT NOT NULL REFERENCES batches (id) ON DELETE CASCADE,
+    item INTEGER NOT NULL,
+    name TEXT,
+    record_hash TEXT NOT NULL,
+    status TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    finished_at REAL NOT NULL,
+    PRIMARY KEY (batch_id, item)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS idempotent_requests (
+    key TEXT PRIMARY KEY,
+    request_hash TEXT NOT NULL,
+    status TEXT NOT NULL,
+    status_code INTEGER,
+    response TEXT,
+    updated_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idempotent_requests_updated ON idempotent_requests (updated_at);
+"""
+
+# A running batch or request that has not made progress for this long is treated as abandoned
+DEFAULT_LEASE_SECONDS = 300.0
+
+# Stored responses of idempotent requests are replayed for this long, then dropped
+DEFAULT_RESPONSE_TTL = 24 * 3600.0
+
+# Expired responses are purged at most this often
+_PURGE_INTERVAL = 60.0
+
+# execute_batch options kept with a batch so it resumes the same way; the IBMQ token never is
+BATCH_OPTIONS = ('concurrency', 'backend_name', 'shots', 'use_processes', 'preset', 'mimic_backend', 'method',
+                 'mitigation')
+
+
+def request_hash(payload):
+    """
+    Hash a JSON-serializable request independently of key order.
+
+    Returns:
+        str: Hex SHA-256 digest.
+    """
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+class CheckpointStore:
+    """
+    Persistent progress of batch runs, and responses of idempotent requests.
+
+    Each finished circuit of a batch is committed as soon as it completes, so a
+    batch interrupted by a crash, deploy or timeout resumes with only the
+    circuits that had not finished. A batch is run by one owner at a time: the
+    owner renews its lease with a heartbeat while circuits run, and a batch
+    whose owner stopped renewing for lease_seconds can be taken over.
+
+    Attributes:
+        path (str): Path of the SQLite database, or ":memory:".
+        lease_seconds (float): Idle time after which a running batch or request is considered abandoned.
+        response_ttl (float): Seconds for which responses of idempotent requests are kept.
+    """
+
+    def __init__(self, path=':memory:', lease_seconds=DEFAULT_LEASE_SECONDS, response_ttl=DEFAULT_RESPONSE_TTL):
+        """
+        Open (and create if needed) a checkpoint store.
+
+        Args:
+            path (str): Path of the SQLite database file (default is an in-memory database).
+            lease_seconds (float): See the class attributes.
+            response_ttl (float): See the class attributes.
+        """
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.response_ttl = response_ttl
+        self._purged = 0.0
+        # Shared by the web server's request threads
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.execute('PRAGMA foreign_keys = ON')
+        if path != ':memory:':
+            self._connection.execute('PRAGMA journal_mode = WAL')
+        self._connection.executescript(_SCHEMA)
+
+    def open_batch(self, source, options, idempotency_key=None):
+        """
+        Register a batch, or find the one already registered under an idempotency key.
+
+        Args:
+            source (str): Where the batch's circuit records are read from (see
+                execute.execute.iter_circuit_records); must be readable again on resume.
+            options (dict): execute_batch options (see BATCH_OPTIONS; others are ignored).
+            idempotency_key (str, optional): Client-chosen key; opening again with the same
+                key returns the same batch, so a retried submission continues it instead of
+                starting over.
+
+        Returns:
+            str: The batch ID.
+
+        Raises:
+            ValueError: If the source is stdin, or the key was used for a different batch.
+        """
+        if source == '-':
+            raise ValueError("A batch read from stdin cannot be checkpointed; write the records to a file first.")
+        source = os.path.abspath(source)
+        options = {name: options[name] for name in BATCH_OPTIONS if name in options}
+        digest = request_hash({'source': source, 'options': options})
+        now = time.time()
+        with self._lock, self._connection:
+            if idempotency_key is not None:
+                row = self._connection.execute('SELECT id, request_hash FROM batches WHERE idempotency_key = ?',
+                                               (idempotency_key,)).fetchone()
+                if row is not None:
+                    if row['request_hash'] != digest:
+                        raise ValueError(f"Idempotency key {idempotency_key!r} was already used for a different batch.")
+                    return row['id']
+            batch_id = uuid.uuid4().hex
+            self._connection.execute(
+                'INSERT INTO batches (id, idempotency_key, request_hash, source, options, status, created_at, '
+                "updated_at) VALUES (?, ?, ?, ?, ?, 'pending', ?, ?)",
+                (batch_id, idempotency_key, digest, source, json.dumps(options), now, now),
+            )
+        return batch_id
+
+    def get_batch(self, batch_id):
+        """
+        Describe a batch.
+
+        Args:
+            batch_id (str): The batch ID.
+
+        Returns:
+            dict: The batch's source, options, status, owner, timestamps and the number of
+                finished and failed circuits, or None if there is no such batch.
+        """
+        with self._lock:
+            row = self._connection.execute('SELECT * FROM batches WHERE id = ?', (batch_id,)).fetchone()
+            if row is None:
+                return None
+            finished, failed = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(status != 'ok'), 0) FROM batch_items WHERE batch_id = ?",
+                (batch_id,)).fetchone()
+        batch = dict(row)
+        batch['options'] = json.loads(batch['options'])
+        batch.pop('request_hash')
+        batch.update(finished=finished, failed=failed)
+        return batch
+
+    def list_batches(self):
+        """
+        List every batch, newest first.
+
+        Returns:
+            list: Batch summaries (see get_batch, without the item counts).
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT id, idempotency_key, source, status, owner, created_at, updated_at FROM batches '
+                'ORDER BY created_at DESC').fetchall()
+        return [dict(row) for row in rows]
+
+    def claim(self, batch_id):
+        """
+        Take ownership of a batch before running it.
+
+        Returns:
+            str: The owner token that heartbeat, record and release take.
+
+        Raises:
+            ValueError: If the batch does not exist or another owner is running it.
+        """
+        # Unique per claim, so two runs in one process cannot share a batch either
+        owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        now = time.time()
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                "UPDATE batches SET status = 'running', owner = ?, updated_at = ? WHERE id = ? AND "
+                "(status != 'running' OR updated_at < ?)",
+                (owner, now, batch_id, now - self.lease_seconds),
+            )
+            if cursor.rowcount == 0:
+                row = self._connection.execute('SELECT owner FROM batches WHERE id = ?', (batch_id,)).fetchone()
+                if row is None:
+                    raise ValueError(f"No batch {batch_id!r}.")
+                raise ValueError(f"Batch {batch_id!r} is being run by {row['owner']}.")
+        return owner
+
+    def heartbeat(self, batch_id, owner):
+        """
+        Renew the lease of a batch while its circuits run.
+
+        Returns:
+            bool: False if the owner lost the batch (its lease expired and another owner claimed it).
+        """
+        with self._lock, self._connection:
+            cursor = self._connection.execute('UPDATE batches SET updated_at = ? WHERE id = ? AND owner = ?',
+                                              (time.time(), batch_id, owner))
+        return cursor.rowcount > 0
+
+    def release(self, batch_id, status, owner):
+        """
+        Give up ownership of a batch.
+
+        Args:
+            batch_id (str): The batch ID.
+            status (str): "finished", or "interrupted" if circuits may remain.
+            owner (str): The token returned by claim.
+        """
+        with self._lock, self._connection:
+            self._connection.execute('UPDATE batches SET status = ?, owner = NULL, updated_at = ? '
+                                     'WHERE id = ? AND owner = ?', (status, time.time(), batch_id, owner))
+
+    def record(self, batch_id, item, outcome, owner, record_hash):
+        """
+        Commit the outcome of one circuit, renewing the owner's lease.
+
+        Args:
+            batch_id (str): The batch ID.
+            item (int): The circuit's position in the batch source.
+            outcome (dict): Its outcome (see execute.execute.execute_record).
+            owner (str): The token returned by claim.
+            record_hash (str): request_hash of the circuit record, checked on resume.
+
+        Raises:
+            ValueError: If the owner lost the batch; nothing is recorded.
+        """
+        now = time.time()
+        with self._lock, self._connection:
+            cursor = self._connection.execute('UPDATE batches SET updated_at = ? WHERE id = ? AND owner = ?',
+                                              (now, batch_id, owner))
+            if cursor.rowcount == 0:
+                raise ValueError(f"Batch {batch_id!r} was taken over by another owner.")
+            self._connection.execute(
+                'INSERT OR REPLACE INTO batch_items (batch_id, item, name, record_hash, status, outcome, '
+                'finished_at) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (batch_id, item, outcome.get('name'), record_hash, outcome.get('status'), json.dumps(outcome), now),
+            )
+
+    def completed(self, batch_id, include_failed=False):
+        """
+        Return the circuits of a batch that need not run again.
+
+        Args:
+            batch_id (str): The batch ID.
+            include_failed (bool): Count failed circuits as completed instead of retrying them.
+
+        Returns:
+            dict: Item -> request_hash of its circuit record.
+        """
+        query = 'SELECT item, record_hash FROM batch_items WHERE batch_id = ?'
+        if not include_failed:
+            query += " AND status = 'ok'"
+        with self._lock:
+            return {row['item']: row['record_hash'] for row in self._connection.execute(query, (batch_id,))}
+
+    def outcomes(self, batch_id):
+        """
+        Return the stored outcomes of a batch in source order.
+
+        Returns:
+            list: Outcome dicts, each with its item under "index".
+        """
+        with self._lock:
+            rows = self._connection.execute('SELECT item, outcome FROM batch_items WHERE batch_id = ? ORDER BY item',
+                                            (batch_id,)).fetchall()
+        return [dict(json.loads(row['outcome']), index=row['item']) for row in rows]
+
+    def begin_request(self, key, digest):
+        """
+        Claim an idempotency key before executing a request.
+
+        Args:
+            key (str): The client's idempotency key.
+            digest (str): request_hash of the request.
+
+        Returns:
+            dict: None if the caller now owns the key and should execute the request;
+                otherwise {"status": "running"} while another attempt is executing, or
+                {"status": "done", "status_code": ..., "response": ...} to replay.
+
+        Raises:
+            ValueError: If the key was used for a different request.
+        """
+        now = time.time()
+        with self._lock, self._connection:
+            if now - self._purged >= _PURGE_INTERVAL:
+                # Expired responses, and claims abandoned long ago, would otherwise be kept forever
+                self._connection.execute(
+                    "DELETE FROM idempotent_requests WHERE updated_at < ? AND (status = 'done' OR updated_at < ?)",
+                    (now - self.response_ttl, now - self.lease_seconds))
+                self._purged = now
+            row = self._connection.execute('SELECT * FROM idempotent_requests WHERE key = ?', (key,)).fetchone()
+            if row is not None:
+                if row['request_hash'] != digest:
+                    raise ValueError(f"Idempotency key {key!r} was already used for a different request.")
+                if row['status'] == 'done' and row['updated_at'] >= now - self.response_ttl:
+                    return {'status': 'done', 'status_code': row['status_code'],
+                            'response': json.loads(row['response'])}
+                if row['status'] == 'running' and row['updated_at'] >= now - self.lease_seconds:
+                    return {'status': 'running'}
+            self._connection.execute(
+                "INSERT OR REPLACE INTO idempotent_requests (key, request_hash, status, updated_at) "
+                "VALUES (?, ?, 'running', ?)", (key, digest, now))
+        return None
+
+    def finish_request(self, key, status_code, response):
+        """
+        Store the response of a request so retries with its key replay it.
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE idempotent_requests SET status = 'done', status_code = ?, response = ?, updated_at = ? "
+                'WHERE key = ?', (status_code, json.dumps(response), time.time(), key))
+
+    def release_request(self, key):
+        """
+        Forget a request that failed, so a retry with its key executes it again.
+        """
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM idempotent_requests WHERE key = ? AND status = 'running'", (key,))
+
+    def close(self):
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def resume_batch(store, batch_id, token=None, include_completed=False, retry_failed=True, mimic_token=None):
+    """
+    Run the circuits of a checkpointed batch that have not completed, committing each as it finishes.
+
+    A new batch (see CheckpointStore.open_batch) is started the same way. If the
+    run dies, calling this again continues with the remaining circuits.
+
+    Args:
+        store (CheckpointStore): Where the batch is checkpointed.
+        batch_id (str): The batch ID.
+        token (str, optional): IBMQ token (never stored with the batch).
+        include_completed (bool): First yield the outcomes stored by earlier runs.
+        retry_failed (bool): Run circuits that failed in earlier runs again.
+        mimic_token (str, optional): IBMQ token for a live mimic_backend (never stored either).
+
+    Yields:
+        dict: Outcomes (see execute.execute.execute_batch), "index" being the circuit's
+            position in the batch source.
+
+    Raises:
+        ValueError: If the batch does not exist, is being run elsewhere, was taken over
+            while running, or its source changed since the circuits it lists completed.
+    """
+    from .execute import execute_batch, iter_circuit_records
+
+    batch = store.get_batch(batch_id)
+    if batch is None:
+        raise ValueError(f"No batch {batch_id!r}.")
+    owner = store.claim(batch_id)
+    # Circuits can run longer than the lease (e.g. queued on a device), so it is renewed
+    # in the background rather than only when an outcome is recorded
+    stop = threading.Event()
+
+    def heartbeat():
+        while not stop.wait(store.lease_seconds / 3) and store.heartbeat(batch_id, owner):
+            pass
+
+    thread = threading.Thread(target=heartbeat, name=f"checkpoint-heartbeat-{batch_id[:8]}", daemon=True)
+    thread.start()
+    status = 'interrupted'
+    try:
+        done = store.completed(batch_id, include_failed=not retry_failed)
+        if include_completed:
+            for outcome in store.outcomes(batch_id):
+                if outcome['index'] in done:
+                    yield outcome
+        # (position in the source, record hash) of each record handed to execute_batch, by its index there
+        items = []
+
+        def pending():
+            for item, record in enumerate(iter_circuit_records(batch['source'])):
+                digest = request_hash(record)
+                if item in done:
+                    if done[item] != digest:
+                        raise ValueError(f"Batch source {batch['source']!r} changed: circuit {item} "
+                                         f"({record.get('name')!r}) differs from the one that completed.")
+                    continue
+                items.append((item, digest))
+                yield record
+
+        for outcome in execute_batch(pending(), token=token, mimic_token=mimic_token, **batch['options']):
+            item, digest = items[outcome['index']]
+            outcome['index'] = item
+            store.record(batch_id, item, outcome, owner, digest)
+            yield outcome
+        status = 'finished'
+    finally:
+        stop.set()
+        thread.join()
+        store.release(batch_id, status, owner)
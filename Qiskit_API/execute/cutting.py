@@ -0,0 +1,421 @@
+import itertools
+from bisect import bisect_right
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+from ..metrics import timed
+from .exact import _PHASE_PREFIXES, _check_memory, _evaluate, _observable_items, _statevector, _term_matrix
+
+DEFAULT_MAX_CUTS = 6
+
+# Sampling overhead of one wire cut when fragments are estimated from shots (the squared 1-norm, 4**2,
+# of the decomposition below); exact fragment simulation pays 4**cuts terms instead
+WIRE_CUT_OVERHEAD = 16
+
+# The identity channel is 1/2 sum_P (measure P)(prepare P) over P in I, X, Y, Z; preparing P means
+# preparing its eigenstates with their eigenvalues as signs (I: both Z eigenstates, each with +1)
+_CUT_BASES = 'IXYZ'
+_EIGENSTATES = {
+    'I': (('0', 1), ('1', 1)),
+    'Z': (('0', 1), ('1', -1)),
+    'X': (('+', 1), ('-', -1)),
+    'Y': (('+i', 1), ('-i', -1)),
+}
+_PREPARATIONS = {'0': (), '1': ('x',), '+': ('h',), '-': ('x', 'h'), '+i': ('h', 's'), '-i': ('x', 'h', 's')}
+
+_H = np.array([[1, 1], [1, -1]]) / np.sqrt(2)
+# Rotations after which measuring Z measures the basis
+_BASIS_CHANGES = {'X': _H, 'Y': _H @ np.diag([1, -1j])}
+
+# Fragment of a cut circuit. starts: (local qubit, cut) prepared at a cut; ends: (local qubit, cut)
+# measured at a cut; outputs: (local qubit, original qubit) that end the original circuit
+Fragment = namedtuple('Fragment', ['circuit', 'starts', 'ends', 'outputs'])
+
+
+def _operations(circuit):
+    # The circuit's operations as (operation, qubit indices), without barriers and final measurements
+    circuit = circuit.remove_final_measurements(inplace=False)
+    indices = {bit: index for index, bit in enumerate(circuit.qubits)}
+    operations = []
+    for instruction in circuit.data:
+        operation = instruction.operation
+        if operation.name == 'barrier':
+            continue
+        if instruction.clbits or operation.name in ('measure', 'reset') or getattr(operation, 'condition', None):
+            raise ValueError("Circuit cutting needs a circuit without mid-circuit measurements, resets or conditions.")
+        operations.append((operation, [indices[bit] for bit in instruction.qubits]))
+    return circuit.num_qubits, operations
+
+
+def _operation_counts(num_qubits, operations):
+    counts = [0] * num_qubits
+    for _, qubits in operations:
+        for qubit in qubits:
+            counts[qubit] += 1
+    return counts
+
+
+def _fragments(num_qubits, operations, cuts):
+    from qiskit import QuantumCircuit
+
+    positions = [[] for _ in range(num_qubits)]
+    for qubit, position in cuts:
+        positions[qubit].append(position)
+    for qubit_positions in positions:
+        qubit_positions.sort()
+    cut_index = {cut: index for index, cut in enumerate(cuts)}
+
+    # Segment (qubit, number of cuts before it) of every operand, joined into fragments by union-find
+    parent = {(qubit, segment): (qubit, segment) for qubit in range(num_qubits)
+              for segment in range(len(positions[qubit]) + 1)}
+
+    def find(key):
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    seen = [0] * num_qubits
+    placed = []
+    for operation, qubits in operations:
+        segments = []
+        for qubit in qubits:
+            segments.append((qubit, bisect_right(positions[qubit], seen[qubit])))
+            seen[qubit] += 1
+        for segment in segments[1:]:
+            parent[find(segment)] = find(segments[0])
+        placed.append((operation, segments))
+
+    members = {}
+    for key in sorted(parent):
+        members.setdefault(find(key), []).append(key)
+    groups = sorted(members.values())
+    group_of = {key: index for index, keys in enumerate(groups) for key in keys}
+    circuits = [QuantumCircuit(len(keys)) for keys in groups]
+    local = {key: keys.index(key) for keys in groups for key in keys}
+    for operation, segments in placed:
+        circuits[group_of[segments[0]]].append(operation, [local[segment] for segment in segments])
+
+    fragments = []
+    for keys, fragment_circuit in zip(groups, circuits):
+        starts, ends, outputs = [], [], []
+        for qubit, segment in keys:
+            if segment > 0:
+                starts.append((local[qubit, segment], cut_index[qubit, positions[qubit][segment - 1]]))
+            if segment < len(positions[qubit]):
+                ends.append((local[qubit, segment], cut_index[qubit, positions[qubit][segment]]))
+            else:
+                outputs.append((local[qubit, segment], qubit))
+        fragments.append(Fragment(fragment_circuit, starts, ends, outputs))
+    return fragments
+
+
+def find_wire_cuts(circuit, max_fragment_qubits, max_cuts=DEFAULT_MAX_CUTS):
+    """
+    Find wire cuts that split a circuit into fragments of at most max_fragment_qubits qubits.
+
+    Qubits are split into contiguous blocks, chosen by dynamic programming to
+    need the fewest cuts. A gate spanning blocks stays in the block of its
+    highest qubit, and the wires of its other qubits are cut just before and
+    after it, moving that piece of each wire into the block. This suits circuits
+    made of weakly coupled registers; densely connected circuits need too many cuts.
+
+    Args:
+        circuit (QuantumCircuit): The circuit to cut.
+        max_fragment_qubits (int): Largest fragment width allowed.
+        max_cuts (int): Largest number of cuts allowed (the cost grows as 4**cuts).
+
+    Returns:
+        list: Sorted (qubit, position) cuts, each cutting a qubit's wire after its first
+            `position` operations; empty if the circuit already fits.
+
+    Raises:
+        ValueError: If no cuts within max_cuts give fragments that narrow.
+    """
+    num_qubits, operations = _operations(circuit)
+    if num_qubits <= max_fragment_qubits:
+        return []
+    counts = _operation_counts(num_qubits, operations)
+    seen = [0] * num_qubits
+    gates = []
+    for _, qubits in operations:
+        if len(qubits) > 1:
+            gates.append([(qubit, seen[qubit]) for qubit in qubits])
+        for qubit in qubits:
+            seen[qubit] += 1
+
+    def moves(gate, host):
+        # Cuts isolating the gate on every qubit outside the host block
+        for qubit, index in gate:
+            if not host[0] <= qubit < host[1]:
+                if index > 0:
+                    yield qubit, index
+                if index + 1 < counts[qubit]:
+                    yield qubit, index + 1
+
+    for width in range(max_fragment_qubits, 0, -1):
+        # best[i]: (estimated cuts, start of the last block) for splitting qubits [0, i)
+        best = [(0, 0)] + [None] * num_qubits
+        for end in range(1, num_qubits + 1):
+            for start in range(max(0, end - width), end):
+                cost = best[start][0] + sum(len(list(moves(gate, (start, end)))) for gate in gates
+                                            if start <= max(gate)[0] < end and min(gate)[0] < start)
+                if best[end] is None or cost < best[end][0]:
+                    best[end] = (cost, start)
+        blocks = []
+        end = num_qubits
+        while end:
+            blocks.append((best[end][1], end))
+            end = best[end][1]
+        cuts = set()
+        for gate in gates:
+            host = next(block for block in blocks if block[0] <= max(gate)[0] < block[1])
+            cuts.update(moves(gate, host))
+        cuts = sorted(cuts)
+        if len(cuts) > max_cuts:
+            break
+        if max(fragment.circuit.num_qubits for fragment in _fragments(num_qubits, operations, cuts)) \
+                <= max_fragment_qubits:
+            return cuts
+    raise ValueError(f"Could not split the circuit into fragments of at most {max_fragment_qubits} qubits "
+                     f"with {max_cuts} or fewer wire cuts.")
+
+
+def _apply_one_qubit(state, num_qubits, qubit, matrix):
+    tensor = state.reshape((2,) * num_qubits)
+    axis = num_qubits - 1 - qubit
+    return np.moveaxis(np.tensordot(matrix, tensor, axes=([1], [axis])), 0, axis).reshape(-1)
+
+
+def _run_fragment(circuit, starts, preparations, ends, outputs, output_terms):
+    """
+    Simulate one variant of a fragment: its cut starts prepared in the given eigenstates.
+
+    Returns:
+        dict: Cut-end bases (one of IXYZ per end) -> for output_terms None, the output
+            qubits' distribution weighted by the end measurements (a tensor with one axis
+            per output, in outputs order); otherwise the expectation value of every term.
+    """
+    from qiskit import QuantumCircuit
+
+    num_qubits = circuit.num_qubits
+    prepared = QuantumCircuit(num_qubits)
+    for qubit, label in zip(starts, preparations):
+        for gate in _PREPARATIONS[label]:
+            getattr(prepared, gate)(qubit)
+    prepared.compose(circuit, inplace=True)
+    state = _statevector(prepared)
+    all_bases = list(itertools.product(_CUT_BASES, repeat=len(ends)))
+
+    if output_terms is not None:
+        labels = []
+        for bases in all_bases:
+            for term in output_terms:
+                letters = ['I'] * num_qubits
+                for qubit, letter in itertools.chain(zip(outputs, term), zip(ends, bases)):
+                    letters[num_qubits - 1 - qubit] = letter
+                labels.append(''.join(letters))
+        masks, matrix = _term_matrix(labels, num_qubits)
+        values = _evaluate(state[None], masks, matrix)[0].reshape(len(all_bases), len(output_terms))
+        return dict(zip(all_bases, values))
+
+    # After contracting the end axes the remaining axes are the outputs by descending local qubit
+    order = sorted(outputs, reverse=True)
+    permutation = [order.index(qubit) for qubit in outputs]
+    results = {}
+    for bases in all_bases:
+        rotated = state
+        for qubit, basis in zip(ends, bases):
+            if basis in _BASIS_CHANGES:
+                rotated = _apply_one_qubit(rotated, num_qubits, qubit, _BASIS_CHANGES[basis])
+        tensor = (np.abs(rotated) ** 2).reshape((2,) * num_qubits)
+        # Contracting from the last axis down keeps the lower axis numbers valid
+        for axis, basis in sorted(((num_qubits - 1 - qubit, basis) for qubit, basis in zip(ends, bases)),
+                                  reverse=True):
+            tensor = np.tensordot(tensor, np.array([1, 1] if basis == 'I' else [1, -1]), axes=([axis], [0]))
+        results[bases] = tensor.transpose(permutation)
+    return results
+
+
+class CutCircuit:
+    """
+    A circuit split by wire cuts into narrower fragments that are simulated separately.
+
+    Every cut replaces a wire by measuring it in the I, X, Y or Z basis and
+    preparing the matching eigenstates downstream. Each fragment is simulated
+    exactly once per combination of eigenstates at its cut starts (6**starts
+    statevectors of the fragment's width), in parallel, and the results are
+    recombined over the 4**cuts basis assignments. Reconstruction is exact;
+    estimating the fragments from shots instead would cost sampling_overhead
+    times more shots for the same precision.
+
+    Attributes:
+        num_qubits (int): Width of the original circuit.
+        cuts (list): (qubit, position) wire cuts (see find_wire_cuts).
+        fragments (list): Fragment tuples.
+    """
+
+    def __init__(self, circuit, cuts):
+        self.num_qubits, operations = _operations(circuit)
+        counts = _operation_counts(self.num_qubits, operations)
+        self.cuts = sorted(set(map(tuple, cuts)))
+        for qubit, position in self.cuts:
+            if not 0 <= qubit < self.num_qubits or not 0 < position < counts[qubit]:
+                raise ValueError(f"Cut ({qubit}, {position}) does not fall between two operations on a qubit.")
+        self.fragments = _fragments(self.num_qubits, operations, self.cuts)
+        _check_memory(max(fragment.circuit.num_qubits for fragment in self.fragments))
+
+    @property
+    def sampling_overhead(self):
+        """
+        Factor by which shots would grow to estimate the fragments at the same precision.
+        """
+        return WIRE_CUT_OVERHEAD ** len(self.cuts)
+
+    def report(self):
+        """
+        Describe the cut.
+
+        Returns:
+            dict: The cuts, fragment widths, number of fragment simulations and sampling overhead.
+        """
+        return {
+            'cuts': [list(cut) for cut in self.cuts],
+            'fragment_qubits': [fragment.circuit.num_qubits for fragment in self.fragments],
+            'fragment_runs': sum(len(_PREPARATIONS) ** len(fragment.starts) for fragment in self.fragments),
+            'sampling_overhead': self.sampling_overhead,
+        }
+
+    def _run(self, output_terms, max_workers, use_processes):
+        executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        results = [{} for _ in self.fragments]
+        with timed('cut_fragments'), executor_class(max_workers=max_workers) as executor:
+            futures = {}
+            for index, fragment in enumerate(self.fragments):
+                terms = None if output_terms is None else output_terms[index]
+                for preparations in itertools.product(_PREPARATIONS, repeat=len(fragment.starts)):
+                    future = executor.submit(_run_fragment, fragment.circuit, [qubit for qubit, _ in fragment.starts],
+                                             preparations, [qubit for qubit, _ in fragment.ends],
+                                             [qubit for qubit, _ in fragment.outputs], terms)
+                    futures[future] = (index, preparations)
+            for future, (index, preparations) in futures.items():
+                results[index][preparations] = future.result()
+        return results
+
+    def _contract(self, results, product):
+        memo = [{} for _ in self.fragments]
+
+        def fragment_value(index, bases):
+            fragment = self.fragments[index]
+            start_bases = tuple(bases[cut] for _, cut in fragment.starts)
+            end_bases = tuple(bases[cut] for _, cut in fragment.ends)
+            key = (start_bases, end_bases)
+            if key not in memo[index]:
+                value = 0
+                for eigenstates in itertools.product(*(_EIGENSTATES[basis] for basis in start_bases)):
+                    sign = np.prod([sign for _, sign in eigenstates])
+                    value = value + sign * results[index][tuple(label for label, _ in eigenstates)][end_bases]
+                memo[index][key] = value
+            return memo[index][key]
+
+        total = 0
+        with timed('cut_reconstruct'):
+            for bases in itertools.product(_CUT_BASES, repeat=len(self.cuts)):
+                term = np.array(1.0)
+                for index in range(len(self.fragments)):
+                    term = product(term, fragment_value(index, bases))
+                total = total + term
+        return total / 2 ** len(self.cuts)
+
+    def expectation_values(self, observables, max_workers=None, use_processes=True):
+        """
+        Compute exact expectation values of Pauli observables of the original circuit.
+
+        Args:
+            observables (sequence): Observables over the circuit's qubits (see
+                execute.exact.exact_expectation_values).
+            max_workers (int, optional): Parallel fragment simulations (default is the CPU count).
+            use_processes (bool): Simulate in worker processes instead of threads.
+
+        Returns:
+            numpy.ndarray: One value per observable.
+        """
+        # Distinct Pauli strings over all observables, and each observable's coefficients on them
+        bodies = {}
+        columns = []
+        for observable in observables:
+            column = {}
+            for label, coefficient in _observable_items(observable):
+                body = label.lstrip('+-ij')
+                phase = _PHASE_PREFIXES.get(label[:len(label) - len(body)])
+                if phase is None or len(body) != self.num_qubits or set(body) - set('IXYZ'):
+                    raise ValueError(f"Pauli label {label!r} must have one of I, X, Y, Z per qubit "
+                                     f"({self.num_qubits}).")
+                index = bodies.setdefault(body, len(bodies))
+                column[index] = column.get(index, 0) + coefficient * phase
+            columns.append(column)
+        matrix = np.zeros((len(bodies), len(columns)), dtype=complex)
+        for column_index, column in enumerate(columns):
+            for index, coefficient in column.items():
+                matrix[index, column_index] = coefficient
+        output_terms = [[tuple(body[self.num_qubits - 1 - qubit] for _, qubit in fragment.outputs) for body in bodies]
+                        for fragment in self.fragments]
+        values = self._contract(self._run(output_terms, max_workers, use_processes), np.multiply) @ matrix
+        return np.real_if_close(values)
+
+    def distribution(self, max_workers=None, use_processes=True):
+        """
+        Reconstruct the exact output distribution of the original circuit.
+
+        Only for circuits whose full distribution fits in memory; use
+        expectation_values for wider ones.
+
+        Args:
+            max_workers (int, optional): Parallel fragment simulations (default is the CPU count).
+            use_processes (bool): Simulate in worker processes instead of threads.
+
+        Returns:
+            numpy.ndarray: Probabilities over the 2**n basis states (qubit 0 is the least
+                significant index bit); entries may be slightly negative from rounding.
+        """
+        _check_memory(self.num_qubits)
+        total = self._contract(self._run(None, max_workers, use_processes), np.multiply.outer)
+        # Axes come in fragment output order; index bits want qubit n - 1 first
+        axes = [qubit for fragment in self.fragments for _, qubit in fragment.outputs]
+        return np.real(total).transpose([axes.index(qubit) for qubit in reversed(range(self.num_qubits))]).reshape(-1)
+
+
+def run_cut_circuit(circuit, max_fragment_qubits=None, cuts=None, observables=None, max_cuts=DEFAULT_MAX_CUTS,
+                    max_workers=None, use_processes=True):
+    """
+    Simulate a circuit too wide for one statevector by cutting it into fragments.
+
+    Args:
+        circuit (QuantumCircuit): The circuit (final measurements are ignored).
+        max_fragment_qubits (int, optional): Widest fragment allowed when cuts are found automatically.
+        cuts (list, optional): (qubit, position) wire cuts to use instead (see find_wire_cuts).
+        observables (sequence, optional): Pauli observables to evaluate; the output
+            distribution is reconstructed when omitted.
+        max_cuts (int): Largest number of cuts searched for.
+        max_workers (int, optional): Parallel fragment simulations (default is the CPU count).
+        use_processes (bool): Simulate in worker processes instead of threads.
+
+    Returns:
+        tuple: The expectation values or distribution, and the cut's report (see CutCircuit.report).
+
+    Raises:
+        ValueError: If neither cuts nor max_fragment_qubits are given, or no suitable cuts exist.
+    """
+    if cuts is None:
+        if max_fragment_qubits is None:
+            raise ValueError("Give either the cuts or max_fragment_qubits to find them.")
+        with timed('find_cuts'):
+            cuts = find_wire_cuts(circuit, max_fragment_qubits, max_cuts)
+    cut = CutCircuit(circuit, cuts)
+    if observables is None:
+        values = cut.distribution(max_workers, use_processes)
+    else:
+        values = cut.expectation_values(observables, max_workers, use_processes)
+    return values, cut.report()
@@ -0,0 +1,195 @@
+import numpy as np
+
+from ..metrics import timed
+from .simulation import MEMORY_FRACTION, _physical_memory
+
+# Statevectors are held in batches of at most this many bytes while observables are evaluated
+DEFAULT_BATCH_BYTES = 256 * 1024 * 1024
+
+_PHASE_PREFIXES = {'': 1, '+': 1, '-': -1, 'i': 1j, '+i': 1j, '-i': -1j, 'j': 1j, '+j': 1j, '-j': -1j}
+
+
+def _pauli_term(label, coefficient, num_qubits):
+    # (x mask, z mask, coefficient including the i**(number of Y) phase) of one Pauli string
+    body = label.lstrip('+-ij')
+    prefix = label[:len(label) - len(body)]
+    if prefix not in _PHASE_PREFIXES:
+        raise ValueError(f"Invalid Pauli label {label!r}.")
+    if len(body) != num_qubits or set(body) - set('IXYZ'):
+        raise ValueError(f"Pauli label {label!r} must have one of I, X, Y, Z per qubit ({num_qubits}).")
+    x_mask = z_mask = 0
+    for qubit, letter in enumerate(reversed(body)):
+        if letter in 'XY':
+            x_mask |= 1 << qubit
+        if letter in 'YZ':
+            z_mask |= 1 << qubit
+    return x_mask, z_mask, coefficient * _PHASE_PREFIXES[prefix] * 1j ** body.count('Y')
+
+
+def _observable_items(observable):
+    # (Pauli label, coefficient) pairs of an observable
+    if isinstance(observable, str):
+        items = [(observable, 1)]
+    elif isinstance(observable, dict):
+        items = observable.items()
+    elif hasattr(observable, 'paulis') and hasattr(observable, 'coeffs'):
+        # SparsePauliOp
+        items = zip(observable.paulis.to_labels(), observable.coeffs)
+    elif hasattr(observable, 'to_label'):
+        # Pauli
+        items = [(observable.to_label(), 1)]
+    else:
+        raise TypeError(f"Unsupported observable {observable!r}; expected a Pauli label, a dict of "
+                        f"label -> coefficient, a Pauli or a SparsePauliOp.")
+    return [(label, complex(coefficient)) for label, coefficient in items]
+
+
+def _term_matrix(observables, num_qubits):
+    # Distinct (x, z) masks are evaluated once and shared by every observable containing them
+    masks = {}
+    weights = []
+    for observable in observables:
+        terms = {}
+        for label, coefficient in _observable_items(observable):
+            x_mask, z_mask, coefficient = _pauli_term(label, coefficient, num_qubits)
+            index = masks.setdefault((x_mask, z_mask), len(masks))
+            terms[index] = terms.get(index, 0) + coefficient
+        weights.append(terms)
+    matrix = np.zeros((len(masks), len(weights)), dtype=complex)
+    for column, terms in enumerate(weights):
+        for index, coefficient in terms.items():
+            matrix[index, column] = coefficient
+    return masks, matrix
+
+
+def _evaluate(states, masks, matrix):
+    # <psi|P|psi> = sum_i conj(psi[i ^ x]) (-1)**parity(i & z) psi[i], times the term's phase
+    indices = np.arange(states.shape[1], dtype=np.int64)
+    terms = np.empty((len(states), len(masks)), dtype=complex)
+    for (x_mask, z_mask), index in masks.items():
+        signed = states if not z_mask else states * (1 - 2 * _parity(indices & z_mask))
+        flipped = states if not x_mask else states[:, indices ^ x_mask]
+        terms[:, index] = np.einsum('bi,bi->b', flipped.conj(), signed)
+    return terms @ matrix
+
+
+def _parity(values):
+    if hasattr(np, 'bitwise_count'):
+        return (np.bitwise_count(values) & 1).astype(np.int64)
+    values = values.copy()
+    for shift in (32, 16, 8, 4, 2, 1):
+        values ^= values >> shift
+    return values & 1
+
+
+def _bindings(circuit, parameter_values):
+    # Yields one bound circuit per parameter binding (the circuit itself when there are none)
+    if parameter_values is None:
+        if circuit.parameters:
+            raise ValueError(f"Circuit has unbound parameters {sorted(p.name for p in circuit.parameters)}; "
+                             f"give parameter_values.")
+        yield circuit
+        return
+    parameters = list(circuit.parameters)
+    by_name = {parameter.name: parameter for parameter in parameters}
+    for values in parameter_values:
+        if isinstance(values, dict):
+            values = {by_name.get(key, key): value for key, value in values.items()}
+        elif len(values) != len(parameters):
+            raise ValueError(f"Expected {len(parameters)} parameter values per binding, got {len(values)}.")
+        yield circuit.assign_parameters(values)
+
+
+def _check_memory(num_qubits):
+    needed = 16 << num_qubits
+    physical = _physical_memory()
+    if physical and needed > physical * MEMORY_FRACTION:
+        raise ValueError(f"A {num_qubits}-qubit statevector needs {needed} bytes, more than this machine can hold; "
+                         f"sample it with run_quantum_circuit instead.")
+
+
+def _statevector(circuit):
+    from qiskit.quantum_info import Statevector
+
+    return np.asarray(Statevector(circuit).data)
+
+
+def _prepare(circuit):
+    # Final measurements only collapse the state; anything measured mid-circuit cannot be evaluated exactly
+    circuit = circuit.remove_final_measurements(inplace=False)
+    if any(instruction.operation.name in ('measure', 'reset') for instruction in circuit.data):
+        raise ValueError("Exact evaluation needs a circuit without mid-circuit measurements or resets.")
+    _check_memory(circuit.num_qubits)
+    return circuit
+
+
+def exact_statevectors(circuit, parameter_values=None):
+    """
+    Compute the exact output statevector of a circuit, once per parameter binding.
+
+    Final measurements are ignored, so circuits written for run_quantum_circuit
+    can be passed unchanged.
+
+    Args:
+        circuit (QuantumCircuit): The circuit (without mid-circuit measurements).
+        parameter_values (sequence, optional): Parameter bindings, each either a sequence
+            of values in the order of circuit.parameters or a dict keyed by Parameter or name.
+
+    Returns:
+        numpy.ndarray: The amplitudes (qubit 0 is the least significant index bit), shaped
+            (2**n,) without bindings, or (bindings, 2**n).
+
+    Raises:
+        ValueError: If the circuit has unbound parameters, mid-circuit measurements, or
+            a statevector that does not fit in memory.
+    """
+    circuit = _prepare(circuit)
+    with timed('exact'):
+        states = [_statevector(bound) for bound in _bindings(circuit, parameter_values)]
+    if parameter_values is None:
+        return states[0]
+    return np.array(states).reshape(len(states), 1 << circuit.num_qubits)
+
+
+def exact_expectation_values(circuit, observables, parameter_values=None, batch_bytes=DEFAULT_BATCH_BYTES):
+    """
+    Compute exact expectation values of many observables over many parameter bindings.
+
+    Each binding is simulated once. Statevectors are then gathered into batches
+    and every Pauli term is evaluated against a whole batch with one vectorized
+    gather, so the cost is one simulation per binding plus one pass over the
+    amplitudes per distinct Pauli term, with no sampling and no shot noise.
+
+    Args:
+        circuit (QuantumCircuit): The circuit (without mid-circuit measurements).
+        observables (sequence): Observables, each a Pauli label such as "ZZI" (qubit 0
+            rightmost), a dict of label -> coefficient, a Pauli or a SparsePauliOp.
+        parameter_values (sequence, optional): Parameter bindings (see exact_statevectors).
+        batch_bytes (int): Memory budget for the statevectors held at once.
+
+    Returns:
+        numpy.ndarray: Expectation values shaped (observables,) without bindings, or
+            (bindings, observables); real unless an observable is not Hermitian.
+
+    Raises:
+        ValueError: If an observable does not match the circuit width, or as for exact_statevectors.
+        TypeError: If an observable has an unsupported type.
+    """
+    circuit = _prepare(circuit)
+    num_qubits = circuit.num_qubits
+    masks, matrix = _term_matrix(observables, num_qubits)
+    batch_size = max(1, batch_bytes // (16 << num_qubits))
+    results = []
+    with timed('exact'):
+        bindings = _bindings(circuit, parameter_values)
+        while True:
+            states = [_statevector(bound) for _, bound in zip(range(batch_size), bindings)]
+            if not states:
+                break
+            states = np.array(states).reshape(len(states), 1 << num_qubits)
+            results.append(_evaluate(states, masks, matrix))
+            if len(states) < batch_size:
+                break
+    values = np.concatenate(results) if results else np.zeros((0, matrix.shape[1]))
+    values = np.real_if_close(values)
+    return values[0] if parameter_values is None else values
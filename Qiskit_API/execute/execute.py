@@ -0,0 +1,218 @@
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+CIRCUIT_FILE_EXTENSIONS = ('.qasm', '.json')
+
+
+def load_circuit(record):
+    """
+    Build a QuantumCircuit from a circuit record.
+
+    Args:
+        record (dict): Either {"path": ...} pointing to a .qasm/.json file, or an inline
+            record carrying the OpenQASM 2 source under "qasm" or a serialized
+            instruction list or QPY payload (see circuits.serialization.circuit_to_dict).
+
+    Returns:
+        QuantumCircuit: The parsed circuit, named after the record when it has a name.
+
+    Raises:
+        ValueError: If the record has an "error" field (see iter_circuit_records) or no circuit.
+    """
+    if 'error' in record:
+        raise ValueError(record['error'])
+
+    from qiskit import QuantumCircuit
+
+    if 'path' in record:
+        path = record['path']
+        if path.endswith('.json'):
+            with open(path) as file:
+                record = dict(json.load(file), name=record.get('name'))
+        else:
+            circuit = QuantumCircuit.from_qasm_file(path)
+            circuit.name = record.get('name') or circuit.name
+            return circuit
+
+    if 'instructions' in record or 'qpy' in record:
+        from ..circuits.serialization import circuit_from_dict
+
+        return circuit_from_dict(record)
+    if 'qasm' not in record:
+        raise ValueError(f"Circuit record {record.get('name')!r} has no 'qasm', 'instructions', 'qpy' or 'path' field")
+    circuit = QuantumCircuit.from_qasm_str(record['qasm'])
+    circuit.name = record.get('name') or circuit.name
+    return circuit
+
+
+def iter_circuit_records(source):
+    """
+    Lazily yield circuit records from a directory, a JSONL file or stdin.
+
+    Args:
+        source (str): A directory of .qasm/.json files, a single circuit file, an
+            indexed circuit archive, a JSONL file with one record per line, or '-'
+            for JSONL on stdin.
+
+    Yields:
+        dict: Circuit records with at least a "name" and either "path", "qasm", "instructions" or "qpy".
+            A JSONL line that is not a JSON object yields an "error" record instead, which
+            load_circuit raises for, so the line fails on its own without ending the batch.
+    """
+    if os.path.isdir(source):
+        for entry in sorted(os.scandir(source), key=lambda entry: entry.name):
+            if entry.is_file() and entry.name.endswith(CIRCUIT_FILE_EXTENSIONS):
+                yield {'name': os.path.splitext(entry.name)[0], 'path': entry.path}
+        return
+
+    if source.endswith(CIRCUIT_FILE_EXTENSIONS):
+        yield {'name': os.path.splitext(os.path.basename(source))[0], 'path': source}
+        return
+
+    if source != '-':
+        from ..circuits.serialization import CircuitArchive, is_circuit_archive
+
+        if is_circuit_archive(source):
+            with CircuitArchive(source) as archive:
+                for index in range(len(archive)):
+                    yield archive.record(index)
+            return
+
+    stream = sys.stdin if source == '-' else open(source)
+    try:
+        for line_number, line in enumerate(stream, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            name = f"circuit_{line_number}"
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield {'name': name, 'error': f"Line {line_number} is not valid JSON: {e}"}
+                continue
+            if not isinstance(record, dict):
+                yield {'name': name, 'error': f"Line {line_number} is not a JSON object"}
+                continue
+            record.setdefault('name', name)
+            yield record
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+# Preset -> OptimizationPipeline, kept per worker process so its transpile cache is reused
+_PIPELINES = {}
+
+
+def _pipeline(preset):
+    if preset is None:
+        return None
+    if preset not in _PIPELINES:
+        from .optimize import OptimizationPipeline
+
+        _PIPELINES[preset] = OptimizationPipeline(preset)
+    return _PIPELINES[preset]
+
+
+def execute_record(record, backend_name='qasm_simulator', shots=1024, token=None, preset=None, mimic_backend=None,
+                   method='auto', mitigation=None, mimic_token=None):
+    """
+    Execute a single circuit record and describe the outcome.
+
+    Failures are reported in the returned dict instead of raised so that one bad
+    circuit does not abort a batch.
+
+    Args:
+        record (dict): The circuit record to execute.
+        backend_name (str): The name of the backend to run the circuit on.
+        shots (int): The number of times to run the circuit.
+        token (str): IBMQ token for accessing IBMQ backends.
+        preset (str, optional): Optimization preset (see execute.optimize); a plain
+            transpile is used when omitted.
+        mimic_backend (str, optional): Device to mimic with a noisy local simulation
+            (see execute.noise.resolve_backend).
+        method (str): Local simulation method, or "auto" to choose per circuit
+            (see execute.simulation).
+        mitigation (list, optional): Error mitigation stages (see execute.mitigation).
+        mimic_token (str, optional): IBMQ token for reading a live device's calibration
+            when mimic_backend names one.
+
+    Returns:
+        dict: The record name, status, counts or error, the simulation method of local
+            runs, the mitigation report, and elapsed seconds.
+    """
+    from ..qiskit_api import run_quantum_circuit
+    from .mitigation import ErrorMitigation
+    from .simulation import SimulationSelector
+
+    start = time.perf_counter()
+    outcome = {'name': record.get('name')}
+    try:
+        circuit = load_circuit(record)
+        pipeline = _pipeline(preset)
+        selector = SimulationSelector(None if method == 'auto' else method)
+        mitigator = ErrorMitigation.from_stages(mitigation) if mitigation else None
+        outcome['counts'] = run_quantum_circuit(circuit, backend_name=backend_name, shots=shots,
+                                                token=token, monitor=False, pipeline=pipeline,
+                                                mimic_backend=mimic_backend, simulation=selector,
+                                                mitigation=mitigator, mimic_token=mimic_token)
+        if pipeline is not None:
+            outcome['optimization'] = pipeline.last_report
+        if selector.last_plan is not None:
+            outcome['simulation'] = selector.last_plan._asdict()
+        if mitigator is not None:
+            outcome['mitigation'] = mitigator.last_report
+        outcome['status'] = 'ok'
+    except Exception as e:
+        outcome['status'] = 'error'
+        outcome['error'] = str(e)
+    outcome['elapsed_s'] = round(time.perf_counter() - start, 6)
+    return outcome
+
+
+def execute_batch(records, concurrency=4, backend_name='qasm_simulator', shots=1024, token=None,
+                  use_processes=True, preset=None, mimic_backend=None, method='auto', mitigation=None,
+                  mimic_token=None):
+    """
+    Execute circuit records in parallel and yield outcomes as they complete.
+
+    At most ``2 * concurrency`` records are in flight at a time, so arbitrarily
+    large JSONL streams are processed in bounded memory.
+
+    Args:
+        records (iterable): Circuit records, e.g. from iter_circuit_records.
+        concurrency (int): Number of parallel workers.
+        backend_name (str): The name of the backend to run the circuits on.
+        shots (int): The number of shots per circuit.
+        token (str): IBMQ token for accessing IBMQ backends.
+        use_processes (bool): Use worker processes (transpilation is GIL-bound)
+            instead of threads.
+        preset (str, optional): Optimization preset for every circuit (see execute_record).
+        mimic_backend (str, optional): Device to mimic for every circuit (see execute_record).
+        method (str): Local simulation method for every circuit (see execute_record).
+        mitigation (list, optional): Error mitigation stages for every circuit (see execute_record).
+        mimic_token (str, optional): IBMQ token for a live mimic_backend (see execute_record).
+
+    Yields:
+        dict: One outcome per record (see execute_record), in completion order,
+            with the record's position in the input under "index".
+    """
+    executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    max_pending = 2 * concurrency
+    with executor_class(max_workers=concurrency) as executor:
+        pending = {}
+        for index, record in enumerate(records):
+            future = executor.submit(execute_record, record, backend_name, shots, token, preset, mimic_backend,
+                                     method, mitigation, mimic_token)
+            pending[future] = index
+            if len(pending) >= max_pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield dict(future.result(), index=pending.pop(future))
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield dict(future.result(), index=pending.pop(future))
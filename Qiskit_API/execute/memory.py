@@ -0,0 +1,191 @@
+import numpy as np
+
+# uint8: clbit i is bit i % 8 of byte i // 8 in each row; uint64: clbit i is bit i of one word per shot
+SHOT_PACKINGS = ('uint8', 'uint64')
+
+DEFAULT_CHUNK_SHOTS = 65536
+
+
+def _row_shape(num_clbits, packing):
+    if packing not in SHOT_PACKINGS:
+        raise ValueError(f"Unknown packing {packing!r}; expected one of {', '.join(SHOT_PACKINGS)}.")
+    if packing == 'uint64':
+        if num_clbits > 64:
+            raise ValueError(f"{num_clbits} clbits do not fit the uint64 packing; use 'uint8'.")
+        return ()
+    return ((num_clbits + 7) // 8,)
+
+
+def pack_shots(hex_shots, num_clbits, packing='uint8'):
+    """
+    Pack per-shot results, as the backend reports them (hex strings such as "0x5"), into an array.
+
+    Args:
+        hex_shots (sequence): One hex string per shot.
+        num_clbits (int): Number of classical bits per shot.
+        packing (str): One of SHOT_PACKINGS.
+
+    Returns:
+        numpy.ndarray: Shaped (shots, ceil(num_clbits / 8)) for "uint8", (shots,) for "uint64".
+
+    Raises:
+        ValueError: If the packing is unknown or too narrow for num_clbits.
+    """
+    row_shape = _row_shape(num_clbits, packing)
+    if packing == 'uint64':
+        return np.fromiter((int(shot, 16) for shot in hex_shots), dtype=np.uint64, count=len(hex_shots))
+    width = row_shape[0]
+    data = b''.join(int(shot, 16).to_bytes(width, 'little') for shot in hex_shots)
+    return np.frombuffer(data, dtype=np.uint8).reshape(len(hex_shots), width)
+
+
+def unpack_shots(packed, num_clbits):
+    """
+    Expand packed shots to one 0/1 column per clbit.
+
+    Args:
+        packed (numpy.ndarray): Shots from pack_shots (either packing).
+        num_clbits (int): Number of classical bits per shot.
+
+    Returns:
+        numpy.ndarray: uint8 array shaped (shots, num_clbits); column i is clbit i.
+    """
+    if packed.dtype == np.uint64:
+        return ((packed[:, None] >> np.arange(num_clbits, dtype=np.uint64)) & np.uint64(1)).astype(np.uint8)
+    return np.unpackbits(packed, axis=1, count=num_clbits, bitorder='little')
+
+
+def write_shots(chunks, path, shots, num_clbits, packing='uint8'):
+    """
+    Write packed shot chunks to a memory-mapped .npy file as they arrive.
+
+    Args:
+        chunks (iterable): Arrays from pack_shots, in order.
+        path (str): The .npy file to create.
+        shots (int): Total number of shots the chunks hold.
+        num_clbits (int): Number of classical bits per shot.
+        packing (str): Packing of the chunks (see SHOT_PACKINGS).
+
+    Returns:
+        numpy.memmap: The written array, open read-only.
+
+    Raises:
+        ValueError: If the chunks hold a different number of shots.
+    """
+    array = np.lib.format.open_memmap(path, mode='w+', dtype=np.dtype(packing),
+                                      shape=(shots,) + _row_shape(num_clbits, packing))
+    written = 0
+    for chunk in chunks:
+        if written + len(chunk) > shots:
+            raise ValueError(f"Received more than the {shots} shots expected.")
+        array[written:written + len(chunk)] = chunk
+        written += len(chunk)
+    array.flush()
+    del array
+    if written != shots:
+        raise ValueError(f"Received {written} of the {shots} shots expected.")
+    return np.load(path, mmap_mode='r')
+
+
+class ShotMemory:
+    """
+    Per-shot results of a finished run, packed into integer arrays on demand.
+
+    Shots are converted chunk by chunk, so no per-shot bitstrings are built and
+    only one chunk of packed shots is alive at a time while iterating or writing.
+
+    Attributes:
+        shots (int): Number of shots.
+        num_clbits (int): Number of classical bits per shot.
+    """
+
+    def __init__(self, result, experiment=0):
+        data = result.results[experiment]
+        self.num_clbits = data.header.memory_slots
+        self._hex_shots = data.data.memory
+        self.shots = len(self._hex_shots)
+
+    def __len__(self):
+        return self.shots
+
+    def chunks(self, chunk_size=DEFAULT_CHUNK_SHOTS, packing='uint8'):
+        """
+        Iterate over the shots in packed chunks.
+
+        Args:
+            chunk_size (int): Shots per chunk.
+            packing (str): One of SHOT_PACKINGS.
+
+        Yields:
+            numpy.ndarray: Packed shots (see pack_shots).
+        """
+        for start in range(0, self.shots, chunk_size):
+            yield pack_shots(self._hex_shots[start:start + chunk_size], self.num_clbits, packing)
+
+    def to_array(self, packing='uint8'):
+        """
+        Pack every shot into one array.
+
+        Returns:
+            numpy.ndarray: Packed shots (see pack_shots).
+        """
+        return pack_shots(self._hex_shots, self.num_clbits, packing)
+
+    def write(self, path, packing='uint8', chunk_size=DEFAULT_CHUNK_SHOTS):
+        """
+        Write the shots to a memory-mapped .npy file.
+
+        Returns:
+            numpy.memmap: The written array, open read-only.
+        """
+        return write_shots(self.chunks(chunk_size, packing), path, self.shots, self.num_clbits, packing)
+
+
+def stream_shots(circuit, shots, chunk_shots=DEFAULT_CHUNK_SHOTS, packing='uint8', **options):
+    """
+    Run a circuit in chunks of shots and yield each chunk's packed per-shot results.
+
+    The circuit is transpiled once and rerun for every chunk, so memory stays
+    bounded by chunk_shots however many shots are taken.
+
+    Args:
+        circuit (QuantumCircuit): The circuit to run.
+        shots (int): Total number of shots.
+        chunk_shots (int): Shots per run, and per yielded chunk.
+        packing (str): One of SHOT_PACKINGS.
+        **options: Further run_quantum_circuit options (backend_name, token, noise_model, ...).
+
+    Yields:
+        numpy.ndarray: Packed shots (see pack_shots).
+    """
+    from ..circuits.incremental import IncrementalTranspiler
+    from ..qiskit_api import run_quantum_circuit
+
+    _row_shape(circuit.num_clbits, packing)
+    if options.get('pipeline') is None:
+        options.setdefault('transpiler', IncrementalTranspiler())
+    remaining = shots
+    while remaining > 0:
+        count = min(chunk_shots, remaining)
+        memory = run_quantum_circuit(circuit, shots=count, monitor=False, memory=True, **options)
+        yield memory.to_array(packing)
+        remaining -= count
+
+
+def save_shots(circuit, path, shots, chunk_shots=DEFAULT_CHUNK_SHOTS, packing='uint8', **options):
+    """
+    Run a circuit in chunks of shots straight into a memory-mapped .npy file.
+
+    Args:
+        circuit (QuantumCircuit): The circuit to run.
+        path (str): The .npy file to create.
+        shots (int): Total number of shots.
+        chunk_shots (int): Shots per run.
+        packing (str): One of SHOT_PACKINGS.
+        **options: Further run_quantum_circuit options.
+
+    Returns:
+        numpy.memmap: The shots (see pack_shots), open read-only.
+    """
+    return write_shots(stream_shots(circuit, shots, chunk_shots, packing, **options), path, shots,
+                       circuit.num_clbits, packing)
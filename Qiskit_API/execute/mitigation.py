@@ -0,0 +1,377 @@
+import threading
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+MITIGATION_STAGES = ('readout', 'zne')
+
+EXTRAPOLATIONS = ('richardson', 'linear')
+
+DEFAULT_ZNE_SCALES = (1, 3, 5)
+
+# Up to this many clbits readout errors are inverted on the full distribution; wider
+# results are corrected within the subspace of observed outcomes
+DENSE_READOUT_CLBITS = 12
+# Largest number of distinct outcomes the subspace correction solves for
+MAX_READOUT_OUTCOMES = 4096
+
+# Extra circuits submitted with a run, and what applying mitigation needs to know about them
+MitigationPlan = namedtuple('MitigationPlan', ['circuits', 'scales', 'calibration_key', 'clbit_qubits'])
+
+
+def _bit_matrix(labels):
+    # One row of 0/1 per bitstring, clbit 0 in the last column
+    width = len(labels[0])
+    data = ''.join(labels).encode('ascii')
+    return (np.frombuffer(data, dtype=np.uint8).reshape(len(labels), width) - ord('0')).astype(np.intp)
+
+
+def _calibration_key(backend, noise_model, num_qubits):
+    # Devices change readout errors with every calibration; local noise changes with the model
+    name = backend.name() if callable(backend.name) else backend.name
+    properties = backend.properties() if hasattr(backend, 'properties') else None
+    stamp = str(getattr(properties, 'last_update_date', None))
+    return name, stamp, None if noise_model is None else id(noise_model), num_qubits
+
+
+class CalibrationCache:
+    """
+    Readout calibration matrices per backend and calibration cycle.
+
+    Attributes:
+        max_size (int): Maximum number of calibrations kept.
+    """
+
+    def __init__(self, max_size=64):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, noise_model=None):
+        """
+        Look up calibration matrices.
+
+        Args:
+            key (tuple): A calibration key (backend name, calibration stamp, noise model id, qubits).
+            noise_model (NoiseModel, optional): The model the key was made for; guards against
+                a new model reusing a collected one's id.
+
+        Returns:
+            numpy.ndarray: The (qubits, 2, 2) matrices, or None if not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] is not noise_model:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, matrices, noise_model=None):
+        """
+        Store calibration matrices.
+        """
+        with self._lock:
+            self._entries[key] = (matrices, noise_model)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Drop every calibration.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+# Per-process cache used by ErrorMitigation
+CALIBRATIONS = CalibrationCache()
+
+
+def calibration_matrices(counts_zero, counts_one, num_qubits):
+    """
+    Build per-qubit readout matrices from the all-zeros and all-ones calibration counts.
+
+    Args:
+        counts_zero (dict): Counts of measuring every qubit prepared in |0>.
+        counts_one (dict): Counts of measuring every qubit prepared in |1>.
+        num_qubits (int): Number of calibrated qubits.
+
+    Returns:
+        numpy.ndarray: Shaped (qubits, 2, 2); matrix q maps prepared to measured probabilities of qubit q.
+    """
+    flips = []
+    for counts, prepared in ((counts_zero, 0), (counts_one, 1)):
+        labels = [label.replace(' ', '') for label in counts]
+        values = np.fromiter(counts.values(), dtype=float, count=len(labels))
+        # Probability of reading each qubit as 1, qubit 0 first
+        ones = (values @ _bit_matrix(labels))[::-1] / values.sum()
+        flips.append(ones if prepared == 0 else 1 - ones)
+    matrices = np.empty((num_qubits, 2, 2))
+    matrices[:, 0, 0] = 1 - flips[0]
+    matrices[:, 1, 0] = flips[0]
+    matrices[:, 0, 1] = flips[1]
+    matrices[:, 1, 1] = 1 - flips[1]
+    return matrices
+
+
+def correct_readout(counts, matrices):
+    """
+    Undo readout errors in counts.
+
+    Up to DENSE_READOUT_CLBITS clbits the inverse of every clbit's matrix is
+    applied to the full distribution, one tensor axis at a time. Wider results
+    are corrected by solving the readout model restricted to the observed
+    outcomes, whose matrix is built for all outcome pairs at once.
+
+    Args:
+        counts (dict): Bitstring -> count (clbit 0 rightmost; register spaces are kept).
+        matrices (sequence): One (2, 2) readout matrix per clbit, clbit 0 first.
+
+    Returns:
+        dict: Bitstring -> corrected count; quasi-probabilities times shots, which
+            may be slightly negative.
+
+    Raises:
+        ValueError: If a wide result has more than MAX_READOUT_OUTCOMES distinct outcomes.
+    """
+    if not counts:
+        return {}
+    keys = list(counts)
+    # Register spaces are restored from the first key's layout
+    spaces = [index for index, character in enumerate(keys[0]) if character == ' ']
+    labels = [key.replace(' ', '') for key in keys]
+    values = np.fromiter(counts.values(), dtype=float, count=len(labels))
+    num_clbits = len(labels[0])
+    matrices = np.asarray(matrices)
+
+    if num_clbits <= DENSE_READOUT_CLBITS:
+        tensor = np.zeros(1 << num_clbits)
+        tensor[[int(label, 2) for label in labels]] = values
+        tensor = tensor.reshape((2,) * num_clbits)
+        for clbit in range(num_clbits):
+            axis = num_clbits - 1 - clbit
+            inverse = np.linalg.inv(matrices[clbit])
+            tensor = np.moveaxis(np.tensordot(inverse, tensor, axes=([1], [axis])), 0, axis)
+        corrected = tensor.reshape(-1)
+        outcomes = np.flatnonzero(np.abs(corrected) > 1e-12 * values.sum())
+        labels = [format(outcome, f"0{num_clbits}b") for outcome in outcomes.tolist()]
+        corrected = corrected[outcomes]
+    else:
+        if len(labels) > MAX_READOUT_OUTCOMES:
+            raise ValueError(f"Readout correction of {num_clbits}-bit results is limited to "
+                             f"{MAX_READOUT_OUTCOMES} distinct outcomes, got {len(labels)}.")
+        bits = _bit_matrix(labels)
+        # reduced[i, j] = prod over clbits of P(read bit of outcome i | prepared bit of outcome j)
+        reduced = np.ones((len(labels), len(labels)))
+        for column in range(num_clbits):
+            column_bits = bits[:, column]
+            reduced *= matrices[num_clbits - 1 - column][column_bits[:, None], column_bits[None, :]]
+        corrected = np.linalg.solve(reduced, values)
+
+    results = {}
+    for label, value in zip(labels, corrected.tolist()):
+        for index in spaces:
+            label = label[:index] + ' ' + label[index:]
+        results[label] = value
+    return results
+
+
+def extrapolate_counts(scaled_counts, scales, extrapolation='richardson'):
+    """
+    Extrapolate counts measured at amplified noise levels to zero noise.
+
+    Every outcome's probability is fitted against the noise scale at once (one
+    least-squares polynomial fit over all outcomes) and evaluated at zero.
+
+    Args:
+        scaled_counts (sequence): Counts (or corrected counts) at each scale.
+        scales (sequence): The noise scale factors, e.g. (1, 3, 5).
+        extrapolation (str): "richardson" (a polynomial through every point) or "linear".
+
+    Returns:
+        dict: Bitstring -> extrapolated count at the shots of the first scale.
+
+    Raises:
+        ValueError: If the extrapolation is unknown.
+    """
+    if extrapolation not in EXTRAPOLATIONS:
+        raise ValueError(f"Unknown extrapolation {extrapolation!r}; expected one of {', '.join(EXTRAPOLATIONS)}.")
+    labels = sorted(set().union(*scaled_counts))
+    index = {label: position for position, label in enumerate(labels)}
+    probabilities = np.zeros((len(scales), len(labels)))
+    for row, counts in enumerate(scaled_counts):
+        columns = [index[label] for label in counts]
+        values = np.fromiter(counts.values(), dtype=float, count=len(columns))
+        probabilities[row, columns] = values / values.sum()
+    degree = len(scales) - 1 if extrapolation == 'richardson' else 1
+    # polyfit returns the highest power first; the constant term is the zero-noise value
+    zero_noise = np.polyfit(np.asarray(scales, dtype=float), probabilities, degree)[-1]
+    shots = sum(scaled_counts[0].values())
+    return dict(zip(labels, (zero_noise * shots).tolist()))
+
+
+def fold_circuit(circuit, scale):
+    """
+    Amplify a circuit's noise by global unitary folding: U -> U (U^-1 U)^((scale - 1) / 2).
+
+    The inverse gates may fall outside the backend's basis; ErrorMitigation.prepare
+    translates folded circuits back to it.
+
+    Args:
+        circuit (QuantumCircuit): A transpiled circuit whose measurements are all final.
+        scale (int): Odd noise scale factor.
+
+    Returns:
+        QuantumCircuit: The folded circuit, with the same registers and final measurements.
+
+    Raises:
+        ValueError: If the scale is not a positive odd integer or the circuit measures mid-circuit.
+    """
+    from qiskit import QuantumCircuit
+
+    if scale < 1 or scale % 2 != 1:
+        raise ValueError(f"Noise scale factors must be odd positive integers, got {scale}.")
+    unitary = circuit.remove_final_measurements(inplace=False)
+    if any(instruction.operation.name in ('measure', 'reset') for instruction in unitary.data):
+        raise ValueError("Zero-noise extrapolation needs a circuit whose measurements are all final.")
+    folded = QuantumCircuit(*circuit.qregs, *circuit.cregs, name=f"{circuit.name}_zne{scale}")
+    folded.compose(unitary, qubits=range(unitary.num_qubits), inplace=True)
+    if scale > 1:
+        inverse = unitary.inverse()
+        for _ in range((scale - 1) // 2):
+            # Barriers keep later compilation from cancelling the folds
+            folded.barrier()
+            folded.compose(inverse, qubits=range(unitary.num_qubits), inplace=True)
+            folded.barrier()
+            folded.compose(unitary, qubits=range(unitary.num_qubits), inplace=True)
+    for instruction in circuit.data:
+        if instruction.operation.name == 'measure':
+            folded.append(instruction.operation, instruction.qubits, instruction.clbits)
+    return folded
+
+
+class ErrorMitigation:
+    """
+    Opt-in error mitigation for run_quantum_circuit: readout correction and zero-noise extrapolation.
+
+    Calibration and folded circuits are submitted in the same job as the
+    circuit itself. Readout calibrations are cached per backend and calibration
+    cycle (see CalibrationCache), so after the first job only the folded
+    circuits, if any, are added.
+
+    Attributes:
+        readout (bool): Correct readout errors.
+        zne_scales (tuple or None): Noise scale factors for zero-noise extrapolation (None disables it).
+        extrapolation (str): One of EXTRAPOLATIONS.
+        cache (CalibrationCache): Where readout calibrations are kept.
+        last_report (dict or None): What the latest run did.
+    """
+
+    def __init__(self, readout=True, zne_scales=None, extrapolation='richardson', cache=None):
+        if extrapolation not in EXTRAPOLATIONS:
+            raise ValueError(f"Unknown extrapolation {extrapolation!r}; expected one of {', '.join(EXTRAPOLATIONS)}.")
+        self.readout = readout
+        self.zne_scales = tuple(zne_scales) if zne_scales else None
+        self.extrapolation = extrapolation
+        self.cache = cache if cache is not None else CALIBRATIONS
+        self.last_report = None
+
+    @classmethod
+    def from_stages(cls, stages):
+        """
+        Build a mitigation from stage names.
+
+        Args:
+            stages (str or sequence): Names from MITIGATION_STAGES, e.g. "readout" or ["readout", "zne"].
+
+        Returns:
+            ErrorMitigation: The mitigation (ZNE uses DEFAULT_ZNE_SCALES).
+
+        Raises:
+            ValueError: If a stage is unknown.
+        """
+        stages = [stages] if isinstance(stages, str) else list(stages)
+        unknown = set(stages) - set(MITIGATION_STAGES)
+        if unknown:
+            raise ValueError(f"Unknown mitigation stages {sorted(unknown)}; expected {', '.join(MITIGATION_STAGES)}.")
+        return cls(readout='readout' in stages, zne_scales=DEFAULT_ZNE_SCALES if 'zne' in stages else None)
+
+    def prepare(self, circuit, backend, noise_model=None):
+        """
+        Build the circuits to submit alongside a transpiled circuit.
+
+        Args:
+            circuit (QuantumCircuit): The transpiled circuit.
+            backend (Backend): The backend it runs on.
+            noise_model (NoiseModel, optional): Noise of a local simulation.
+
+        Returns:
+            MitigationPlan: Extra circuits, in the order they follow the circuit in the job.
+        """
+        from qiskit import QuantumCircuit, transpile
+
+        extra = []
+        scales = self.zne_scales
+        if scales:
+            # The unfolded circuit is the job's first experiment
+            folded = [fold_circuit(circuit, scale) for scale in scales if scale != 1]
+            if folded:
+                # Inverses add gates such as sxdg that the device rejects and a noise model has no
+                # errors for; translate them back to the basis without touching the folds' barriers
+                basis_gates = noise_model.basis_gates if noise_model is not None else None
+                extra.extend(transpile(folded, backend, basis_gates=basis_gates, optimization_level=0))
+        calibration_key = clbit_qubits = None
+        if self.readout:
+            qubit_index = {bit: index for index, bit in enumerate(circuit.qubits)}
+            clbit_index = {bit: index for index, bit in enumerate(circuit.clbits)}
+            clbit_qubits = {clbit_index[instruction.clbits[0]]: qubit_index[instruction.qubits[0]]
+                            for instruction in circuit.data if instruction.operation.name == 'measure'}
+            calibration_key = _calibration_key(backend, noise_model, circuit.num_qubits)
+            if self.cache.get(calibration_key, noise_model) is None:
+                for prepared in (0, 1):
+                    calibration = QuantumCircuit(circuit.num_qubits, circuit.num_qubits,
+                                                 name=f"readout_calibration_{prepared}")
+                    if prepared:
+                        calibration.x(range(circuit.num_qubits))
+                    calibration.measure(range(circuit.num_qubits), range(circuit.num_qubits))
+                    extra.append(calibration)
+        return MitigationPlan(extra, scales, calibration_key, clbit_qubits)
+
+    def apply(self, result, plan, noise_model=None):
+        """
+        Mitigate the counts of a job submitted with a plan's circuits.
+
+        Args:
+            result (Result): The job result; experiment 0 is the circuit itself.
+            plan (MitigationPlan): The plan from prepare.
+            noise_model (NoiseModel, optional): The noise model given to prepare.
+
+        Returns:
+            dict: Mitigated counts (floats; see correct_readout).
+        """
+        folded = len(plan.scales) - (1 in plan.scales) if plan.scales else 0
+        scaled_counts = [result.get_counts(0)] + [result.get_counts(1 + index) for index in range(folded)]
+        report = {'extra_circuits': len(plan.circuits)}
+        if self.readout:
+            matrices = self.cache.get(plan.calibration_key, noise_model)
+            report['readout_calibrated'] = matrices is None
+            if matrices is None:
+                num_qubits = plan.calibration_key[3]
+                matrices = calibration_matrices(result.get_counts(1 + folded), result.get_counts(2 + folded),
+                                                num_qubits)
+                self.cache.put(plan.calibration_key, matrices, noise_model)
+            num_clbits = len(next(iter(scaled_counts[0])).replace(' ', ''))
+            identity = np.eye(2)
+            per_clbit = [matrices[plan.clbit_qubits[clbit]] if clbit in plan.clbit_qubits else identity
+                         for clbit in range(num_clbits)]
+            scaled_counts = [correct_readout(counts, per_clbit) for counts in scaled_counts]
+        if plan.scales:
+            # Experiment order is the unfolded circuit first, then the other scales in order
+            ordered = [1] + [scale for scale in plan.scales if scale != 1]
+            counts = extrapolate_counts(scaled_counts, ordered, self.extrapolation)
+            report['zne'] = {'scales': ordered, 'extrapolation': self.extrapolation}
+        else:
+            counts = scaled_counts[0]
+        self.last_report = report
+        return counts
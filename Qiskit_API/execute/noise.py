@@ -0,0 +1,265 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+
+MimickedDevice = namedtuple('MimickedDevice', ['noise_model', 'coupling_map'])
+MimickedDevice.__doc__ = """
+What a local simulation needs to mirror a device.
+
+Attributes:
+    noise_model (NoiseModel): Noise built from the device's calibration.
+    coupling_map (list): The device's coupled qubit pairs, or None if all pairs are coupled.
+"""
+
+
+class SnapshotBackend:
+    """
+    Offline stand-in for a device, built from a calibration snapshot saved by save_snapshot.
+
+    It only provides what NoiseModel.from_backend and transpile read: name,
+    configuration and properties.
+    """
+
+    version = 1
+
+    def __init__(self, configuration, properties):
+        self._configuration = configuration
+        self._properties = properties
+
+    def name(self):
+        return self._configuration.backend_name
+
+    def configuration(self):
+        return self._configuration
+
+    def properties(self):
+        return self._properties
+
+
+def save_snapshot(backend, path):
+    """
+    Save a backend's configuration and calibration properties to a JSON snapshot.
+
+    Args:
+        backend (Backend): A device backend with calibration properties.
+        path (str): File to write.
+    """
+    snapshot = {
+        'configuration': backend.configuration().to_dict(),
+        'properties': backend.properties().to_dict(),
+    }
+    with open(path, 'w') as file:
+        json.dump(snapshot, file, default=str)
+
+
+def load_snapshot(path):
+    """
+    Load a snapshot written by save_snapshot.
+
+    Args:
+        path (str): The snapshot file.
+
+    Returns:
+        SnapshotBackend: A backend that noise models and transpilation can be built from.
+    """
+    from qiskit.providers.models import BackendProperties, QasmBackendConfiguration
+
+    with open(path) as file:
+        snapshot = json.load(file)
+    return SnapshotBackend(QasmBackendConfiguration.from_dict(snapshot['configuration']),
+                           BackendProperties.from_dict(snapshot['properties']))
+
+
+def resolve_backend(backend, token=None):
+    """
+    Turn a backend reference into a backend object.
+
+    Args:
+        backend (Backend or str): A backend object, the path of a snapshot file, the name
+            of a qiskit fake backend (e.g. "fake_manila"), or an IBMQ device name.
+        token (str, optional): IBMQ token, needed to look up live devices by name.
+
+    Returns:
+        Backend: The backend.
+
+    Raises:
+        ValueError: If the name matches neither a snapshot nor a fake backend and no token is given.
+    """
+    if not isinstance(backend, str):
+        return backend
+    if os.path.isfile(backend):
+        return load_snapshot(backend)
+    try:
+        from qiskit.providers.fake_provider import FakeProvider
+    except ImportError:
+        from qiskit.test.mock import FakeProvider
+    try:
+        return FakeProvider().get_backend(backend)
+    except Exception:
+        if not token:
+            raise ValueError(f"Backend {backend!r} is not a snapshot file or fake backend; an IBMQ token is "
+                             f"needed to use a live device.") from None
+    from qiskit import IBMQ
+
+    IBMQ.enable_account(token)
+    return IBMQ.get_provider(hub='ibm-q').get_backend(backend)
+
+
+def _backend_name(backend):
+    name = backend.name
+    return name() if callable(name) else name
+
+
+def _coupling_map(backend):
+    if getattr(backend, 'version', 1) >= 2:
+        coupling_map = backend.coupling_map
+        return None if coupling_map is None else [list(edge) for edge in coupling_map.get_edges()]
+    return getattr(backend.configuration(), 'coupling_map', None)
+
+
+def _calibration_stamp(backend):
+    # Newer (V2) backends have no properties(); their noise is then keyed by name only
+    properties = backend.properties() if hasattr(backend, 'properties') else None
+    if properties is None and getattr(backend, 'version', 1) == 1:
+        raise ValueError(f"Backend {_backend_name(backend)!r} has no calibration properties to build noise from.")
+    return str(getattr(properties, 'last_update_date', None))
+
+
+class NoiseModelCache:
+    """
+    Noise models built from backend calibrations, memoized by calibration timestamp.
+
+    A model is rebuilt only when the device reports a new calibration, and the
+    calibration of a device given by name is re-read at most once per
+    refresh_interval, so jobs on the hot path get a ready model from memory.
+    prefetch builds a model in the background ahead of the first job. The
+    device's coupling map is kept with its model, since the noise model only
+    has two-qubit errors for coupled pairs.
+
+    Attributes:
+        max_size (int): Maximum number of models kept.
+        refresh_interval (float): Seconds during which a named device's calibration is not re-read.
+        builds (int): Number of models built.
+    """
+
+    def __init__(self, max_size=16, refresh_interval=300.0):
+        self.max_size = max_size
+        self.refresh_interval = refresh_interval
+        self.builds = 0
+        self._models = OrderedDict()
+        # Device name as given -> (monotonic time of the last calibration check, model key)
+        self._checked = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def get(self, backend, token=None):
+        """
+        Return the noise model for a backend's current calibration.
+
+        Args:
+            backend (Backend or str): The device to mimic (see resolve_backend).
+            token (str, optional): IBMQ token for live devices looked up by name.
+
+        Returns:
+            NoiseModel: The noise model.
+        """
+        return self.get_device(backend, token).noise_model
+
+    def get_device(self, backend, token=None):
+        """
+        Return the noise model and coupling map for a backend's current calibration.
+
+        Args:
+            backend (Backend or str): The device to mimic (see resolve_backend).
+            token (str, optional): IBMQ token for live devices looked up by name.
+
+        Returns:
+            MimickedDevice: The noise model and coupling map.
+        """
+        # Only a device name is answered from its last calibration check; a snapshot file or a
+        # backend object carries its own calibration, which is compared by timestamp below
+        reference = backend if isinstance(backend, str) and not os.path.isfile(backend) else None
+        if reference is not None:
+            device = self._recent(reference)
+            if device is not None:
+                return device
+        backend = resolve_backend(backend, token)
+        names = (reference,) if reference is not None else ()
+
+        key = (_backend_name(backend), _calibration_stamp(backend))
+        with self._lock:
+            device = self._models.get(key)
+            if device is not None:
+                self._models.move_to_end(key)
+                self._mark_checked(names, key)
+                return device
+            future = self._pending.get(key)
+            building = future is None
+            if building:
+                future = self._pending[key] = Future()
+        if building:
+            try:
+                from qiskit.providers.aer.noise import NoiseModel
+
+                device = MimickedDevice(NoiseModel.from_backend(backend), _coupling_map(backend))
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                with self._lock:
+                    self.builds += 1
+                    self._models[key] = device
+                    self._mark_checked(names, key)
+                    while len(self._models) > self.max_size:
+                        self._models.popitem(last=False)
+                future.set_result(device)
+            finally:
+                with self._lock:
+                    self._pending.pop(key, None)
+        return future.result()
+
+    def _mark_checked(self, names, key):
+        checked = (time.monotonic(), key)
+        for name in names:
+            self._checked[name] = checked
+
+    def _recent(self, name):
+        with self._lock:
+            checked = self._checked.get(name)
+            if checked is None or time.monotonic() - checked[0] >= self.refresh_interval:
+                return None
+            device = self._models.get(checked[1])
+            if device is not None:
+                self._models.move_to_end(checked[1])
+            return device
+
+    def prefetch(self, backend, token=None):
+        """
+        Build a backend's noise model in a background thread.
+
+        Args:
+            backend (Backend or str): The device to mimic (see resolve_backend).
+            token (str, optional): IBMQ token for live devices looked up by name.
+
+        Returns:
+            Future: Resolves to the noise model.
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='noise-model')
+        return self._executor.submit(self.get, backend, token)
+
+    def clear(self):
+        """
+        Drop every cached model.
+        """
+        with self._lock:
+            self._models.clear()
+            self._checked.clear()
+
+
+# Per-process cache used by run_quantum_circuit
+NOISE_MODELS = NoiseModelCache()
@@ -0,0 +1,207 @@
+import time
+from collections import Counter, OrderedDict
+
+# Preset name -> qiskit.transpile options
+OPTIMIZATION_PRESETS = {
+    'none': {'optimization_level': 0},
+    'light': {'optimization_level': 1},
+    'medium': {'optimization_level': 2},
+    'heavy': {'optimization_level': 3},
+}
+
+# Below these sizes a simulator runs the circuit faster than a heavy transpile finishes
+TINY_CIRCUIT_QUBITS = 8
+TINY_CIRCUIT_GATES = 64
+
+# Upper bound on the depth-reduction loop
+_MAX_DEPTH_ROUNDS = 4
+
+
+def _basis_gates(backend):
+    if backend is None:
+        return None
+    if hasattr(backend, 'operation_names'):
+        return list(backend.operation_names)
+    return backend.configuration().basis_gates
+
+
+def _is_simulator(backend):
+    from ..backends.details import describe_backend
+
+    try:
+        return bool(describe_backend(backend)['simulator'])
+    except Exception:
+        return False
+
+
+class OptimizationPipeline:
+    """
+    Configurable pre-execution optimization stage.
+
+    Each run transpiles the circuit with a preset, optionally followed by gate
+    cancellation and a depth-reduction loop, and records a report with per-pass
+    timing and gate-count deltas in last_report. Transpiled circuits are cached
+    by canonical fingerprint, backend and settings, so resubmitting an identical
+    (or commutation-equivalent) circuit skips the transpiler.
+
+    Attributes:
+        preset (str): A key of OPTIMIZATION_PRESETS, or "auto".
+        default_preset (str): Preset "auto" uses for circuits that are not tiny or not simulated.
+        gate_cancellation (bool): Run commutative gate cancellation after transpiling.
+        depth_reduction (bool): Repeat 1-qubit resynthesis and cancellation while depth decreases.
+        transpile_options (dict): Extra qiskit.transpile options, e.g. layout_method or routing_method.
+        cache_size (int): Maximum number of transpiled circuits kept (0 disables the cache).
+        last_report (dict): Report of the most recent run.
+    """
+
+    def __init__(self, preset='auto', default_preset='light', gate_cancellation=False, depth_reduction=False,
+                 cache_size=256, **transpile_options):
+        """
+        Initialize an OptimizationPipeline.
+
+        Args:
+            preset (str): A key of OPTIMIZATION_PRESETS, or "auto" (default) to use the
+                "none" preset for tiny circuits on simulators and default_preset otherwise.
+            default_preset (str): Preset used by "auto" (default is "light").
+            gate_cancellation (bool): Run commutative gate cancellation after transpiling.
+            depth_reduction (bool): Repeat 1-qubit resynthesis and cancellation while depth decreases.
+            cache_size (int): Maximum number of transpiled circuits kept (default is 256).
+            **transpile_options: Extra qiskit.transpile options (layout_method, routing_method, seed_transpiler, ...).
+
+        Raises:
+            ValueError: If a preset name is unknown.
+        """
+        for name in (preset, default_preset):
+            if name != 'auto' and name not in OPTIMIZATION_PRESETS:
+                raise ValueError(f"Unknown optimization preset {name!r}; expected 'auto' or one of "
+                                 f"{', '.join(OPTIMIZATION_PRESETS)}.")
+        self.preset = preset
+        self.default_preset = default_preset
+        self.gate_cancellation = gate_cancellation
+        self.depth_reduction = depth_reduction
+        self.transpile_options = transpile_options
+        self.cache_size = cache_size
+        self.last_report = None
+        self._cache = OrderedDict()
+
+    def choose_preset(self, circuit, backend=None):
+        """
+        Resolve the preset to use for a circuit.
+
+        Args:
+            circuit (QuantumCircuit): The circuit about to be transpiled.
+            backend (Backend, optional): The backend it will run on.
+
+        Returns:
+            str: A key of OPTIMIZATION_PRESETS.
+        """
+        if self.preset != 'auto':
+            return self.preset
+        if circuit.num_qubits <= TINY_CIRCUIT_QUBITS and circuit.size() <= TINY_CIRCUIT_GATES \
+                and (backend is None or _is_simulator(backend)):
+            return 'none'
+        return self.default_preset
+
+    def run(self, circuit, backend=None, basis_gates=None, coupling_map=None):
+        """
+        Optimize a circuit for a backend.
+
+        Args:
+            circuit (QuantumCircuit): The circuit to optimize.
+            backend (Backend, optional): The backend to target.
+            basis_gates (list, optional): Gates to translate to instead of the backend's,
+                e.g. the basis of a noise model simulated on it.
+            coupling_map (list, optional): Coupled qubit pairs to route for instead of the
+                backend's, e.g. those of a device mimicked on a simulator.
+
+        Returns:
+            QuantumCircuit: The optimized circuit. Cached results are shared, so do not modify it.
+        """
+        from qiskit import transpile
+
+        from ..backends.details import backend_key
+        from ..circuits.fingerprint import circuit_fingerprint
+
+        start = time.perf_counter()
+        preset = self.choose_preset(circuit, backend)
+        report = {
+            'preset': preset,
+            'cached': False,
+            'size_before': circuit.size(),
+            'depth_before': circuit.depth(),
+            'passes': [],
+        }
+
+        cache_key = None
+        if self.cache_size:
+            fingerprint = circuit_fingerprint(circuit)
+            # Only identically wired equivalents may share a transpiled circuit
+            cache_key = (fingerprint, backend_key(backend), None if basis_gates is None else tuple(basis_gates),
+                         None if coupling_map is None else tuple(map(tuple, coupling_map)),
+                         preset, self.gate_cancellation, self.depth_reduction)
+            optimized = self._cache.get(cache_key)
+            if optimized is not None:
+                self._cache.move_to_end(cache_key)
+                report['cached'] = True
+                if optimized.name != circuit.name:
+                    # Results are looked up by circuit name
+                    optimized = optimized.copy(name=circuit.name)
+                return self._finish(report, circuit, optimized, start)
+
+        passes = report['passes']
+
+        def record_pass(**kwargs):
+            # qiskit passes pass_, dag, time, property_set and count as keywords
+            size = kwargs['dag'].size()
+            previous = passes[-1]['size'] if passes else report['size_before']
+            passes.append({'name': type(kwargs['pass_']).__name__, 'seconds': kwargs['time'], 'size': size,
+                           'delta': size - previous})
+
+        options = dict(OPTIMIZATION_PRESETS[preset], **self.transpile_options)
+        if basis_gates is not None:
+            options['basis_gates'] = basis_gates
+        if coupling_map is not None:
+            options['coupling_map'] = coupling_map
+        optimized = transpile(circuit, backend, callback=record_pass, **options)
+
+        if self.gate_cancellation or self.depth_reduction:
+            from qiskit.transpiler import PassManager
+            from qiskit.transpiler.passes import CommutativeCancellation, Optimize1qGatesDecomposition
+
+            if basis_gates is None:
+                basis_gates = _basis_gates(backend)
+            cancellation = PassManager([CommutativeCancellation(basis_gates=basis_gates)])
+            if self.gate_cancellation:
+                optimized = cancellation.run(optimized, callback=record_pass)
+            if self.depth_reduction:
+                reduction = PassManager([Optimize1qGatesDecomposition(basis=basis_gates),
+                                         CommutativeCancellation(basis_gates=basis_gates)])
+                depth = optimized.depth()
+                for _ in range(_MAX_DEPTH_ROUNDS):
+                    candidate = reduction.run(optimized, callback=record_pass)
+                    candidate_depth = candidate.depth()
+                    if candidate_depth >= depth:
+                        break
+                    optimized, depth = candidate, candidate_depth
+
+        if cache_key is not None:
+            self._cache[cache_key] = optimized
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return self._finish(report, circuit, optimized, start)
+
+    def _finish(self, report, circuit, optimized, start):
+        gate_counts = Counter(optimized.count_ops())
+        gate_counts.subtract(circuit.count_ops())
+        report['size_after'] = optimized.size()
+        report['depth_after'] = optimized.depth()
+        report['gate_deltas'] = {name: delta for name, delta in sorted(gate_counts.items()) if delta}
+        report['seconds'] = time.perf_counter() - start
+        self.last_report = report
+        return optimized
+
+    def clear_cache(self):
+        """
+        Drop all cached transpiled circuits.
+        """
+        self._cache.clear()
@@ -0,0 +1,20 @@
+from .status import retrieve_job
+
+
+def get_job_results(job_id, token=None):
+    """
+    Get the measurement counts of a finished job.
+
+    Args:
+        job_id (str): The job ID returned when the circuit was submitted.
+        token (str, optional): IBMQ token; the saved account is used when omitted.
+
+    Returns:
+        dict: The job ID and its counts, one entry per circuit in the job.
+    """
+    result = retrieve_job(job_id, token).result()
+    counts = result.get_counts()
+    return {
+        'job_id': job_id,
+        'counts': counts if isinstance(counts, list) else [counts],
+    }
@@ -0,0 +1,207 @@
+import logging
+import os
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+SIMULATION_METHODS = ('statevector', 'stabilizer', 'matrix_product_state', 'density_matrix')
+
+# Aer backends that accept the "method" run option
+SAMPLING_SIMULATORS = ('qasm_simulator', 'aer_simulator')
+
+# Gates the stabilizer method simulates exactly (plus non-unitary bookkeeping)
+CLIFFORD_GATES = frozenset({
+    'id', 'x', 'y', 'z', 'h', 's', 'sdg', 'sx', 'sxdg', 'cx', 'cy', 'cz', 'swap', 'iswap', 'ecr', 'dcx',
+    'measure', 'reset', 'barrier', 'delay',
+})
+
+# Gates whose operator Schmidt rank across any cut is 2, i.e. add at most one bit of entanglement
+_RANK_TWO_GATES = frozenset({'cx', 'cy', 'cz', 'ch', 'cp', 'cu1', 'crx', 'cry', 'crz', 'csx', 'rzz', 'rxx', 'ryy',
+                             'rzx', 'cu', 'cu3'})
+
+# Density matrices are exact for noisy runs but cost 4**n memory
+DENSITY_MATRIX_MAX_QUBITS = 12
+# Above this width a low-entanglement circuit runs faster as an MPS than as a statevector
+MPS_MIN_QUBITS = 24
+# Largest entanglement (log2 of the bond dimension) across a cut for which the MPS method is chosen
+MPS_MAX_ENTANGLEMENT = 10
+# Statevector simulation only pays for extra threads from this width on (Aer's own default threshold)
+PARALLEL_MIN_QUBITS = 14
+# Share of physical memory a statevector may use
+MEMORY_FRACTION = 0.5
+
+SimulationPlan = namedtuple('SimulationPlan', ['method', 'threads', 'reason'])
+
+
+def _physical_memory():
+    try:
+        return os.sysconf('SC_PHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def analyze_circuit(circuit):
+    """
+    Summarize what decides how expensive a circuit is to simulate.
+
+    Entanglement is bounded from the two-qubit gates crossing each cut of the
+    qubit line: every crossing gate adds at most one bit (controlled and Ising
+    gates) or two bits (other gates) of entanglement, and no cut can hold more
+    than its smaller side. This upper bound is what an MPS's bond dimension
+    would need in the worst case.
+
+    Args:
+        circuit (QuantumCircuit): The circuit (ideally already transpiled).
+
+    Returns:
+        dict: num_qubits, gate names, non_clifford gate count, max_entanglement
+            (log2 of the bond dimension bound) and multi_qubit_gates (gates on 3+ qubits).
+    """
+    num_qubits = circuit.num_qubits
+    qubit_indices = {bit: index for index, bit in enumerate(circuit.qubits)}
+    # crossings[k]: entanglement bits added across the cut between qubits k and k + 1
+    crossings = [0] * max(num_qubits - 1, 0)
+    gate_names = set()
+    non_clifford = 0
+    multi_qubit = 0
+    for instruction in circuit.data:
+        name = instruction.operation.name
+        gate_names.add(name)
+        if name not in CLIFFORD_GATES:
+            non_clifford += 1
+        if name in ('barrier', 'measure', 'delay') or len(instruction.qubits) < 2:
+            continue
+        if len(instruction.qubits) > 2:
+            multi_qubit += 1
+        indices = [qubit_indices[bit] for bit in instruction.qubits]
+        bits = 1 if name in _RANK_TWO_GATES else 2
+        for cut in range(min(indices), max(indices)):
+            crossings[cut] += bits
+    max_entanglement = max((min(bits, cut + 1, num_qubits - cut - 1) for cut, bits in enumerate(crossings)),
+                           default=0)
+    return {
+        'num_qubits': num_qubits,
+        'gates': sorted(gate_names),
+        'non_clifford': non_clifford,
+        'max_entanglement': max_entanglement,
+        'multi_qubit_gates': multi_qubit,
+    }
+
+
+def choose_simulation(circuit, noise_model=None, memory_bytes=None, max_threads=None):
+    """
+    Pick the Aer simulation method and thread count for a circuit.
+
+    Clifford circuits use the stabilizer method at any width. Small noisy circuits
+    use a density matrix, which needs no per-shot trajectories. Wide circuits with
+    little entanglement, or ones whose statevector would not fit in memory, use a
+    matrix product state. Everything else uses a statevector, with threads only
+    when the circuit is wide enough to benefit.
+
+    Args:
+        circuit (QuantumCircuit): The circuit about to run (ideally already transpiled).
+        noise_model (NoiseModel, optional): Noise that will be simulated.
+        memory_bytes (int, optional): Memory available to the simulator (default is
+            MEMORY_FRACTION of physical memory).
+        max_threads (int, optional): Upper bound on threads (default is the CPU count).
+
+    Returns:
+        SimulationPlan: The method, thread count and a short reason.
+    """
+    analysis = analyze_circuit(circuit)
+    num_qubits = analysis['num_qubits']
+    max_threads = max_threads or os.cpu_count() or 1
+    if memory_bytes is None:
+        physical = _physical_memory()
+        memory_bytes = int(physical * MEMORY_FRACTION) if physical else None
+
+    if analysis['non_clifford'] == 0 and noise_model is None:
+        return SimulationPlan('stabilizer', 1, 'Clifford-only circuit')
+    if noise_model is not None and num_qubits <= DENSITY_MATRIX_MAX_QUBITS:
+        threads = max_threads if 2 * num_qubits >= PARALLEL_MIN_QUBITS else 1
+        return SimulationPlan('density_matrix', threads, f"noisy circuit on {num_qubits} qubits")
+
+    # Complex128 amplitudes
+    statevector_bytes = 16 << num_qubits
+    fits = memory_bytes is None or statevector_bytes <= memory_bytes
+    low_entanglement = analysis['max_entanglement'] <= MPS_MAX_ENTANGLEMENT and not analysis['multi_qubit_gates']
+    if low_entanglement and (num_qubits >= MPS_MIN_QUBITS or not fits):
+        return SimulationPlan('matrix_product_state', max_threads,
+                              f"entanglement of at most {analysis['max_entanglement']} bits across any cut")
+    if not fits:
+        # Nothing else can hold it; the MPS method at least degrades gracefully
+        return SimulationPlan('matrix_product_state', max_threads,
+                              f"a {num_qubits}-qubit statevector needs {statevector_bytes} bytes")
+    threads = max_threads if num_qubits >= PARALLEL_MIN_QUBITS else 1
+    return SimulationPlan('statevector', threads, f"{analysis['non_clifford']} non-Clifford gates")
+
+
+class SimulationSelector:
+    """
+    Chooses the simulation method for each run and remembers which one ran.
+
+    Attributes:
+        method (str or None): Fixed method to use, or None to choose per circuit.
+        memory_bytes (int or None): Memory available to the simulator (see choose_simulation).
+        max_threads (int or None): Upper bound on threads (see choose_simulation).
+        last_plan (SimulationPlan or None): Plan of the latest run, with the method
+            the simulator reported using.
+    """
+
+    def __init__(self, method=None, memory_bytes=None, max_threads=None):
+        if method is not None and method not in SIMULATION_METHODS:
+            raise ValueError(f"Unknown simulation method {method!r}; expected one of {', '.join(SIMULATION_METHODS)}.")
+        self.method = method
+        self.memory_bytes = memory_bytes
+        self.max_threads = max_threads
+        self.last_plan = None
+
+    def select(self, circuit, noise_model=None):
+        """
+        Plan a run of circuit.
+
+        Args:
+            circuit (QuantumCircuit): The transpiled circuit about to run.
+            noise_model (NoiseModel, optional): Noise that will be simulated.
+
+        Returns:
+            SimulationPlan: The plan, also left in last_plan.
+        """
+        if self.method is not None:
+            plan = SimulationPlan(self.method, self.max_threads or os.cpu_count() or 1, 'requested')
+        else:
+            plan = choose_simulation(circuit, noise_model, self.memory_bytes, self.max_threads)
+        self.last_plan = plan
+        return plan
+
+    def run_options(self, plan):
+        """
+        Aer run options carrying out a plan.
+
+        Returns:
+            dict: The method and max_parallel_threads options.
+        """
+        return {'method': plan.method, 'max_parallel_threads': plan.threads}
+
+    def record(self, result):
+        """
+        Record the method the simulator reports having used for a finished run.
+
+        Args:
+            result (Result): The job result.
+
+        Returns:
+            SimulationPlan: The plan of the run, with the reported method.
+        """
+        from ..metrics import SIMULATIONS
+
+        plan = self.last_plan
+        experiments = getattr(result, 'results', None) or []
+        metadata = getattr(experiments[0], 'metadata', None) if experiments else None
+        method = (metadata or {}).get('method') if isinstance(metadata, dict) else None
+        if plan is not None and method and method != plan.method:
+            plan = self.last_plan = plan._replace(method=method)
+        if plan is not None:
+            SIMULATIONS.inc(plan.method)
+            logger.info("Simulated with %s on %d thread(s): %s", plan.method, plan.threads, plan.reason)
+        return plan
@@ -0,0 +1,41 @@
+def retrieve_job(job_id, token=None):
+    """
+    Retrieve a previously submitted IBM Quantum job by its ID.
+
+    Local Aer jobs only live inside the process that submitted them, so only
+    provider jobs can be looked up from a separate invocation.
+
+    Args:
+        job_id (str): The job ID returned when the circuit was submitted.
+        token (str, optional): IBMQ token; the saved account is used when omitted.
+
+    Returns:
+        Job: The retrieved job.
+    """
+    from qiskit import IBMQ
+
+    if token:
+        IBMQ.enable_account(token)
+    else:
+        IBMQ.load_account()
+    provider = IBMQ.get_provider(hub='ibm-q')
+    return provider.backend.retrieve_job(job_id)
+
+
+def get_job_status(job_id, token=None):
+    """
+    Get the status of a submitted job.
+
+    Args:
+        job_id (str): The job ID returned when the circuit was submitted.
+        token (str, optional): IBMQ token; the saved account is used when omitted.
+
+    Returns:
+        dict: The job ID, backend name and status name.
+    """
+    job = retrieve_job(job_id, token)
+    return {
+        'job_id': job_id,
+        'backend': job.backend().name(),
+        'status': job.status().name,
+    }
@@ -0,0 +1,279 @@
+# Author: Jacob Thomas Redmond
+# MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+In-process metrics and optional tracing for the Qiskit API.
+
+Counters and histograms live in a registry that renders the Prometheus text
+exposition format. Timing a stage costs one to two microseconds, so only
+stages that take a millisecond or more (transpilation, job waits, envelope
+crypto, archive I/O, web requests) are instrumented, which keeps the overhead
+well under 1%. Tracing is off until set_tracer installs a hook.
+"""
+
+import bisect
+import functools
+import threading
+import time
+
+# Upper bounds in seconds, from sub-millisecond serialization to multi-minute hardware queues
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+                   30.0, 60.0, 300.0)
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """
+    Monotonically increasing count, optionally split by labels.
+
+    Attributes:
+        name (str): Metric name.
+        help (str): Description shown in the exposition output.
+        label_names (tuple): Names of the labels.
+    """
+
+    type_name = 'counter'
+
+    def __init__(self, name, help, label_names=()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        """
+        Increase the count for the given label values.
+
+        Parameters:
+            *label_values: One value per label name.
+            amount (float): How much to add (default is 1).
+        """
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values):
+        return self._values.get(label_values, 0)
+
+    def samples(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        for label_values, value in values:
+            yield f"{self.name}{_format_labels(self.label_names, label_values)} {_format_value(value)}"
+
+
+class Histogram:
+    """
+    Distribution of observed values in cumulative buckets, optionally split by labels.
+
+    Attributes:
+        name (str): Metric name.
+        help (str): Description shown in the exposition output.
+        label_names (tuple): Names of the labels.
+        buckets (tuple): Sorted bucket upper bounds.
+    """
+
+    type_name = 'histogram'
+
+    def __init__(self, name, help, label_names=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        # Label values -> [per-bucket counts (last is +Inf), sum, count]
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        """
+        Record one observation.
+
+        Parameters:
+            value (float): The observed value (e.g. seconds).
+            *label_values: One value per label name.
+        """
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, *label_values):
+        series = self._series.get(label_values)
+        return series[2] if series else 0
+
+    def total(self, *label_values):
+        series = self._series.get(label_values)
+        return series[1] if series else 0.0
+
+    def samples(self):
+        with self._lock:
+            series = sorted((label_values, ([*counts], total, count))
+                            for label_values, (counts, total, count) in self._series.items())
+        for label_values, (counts, total, count) in series:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.label_names, label_values, [('le', _format_value(float(bound)))])
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.label_names, label_values)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {count}"
+
+
+class MetricsRegistry:
+    """
+    Collection of metrics rendered together.
+
+    Attributes:
+        metrics (dict): Metric name -> Counter or Histogram.
+    """
+
+    def __init__(self):
+        self.metrics = {}
+
+    def register(self, metric):
+        """
+        Add a metric, or return the existing one with the same name.
+
+        Parameters:
+            metric (Counter or Histogram): The metric to add.
+
+        Returns:
+            Counter or Histogram: The registered metric.
+        """
+        return self.metrics.setdefault(metric.name, metric)
+
+    def render(self):
+        """
+        Render every metric in the Prometheus text exposition format (version 0.0.4).
+
+        Returns:
+            str: The exposition text.
+        """
+        lines = []
+        for metric in self.metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    'qiskit_api_stage_seconds', 'Time spent in each stage of circuit handling.', ('stage',)))
+STAGE_ERRORS = REGISTRY.register(Counter(
+    'qiskit_api_stage_errors_total', 'Stages that ended with an exception.', ('stage',)))
+AUTHENTICATIONS = REGISTRY.register(Counter(
+    'qiskit_api_authentications_total', 'Authentication checks by outcome.', ('outcome',)))
+HTTP_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    'qiskit_api_http_request_seconds', 'Web request latency.', ('method', 'endpoint', 'status')))
+SIMULATIONS = REGISTRY.register(Counter(
+    'qiskit_api_simulations_total', 'Local simulations by the method that ran.', ('method',)))
+
+_tracer = None
+
+
+def set_tracer(tracer):
+    """
+    Install (or remove) a span-based tracing hook.
+
+    Parameters:
+        tracer (callable or None): Called as tracer(name, attributes) for every timed
+            stage and must return a context manager that spans it, e.g.
+            ``lambda name, attributes: otel_tracer.start_as_current_span(name, attributes=attributes)``.
+            None disables tracing.
+    """
+    global _tracer
+    _tracer = tracer
+
+
+class timed:
+    """
+    Time a block as a stage: observe its duration and, when tracing is on, span it.
+
+    Use as ``with timed('stage'):`` or as a decorator, ``@timed('stage')``, to time
+    every call of a function. A plain class rather than a generator-based context
+    manager keeps the untraced cost to two clock reads and one histogram update.
+
+    Parameters:
+        stage (str): Stage name, used as the "stage" label and the span name.
+        **attributes: Extra span attributes (ignored when tracing is off).
+    """
+
+    __slots__ = ('stage', 'attributes', '_start', '_span')
+
+    def __init__(self, stage, **attributes):
+        self.stage = stage
+        self.attributes = attributes
+
+    def __enter__(self):
+        tracer = _tracer
+        self._span = tracer(f"qiskit_api.{self.stage}", self.attributes) if tracer is not None else None
+        if self._span is not None:
+            self._span.__enter__()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        STAGE_SECONDS.observe(time.perf_counter() - self._start, self.stage)
+        if exc_type is not None:
+            STAGE_ERRORS.inc(self.stage)
+        if self._span is not None:
+            self._span.__exit__(exc_type, exc_value, traceback)
+        return False
+
+    def __call__(self, function):
+        stage, attributes = self.stage, self.attributes
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            # A fresh timer per call keeps concurrent calls apart
+            with timed(stage, **attributes):
+                return function(*args, **kwargs)
+        return wrapper
+
+
+def observe_stage(stage, seconds):
+    """
+    Record the duration of a stage that was measured elsewhere (e.g. reported by a backend).
+
+    Parameters:
+        stage (str): Stage name.
+        seconds (float): Duration in seconds.
+    """
+    STAGE_SECONDS.observe(seconds, stage)
@@ -0,0 +1,342 @@
+# Author: Jacob Thomas Redmond
+# MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Opt-in profiling of slow or sampled requests.
+
+The default "sampler" method records every tracked request with a background
+thread that samples its stack every few milliseconds, which costs little enough
+to leave on in production; the samples are only written out when the request
+turns out slow (or was picked by the sample rate). The "cprofile" method traces
+every function call instead and is meant for short diagnostic sessions.
+Profiles go to a bounded on-disk ring buffer.
+"""
+
+import cProfile
+import itertools
+import json
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+DEFAULT_CAPACITY = 50
+DEFAULT_INTERVAL = 0.005
+_MAX_STACK_DEPTH = 64
+_CPROFILE_ROWS = 100
+
+
+class ProfileStore:
+    """
+    Bounded on-disk ring buffer of profiles, one JSON file per profile.
+
+    Files are named by a zero-padded sequence number, so the oldest profile is
+    always first in name order and is deleted once capacity is exceeded.
+
+    Attributes:
+        directory (str): Directory holding the profile files.
+        capacity (int): Maximum number of profiles kept.
+    """
+
+    def __init__(self, directory, capacity=DEFAULT_CAPACITY):
+        self.directory = directory
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        existing = self._names()
+        self._sequence = itertools.count(int(existing[-1].split('.')[0]) + 1 if existing else 1)
+
+    def _names(self):
+        return sorted(name for name in os.listdir(self.directory) if name.endswith('.json') and name[0].isdigit())
+
+    def save(self, profile):
+        """
+        Write a profile and evict the oldest ones beyond capacity.
+
+        Parameters:
+            profile (dict): The profile document; its "id" is assigned here.
+
+        Returns:
+            str: The profile ID.
+        """
+        with self._lock:
+            profile_id = f"{next(self._sequence):012d}"
+            profile['id'] = profile_id
+            path = os.path.join(self.directory, profile_id + '.json')
+            with open(path + '.tmp', 'w') as file:
+                json.dump(profile, file)
+            # Readers never see a partially written profile
+            os.replace(path + '.tmp', path)
+            for name in self._names()[:-self.capacity or None] if self.capacity else ():
+                os.remove(os.path.join(self.directory, name))
+        return profile_id
+
+    def list(self):
+        """
+        Summarize the stored profiles, newest first.
+
+        Returns:
+            list: Each profile without its stack or stats data.
+        """
+        summaries = []
+        for name in reversed(self._names()):
+            profile = self.load(name[:-len('.json')])
+            if profile is not None:
+                profile.pop('stacks', None)
+                profile.pop('stats', None)
+                summaries.append(profile)
+        return summaries
+
+    def load(self, profile_id):
+        """
+        Read one profile.
+
+        Parameters:
+            profile_id (str): The profile ID.
+
+        Returns:
+            dict: The profile, or None if it does not exist (or was evicted).
+        """
+        if not profile_id.isdigit():
+            return None
+        try:
+            with open(os.path.join(self.directory, profile_id + '.json')) as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+
+
+def _collapse(frame):
+    # Root-to-leaf "file:function:line" frames joined with ';' (the flame graph collapsed format)
+    names = []
+    while frame is not None and len(names) < _MAX_STACK_DEPTH:
+        code = frame.f_code
+        names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}")
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+class _StackSampler:
+    # One daemon thread samples every tracked thread; it exits when nothing is tracked
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._tracked = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def track(self, thread_id):
+        stacks = Counter()
+        with self._lock:
+            self._tracked[thread_id] = stacks
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='qiskit-api-profiler', daemon=True)
+                self._thread.start()
+        return stacks
+
+    def untrack(self, thread_id):
+        with self._lock:
+            return self._tracked.pop(thread_id, Counter())
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._tracked:
+                    self._thread = None
+                    return
+                tracked = list(self._tracked.items())
+            frames = sys._current_frames()
+            for thread_id, stacks in tracked:
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    stacks[_collapse(frame)] += 1
+            time.sleep(self.interval)
+
+
+class RequestProfile:
+    """
+    Handle for one profiled request, returned by RequestProfiler.start.
+    """
+
+    __slots__ = ('label', 'attributes', 'start', 'thread_id', 'sampled', 'profiler')
+
+    def __init__(self, label, attributes, thread_id, sampled, profiler):
+        self.label = label
+        self.attributes = attributes
+        self.thread_id = thread_id
+        self.sampled = sampled
+        self.profiler = profiler
+        self.start = time.perf_counter()
+
+
+class RequestProfiler:
+    """
+    Captures profiles of requests that are slow or picked by a sample rate.
+
+    Attributes:
+        store (ProfileStore): Where captured profiles are written.
+        threshold (float or None): Requests taking at least this many seconds are kept.
+        sample_rate (float): Fraction of requests kept regardless of their latency.
+        method (str): "sampler" (stack sampling) or "cprofile" (deterministic tracing).
+    """
+
+    def __init__(self, directory, threshold=1.0, sample_rate=0.0, capacity=DEFAULT_CAPACITY, method='sampler',
+                 interval=DEFAULT_INTERVAL):
+        """
+        Initialize a RequestProfiler.
+
+        Parameters:
+            directory (str): Directory of the profile ring buffer.
+            threshold (float or None): Keep requests taking at least this many seconds (None keeps none by latency).
+            sample_rate (float): Fraction of requests to keep regardless of latency.
+            capacity (int): Maximum number of stored profiles.
+            method (str): "sampler" (default) or "cprofile".
+            interval (float): Stack sampling interval in seconds for the sampler method.
+        """
+        if method not in ('sampler', 'cprofile'):
+            raise ValueError(f"Unknown profiling method {method!r}; expected 'sampler' or 'cprofile'.")
+        self.store = ProfileStore(directory, capacity)
+        self.threshold = threshold
+        self.sample_rate = sample_rate
+        self.method = method
+        self._sampler = _StackSampler(interval) if method == 'sampler' else None
+
+    @classmethod
+    def from_environment(cls, environ=None):
+        """
+        Build a profiler from QISKIT_API_PROFILE_* environment variables.
+
+        Profiling is enabled by setting QISKIT_API_PROFILE_DIR; QISKIT_API_PROFILE_THRESHOLD,
+        QISKIT_API_PROFILE_SAMPLE_RATE, QISKIT_API_PROFILE_CAPACITY and QISKIT_API_PROFILE_METHOD
+        override the defaults.
+
+        Parameters:
+            environ (dict, optional): The environment to read (default is os.environ).
+
+        Returns:
+            RequestProfiler: The profiler, or None if profiling is not enabled.
+        """
+        environ = os.environ if environ is None else environ
+        directory = environ.get('QISKIT_API_PROFILE_DIR')
+        if not directory:
+            return None
+        return cls(
+            directory,
+            threshold=float(environ.get('QISKIT_API_PROFILE_THRESHOLD', 1.0)),
+            sample_rate=float(environ.get('QISKIT_API_PROFILE_SAMPLE_RATE', 0.0)),
+            capacity=int(environ.get('QISKIT_API_PROFILE_CAPACITY', DEFAULT_CAPACITY)),
+            method=environ.get('QISKIT_API_PROFILE_METHOD', 'sampler'),
+        )
+
+    def start(self, label, **attributes):
+        """
+        Start tracking a request on the current thread.
+
+        Parameters:
+            label (str): What is being profiled, e.g. the endpoint.
+            **attributes: Extra fields stored with the profile (method, user, ...).
+
+        Returns:
+            RequestProfile: Handle to pass to finish, or None if the request is not tracked.
+        """
+        sampled = self.sample_rate > 0 and random.random() < self.sample_rate
+        if self.threshold is None and not sampled:
+            return None
+        thread_id = threading.get_ident()
+        if self._sampler is not None:
+            profiler = self._sampler.track(thread_id)
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        return RequestProfile(label, attributes, thread_id, sampled, profiler)
+
+    def finish(self, handle, **attributes):
+        """
+        Stop tracking a request and store its profile if it was slow or sampled.
+
+        Parameters:
+            handle (RequestProfile): The handle returned by start (None is ignored).
+            **attributes: Extra fields known only at the end (status, ...).
+
+        Returns:
+            str: The stored profile's ID, or None if nothing was stored.
+        """
+        if handle is None:
+            return None
+        duration = time.perf_counter() - handle.start
+        if self._sampler is not None:
+            stacks = self._sampler.untrack(handle.thread_id)
+        else:
+            handle.profiler.disable()
+        slow = self.threshold is not None and duration >= self.threshold
+        if not slow and not handle.sampled:
+            return None
+
+        profile = dict(handle.attributes, **attributes)
+        profile.update({
+            'label': handle.label,
+            'duration': duration,
+            'timestamp': time.time(),
+            'reason': 'slow' if slow else 'sampled',
+            'method': self.method,
+        })
+        if self._sampler is not None:
+            profile['interval'] = self._sampler.interval
+            profile['samples'] = sum(stacks.values())
+            profile['stacks'] = dict(stacks.most_common())
+        else:
+            stats = pstats.Stats(handle.profiler)
+            rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:_CPROFILE_ROWS]
+            profile['stats'] = [
+                {'function': f"{os.path.basename(filename)}:{line}({name})", 'calls': calls,
+                 'total_time': total_time, 'cumulative_time': cumulative_time}
+                for (filename, line, name), (_, calls, total_time, cumulative_time, _) in rows
+            ]
+        return self.store.save(profile)
+
+    def profile(self, label, **attributes):
+        """
+        Context manager form of start/finish.
+
+        Parameters:
+            label (str): What is being profiled.
+            **attributes: Extra fields stored with the profile.
+        """
+        return _ProfileContext(self, label, attributes)
+
+
+class _ProfileContext:
+
+    def __init__(self, profiler, label, attributes):
+        self.profiler = profiler
+        self.label = label
+        self.attributes = attributes
+        self.handle = None
+
+    def __enter__(self):
+        self.handle = self.profiler.start(self.label, **self.attributes)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.profiler.finish(self.handle, error=exc_type.__name__ if exc_type is not None else None)
+        return False
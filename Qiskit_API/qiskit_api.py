@@ -19,12 +19,12 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from qiskit import QuantumCircuit, transpile, assemble, Aer, IBMQ
-from qiskit.visualization import plot_histogram
-from qiskit.providers.ibmq import least_busy
-from qiskit.tools.monitor import job_monitor
-from qiskit.providers.aer import noise
+import time
+
+from qiskit import QuantumCircuit, transpile, assemble
 from .authentication import authenticate_user
+from .execute.simulation import SAMPLING_SIMULATORS, SimulationSelector
+from .metrics import observe_stage, timed
 from .utilities import handle_error
 
 def create_quantum_circuit(qubits, name="QuantumCircuit", parameterized=False):
@@ -48,7 +48,9 @@ def create_quantum_circuit(qubits, name="QuantumCircuit", parameterized=False):
         pass
     return circuit
 
-def run_quantum_circuit(circuit, backend_name='qasm_simulator', shots=1024, token=None, async_mode=False):
+def run_quantum_circuit(circuit, backend_name='qasm_simulator', shots=1024, token=None, async_mode=False, monitor=True,
+                        cache=None, transpiler=None, pipeline=None, noise_model=None, mimic_backend=None,
+                        simulation='auto', memory=False, mitigation=None, mimic_token=None):
     """
     Executes the given quantum circuit on the specified backend. Can run in asynchronous mode.
 
@@ -58,12 +60,61 @@ def run_quantum_circuit(circuit, backend_name='qasm_simulator', shots=1024, toke
         shots (int): The number of times to run the circuit.
         token (str): IBMQ token for accessing IBMQ backends.
         async_mode (bool): Run in asynchronous mode.
+        monitor (bool): Print job progress while waiting (disable when stdout carries results).
+        cache (FingerprintIndex, optional): Result cache shared across calls. Synchronous runs on
+            the named backend reuse the counts of an equivalent circuit (up to qubit relabeling
+            and commuting gate order) run with the same backend and shots.
+        transpiler (IncrementalTranspiler, optional): Transpiler that keeps the previous result,
+            so re-running a slightly edited circuit only transpiles the changed suffix.
+        pipeline (OptimizationPipeline, optional): Optimization stage used instead of a default
+            transpile; its report of the run is left in pipeline.last_report.
+        noise_model (NoiseModel, optional): Noise to simulate on the local backend.
+        mimic_backend (Backend or str, optional): Device whose current calibration the local
+            simulation mimics: a backend, a fake backend name such as "fake_manila", a
+            calibration snapshot file, or a live device name given mimic_token (see
+            execute.noise). Its noise model is built once per
+            calibration and cached for later jobs, and circuits are routed for its coupling map.
+        simulation (str, SimulationSelector or None): Simulation method for local Aer runs:
+            "auto" picks stabilizer, matrix product state, density matrix or statevector
+            and a thread count from the circuit (see execute.simulation), a method name
+            forces that method, a SimulationSelector is used as given and keeps the plan
+            that ran in selector.last_plan, and None leaves the choice to Aer.
+        memory (bool): Keep every shot's outcome and return a ShotMemory of packed per-shot
+            results instead of counts (see execute.memory; use stream_shots for more shots
+            than fit in one run's memory).
+        mitigation (ErrorMitigation, str or list, optional): Error mitigation stages, "readout"
+            and/or "zne", or an ErrorMitigation that keeps its report in mitigation.last_report
+            (see execute.mitigation). Calibration and folded circuits are submitted in the same
+            job, and the mitigated counts are returned as floats. Synchronous runs only.
+        mimic_token (str, optional): IBMQ token used only to read the calibration of a live
+            device named by mimic_backend; the simulation itself stays local.
 
     Returns:
-        dict or Job: The result counts or a Job object for the execution.
+        dict, ShotMemory or Job: The result counts, the per-shot results, or a Job object for the execution.
     """
+    noisy = noise_model is not None or mimic_backend is not None
+    if noisy and token:
+        raise ValueError("noise_model and mimic_backend only apply to local simulation, not IBMQ runs")
+    if mitigation is not None and (async_mode or memory):
+        raise ValueError("Error mitigation needs a synchronous run that returns counts")
+
+    fingerprint = None
+    if cache is not None and not token and not async_mode and not noisy and not memory and mitigation is None:
+        from .circuits.fingerprint import circuit_fingerprint, remap_counts
+
+        fingerprint = circuit_fingerprint(circuit)
+        entry = cache.lookup(circuit, fingerprint, (backend_name, shots))
+        if entry is not None:
+            # Keyed by this circuit's registers, as get_counts would return them
+            return remap_counts(entry[1], entry[0].clbit_map, fingerprint.clbit_map,
+                                [register.size for register in circuit.cregs])
+
     try:
+        # Providers, Aer and the job monitor are imported on first use to keep startup fast
         if token:
+            from qiskit import IBMQ
+            from qiskit.providers.ibmq import least_busy
+
             # Authenticate the user with the provided token
             authenticate_user(token)
             IBMQ.load_account()
@@ -71,46 +122,135 @@ def run_quantum_circuit(circuit, backend_name='qasm_simulator', shots=1024, toke
             backend = least_busy(provider.backends(filters=lambda x: x.configuration().n_qubits >= circuit.num_qubits and
                                                 not x.configuration().simulator and x.status().operational==True))
         else:
+            from qiskit import Aer
+
             backend = Aer.get_backend(backend_name)
 
-        # Transpile the circuit for the backend
-        transpiled_circuit = transpile(circuit, backend)
-        qobj = assemble(transpiled_circuit, backend, shots=shots)
+        run_options = {}
+        coupling_map = None
+        if mimic_backend is not None and noise_model is None:
+            from .execute.noise import NOISE_MODELS
+
+            with timed('noise_model'):
+                noise_model, coupling_map = NOISE_MODELS.get_device(mimic_backend, mimic_token)
+        if noise_model is not None:
+            run_options['noise_model'] = noise_model
+
+        # Transpile the circuit for the backend; gates outside a noise model's basis would run
+        # noiselessly, and so would two-qubit gates on pairs the mimicked device does not couple
+        basis_options = {} if noise_model is None else {'basis_gates': noise_model.basis_gates}
+        if coupling_map is not None:
+            basis_options['coupling_map'] = coupling_map
+        with timed('transpile'):
+            if transpiler is not None:
+                transpiled_circuit = transpiler.transpile(circuit, backend, **basis_options)
+            elif pipeline is not None:
+                transpiled_circuit = pipeline.run(circuit, backend, **basis_options)
+            else:
+                transpiled_circuit = transpile(circuit, backend, **basis_options)
+        selector = None
+        if simulation is not None and not token and backend_name in SAMPLING_SIMULATORS:
+            selector = simulation if isinstance(simulation, SimulationSelector) else \
+                SimulationSelector(None if simulation == 'auto' else simulation)
+            with timed('plan_simulation'):
+                run_options.update(selector.run_options(selector.select(transpiled_circuit, noise_model)))
+        experiments = [transpiled_circuit]
+        if mitigation is not None:
+            from .execute.mitigation import ErrorMitigation
+
+            if not isinstance(mitigation, ErrorMitigation):
+                mitigation = ErrorMitigation.from_stages(mitigation)
+            with timed('mitigation_prepare'):
+                plan = mitigation.prepare(transpiled_circuit, backend, noise_model)
+            experiments.extend(plan.circuits)
+        with timed('assemble'):
+            qobj = assemble(experiments, backend, shots=shots, memory=memory)
 
         if async_mode:
             # Return the job for asynchronous handling
-            return backend.run(qobj)
+            with timed('submit'):
+                return backend.run(qobj, **run_options)
         else:
             # Execute the circuit synchronously
-            job = backend.run(qobj)
-            job_monitor(job)  # Optional: monitor the job's execution
-            results = job.result().get_counts(circuit)
+            with timed('submit'):
+                job = backend.run(qobj, **run_options)
+            wait_start = time.perf_counter()
+            with timed('wait'):
+                if monitor:
+                    from qiskit.tools.monitor import job_monitor
+
+                    job_monitor(job)  # Optional: monitor the job's execution
+                result = job.result()
+            # The backend reports how long it executed; the rest of the wait was queueing
+            time_taken = getattr(result, 'time_taken', None)
+            if time_taken is not None:
+                observe_stage('execute', time_taken)
+                observe_stage('queue', max(0.0, time.perf_counter() - wait_start - time_taken))
+            if selector is not None:
+                selector.record(result)
+            if memory:
+                from .execute.memory import ShotMemory
+
+                return ShotMemory(result)
+            if mitigation is not None:
+                with timed('mitigation'):
+                    return mitigation.apply(result, plan, noise_model)
+            results = result.get_counts(circuit)
+            if fingerprint is not None:
+                cache.add(circuit, results, fingerprint, (backend_name, shots))
             return results
     except Exception as e:
         handle_error(f"Error during quantum circuit execution: {e}", raise_exception=True)
 
-def visualize_circuit(circuit):
+def visualize_circuit(circuit, layers=None, qubits=None):
     """
     Generates a visualization for the provided quantum circuit.
+    Use render_circuit for cached PNG/SVG/text images rendered in worker processes.
+
+    Very deep or wide circuits can be drawn a window at a time; see
+    visualizations.circuit.WindowedCircuit to scroll through tiles of one circuit.
 
     Parameters:
         circuit (QuantumCircuit): The quantum circuit to visualize.
+        layers (tuple): Draw only layers [start, stop) of the circuit.
+        qubits (tuple): Draw only qubits [start, stop) of the circuit.
 
     Returns:
         Figure: A matplotlib figure representing the circuit.
     """
+    if layers is not None or qubits is not None:
+        from .visualizations.circuit import WindowedCircuit
+
+        layer_start, layer_stop = layers or (0, None)
+        qubit_start, qubit_stop = qubits or (0, None)
+        circuit = WindowedCircuit(circuit).window_circuit(layer_start, layer_stop, qubit_start, qubit_stop)
     return circuit.draw(output='mpl')
 
-def visualize_results(results):
+def visualize_results(results, mode=None, k=None, qubits=None):
     """
     Generates a histogram visualization for the results of a quantum circuit execution.
+    Use render_histogram for cached PNG/SVG/text images rendered in worker processes.
+
+    Results with more outcomes than the histogram can show are aggregated first, so
+    plotting time stays bounded however many distinct outcomes were measured.
 
     Parameters:
         results (dict): The result counts from the circuit execution.
+        mode (str): Aggregation mode: "top_k", "hamming" or "marginal" (default is
+            "top_k" when there are too many outcomes, otherwise none).
+        k (int): Maximum number of bars (default is MAX_HISTOGRAM_BARS).
+        qubits (list): Qubits kept by the "marginal" mode.
 
     Returns:
         Figure: A matplotlib figure representing the histogram of results.
     """
+    from qiskit.visualization import plot_histogram
+
+    from .visualizations.results import MAX_HISTOGRAM_BARS, aggregate_counts
+
+    k = k or MAX_HISTOGRAM_BARS
+    if mode is not None or len(results) > k:
+        results = aggregate_counts(results, mode or 'top_k', k, qubits)
     return plot_histogram(results)
 
-# Additional functions for error mitigation, backend recommendations, etc., can be implemented here.
+# Additional functions for backend recommendations, etc., can be implemented here.
@@ -0,0 +1,237 @@
+# Author: Jacob Thomas Redmond
+# MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Centralized, non-blocking logging for the Qiskit API.
+
+Loggers only put records on an in-memory queue; a single background thread
+formats them and writes them to the configured files and streams. Call
+setup_logging once at process start (calling it again reconfigures the same
+pipeline instead of adding handlers).
+"""
+
+import atexit
+import copy
+import itertools
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+from datetime import datetime, timezone
+
+DEFAULT_QUEUE_SIZE = 10000
+
+PLAIN_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# Attributes every LogRecord has; anything else was passed through `extra` and is emitted as a field
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+_lock = threading.Lock()
+_queue_handler = None
+_listener = None
+# (filename or stream id, logger name) -> output handler, so repeated setup reuses them
+_outputs = {}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats records as one JSON object per line.
+
+    The object holds the timestamp, level, logger name and message, any fields
+    passed with ``extra=``, and the formatted exception if there is one.
+    """
+
+    def format(self, record):
+        document = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                document[key] = value
+        if record.exc_text:
+            document['exception'] = record.exc_text
+        elif record.exc_info:
+            document['exception'] = self.formatException(record.exc_info)
+        return json.dumps(document, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps only a fraction of high-frequency records.
+
+    Rates are looked up by the record's ``event`` field (passed with ``extra=``),
+    then by logger name. Sampling is deterministic (every n-th record is kept) and
+    never applies to warnings or errors. Kept records carry the rate as ``sample_rate``.
+
+    Attributes:
+        sample_rates (dict): Event or logger name -> fraction of records to keep.
+    """
+
+    def __init__(self, sample_rates=None):
+        super().__init__()
+        self.sample_rates = {}
+        self._counters = {}
+        self.set_rates(sample_rates or {})
+
+    def set_rates(self, sample_rates):
+        """
+        Replace the sampling rates.
+
+        Parameters:
+            sample_rates (dict): Event or logger name -> fraction in (0, 1] of records to keep.
+        """
+        for key, rate in sample_rates.items():
+            if not 0 < rate <= 1:
+                raise ValueError(f"Sample rate for {key!r} must be in (0, 1], got {rate}")
+        self.sample_rates = dict(sample_rates)
+        self._counters = {key: (itertools.count(), max(1, round(1 / rate))) for key, rate in sample_rates.items()}
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or not self._counters:
+            return True
+        key = getattr(record, 'event', None)
+        if key not in self._counters:
+            key = record.name
+            if key not in self._counters:
+                return True
+        counter, interval = self._counters[key]
+        if next(counter) % interval:
+            return False
+        record.sample_rate = self.sample_rates[key]
+        return True
+
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that never blocks the logging thread.
+
+    Records are only reduced to picklable, thread-independent form before being
+    queued; formatting happens on the writer thread. When the queue is full the
+    record is dropped and counted instead of waiting.
+
+    Attributes:
+        dropped (int): Number of records dropped because the queue was full.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _output_handler(filename, stream, json_format, logger_name):
+    key = (os.path.abspath(filename) if filename else id(stream), logger_name)
+    handler = _outputs.get(key)
+    if handler is None:
+        handler = logging.FileHandler(filename) if filename else logging.StreamHandler(stream)
+        if logger_name:
+            handler.addFilter(logging.Filter(logger_name))
+        _outputs[key] = handler
+    handler.setFormatter(JsonFormatter() if json_format else logging.Formatter(PLAIN_FORMAT))
+    return handler
+
+
+def setup_logging(filename=None, stream=None, level=logging.INFO, json_format=True, sample_rates=None,
+                  logger_name=None, queue_size=DEFAULT_QUEUE_SIZE):
+    """
+    Install (or reconfigure) the process-wide logging pipeline.
+
+    The root logger gets a single StructuredQueueHandler; a QueueListener thread
+    writes the queued records to every configured output. Calling this again with
+    another filename or stream adds that output; calling it with the same one only
+    updates its format, so handlers never pile up.
+
+    Parameters:
+        filename (str, optional): Log file to write to.
+        stream (file, optional): Stream to write to (e.g. sys.stderr).
+        level (int): Root logger level.
+        json_format (bool): Write JSON lines (default) instead of plain text.
+        sample_rates (dict, optional): Event or logger name -> fraction of records to keep
+            (see SamplingFilter); replaces the current rates when given.
+        logger_name (str, optional): Only send records of this logger (and its children)
+            to the given file or stream.
+        queue_size (int): Records buffered before new ones are dropped (first call only).
+
+    Returns:
+        StructuredQueueHandler: The root queue handler.
+    """
+    global _queue_handler, _listener
+
+    with _lock:
+        if _queue_handler is None:
+            log_queue = queue.Queue(queue_size)
+            _queue_handler = StructuredQueueHandler(log_queue)
+            _queue_handler.addFilter(SamplingFilter())
+            _listener = logging.handlers.QueueListener(log_queue, respect_handler_level=True)
+            _listener.start()
+            atexit.register(shutdown_logging)
+        root = logging.getLogger()
+        if _queue_handler not in root.handlers:
+            root.addHandler(_queue_handler)
+        if logger_name is None:
+            root.setLevel(level)
+        else:
+            logging.getLogger(logger_name).setLevel(level)
+        if sample_rates is not None:
+            _queue_handler.filters[0].set_rates(sample_rates)
+        if filename or stream:
+            handler = _output_handler(filename, stream, json_format, logger_name)
+            if handler not in _listener.handlers:
+                # The listener reads this tuple for every record, so swapping it is safe while running
+                _listener.handlers = _listener.handlers + (handler,)
+        return _queue_handler
+
+
+def shutdown_logging():
+    """
+    Flush the queued records, stop the writer thread and close the outputs.
+    """
+    global _queue_handler, _listener
+
+    with _lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        logging.getLogger().removeHandler(_queue_handler)
+        for handler in _outputs.values():
+            handler.close()
+        _outputs.clear()
+        _queue_handler = None
+        _listener = None
@@ -0,0 +1,140 @@
+# Author: Jacob Thomas Redmond
+# MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import pytest
+
+from Qiskit_API.execute import execute
+from Qiskit_API.execute.checkpoint import CheckpointStore, request_hash, resume_batch
+
+
+@pytest.fixture
+def store():
+    with CheckpointStore() as store:
+        yield store
+
+
+@pytest.fixture
+def source(tmp_path):
+    for index in range(4):
+        (tmp_path / f"circuit{index}.qasm").write_text(f"// circuit {index}\n")
+    return tmp_path
+
+
+@pytest.fixture
+def runs(monkeypatch):
+    # Stands in for execute_batch: records every circuit it runs and fails on the names in crash_on
+    state = {'ran': [], 'crash_on': set(), 'options': []}
+
+    def execute_batch(records, token=None, mimic_token=None, **options):
+        state['options'].append(options)
+        for index, record in enumerate(records):
+            if record['name'] in state['crash_on']:
+                raise RuntimeError(f"worker died on {record['name']}")
+            state['ran'].append(record['name'])
+            yield {'name': record['name'], 'status': 'ok', 'counts': {'0': 1}, 'index': index}
+
+    monkeypatch.setattr(execute, 'execute_batch', execute_batch)
+    return state
+
+
+def test_resume_runs_only_the_remaining_circuits(store, source, runs):
+    batch_id = store.open_batch(str(source), {'shots': 100, 'token': 'secret'})
+    runs['crash_on'] = {'circuit2'}
+    with pytest.raises(RuntimeError):
+        list(resume_batch(store, batch_id))
+    assert runs['ran'] == ['circuit0', 'circuit1']
+    batch = store.get_batch(batch_id)
+    assert (batch['status'], batch['finished'], batch['owner']) == ('interrupted', 2, None)
+
+    runs['crash_on'] = set()
+    outcomes = list(resume_batch(store, batch_id))
+    assert runs['ran'] == ['circuit0', 'circuit1', 'circuit2', 'circuit3']
+    assert [(outcome['name'], outcome['index']) for outcome in outcomes] == [('circuit2', 2), ('circuit3', 3)]
+    # Options are stored without the token and passed again on resume
+    assert runs['options'] == [{'shots': 100}, {'shots': 100}]
+    assert store.get_batch(batch_id)['status'] == 'finished'
+
+    replayed = list(resume_batch(store, batch_id, include_completed=True))
+    assert [outcome['index'] for outcome in replayed] == [0, 1, 2, 3]
+    assert len(runs['ran']) == 4
+
+
+def test_resume_detects_a_changed_source(store, source, runs):
+    batch_id = store.open_batch(str(source), {})
+    runs['crash_on'] = {'circuit3'}
+    with pytest.raises(RuntimeError):
+        list(resume_batch(store, batch_id))
+    (source / 'circuit0.qasm').unlink()
+    with pytest.raises(ValueError, match='changed'):
+        list(resume_batch(store, batch_id))
+
+
+def test_batch_idempotency_keys(store, source):
+    batch_id = store.open_batch(str(source), {'shots': 100}, idempotency_key='nightly')
+    assert store.open_batch(str(source), {'shots': 100}, idempotency_key='nightly') == batch_id
+    with pytest.raises(ValueError):
+        store.open_batch(str(source), {'shots': 200}, idempotency_key='nightly')
+    with pytest.raises(ValueError):
+        store.open_batch('-', {})
+
+
+def test_batches_have_one_owner(source):
+    with CheckpointStore(lease_seconds=60) as store:
+        batch_id = store.open_batch(str(source), {})
+        owner = store.claim(batch_id)
+        with pytest.raises(ValueError, match='being run'):
+            store.claim(batch_id)
+        assert store.heartbeat(batch_id, owner)
+
+        store.lease_seconds = -1
+        successor = store.claim(batch_id)
+        assert not store.heartbeat(batch_id, owner)
+        with pytest.raises(ValueError, match='taken over'):
+            store.record(batch_id, 0, {'name': 'circuit0', 'status': 'ok'}, owner, 'digest')
+        store.record(batch_id, 0, {'name': 'circuit0', 'status': 'ok'}, successor, 'digest')
+        assert store.completed(batch_id) == {0: 'digest'}
+
+
+def test_idempotent_request_replay(store):
+    digest = request_hash({'circuit': {'qasm': 'OPENQASM 2.0;'}})
+    assert store.begin_request('key', digest) is None
+    assert store.begin_request('key', digest) == {'status': 'running'}
+    with pytest.raises(ValueError):
+        store.begin_request('key', request_hash({'circuit': {}}))
+
+    store.finish_request('key', 200, {'0': 1024})
+    assert store.begin_request('key', digest) == {'status': 'done', 'status_code': 200, 'response': {'0': 1024}}
+
+
+def test_failed_requests_can_be_retried(store):
+    assert store.begin_request('key', 'digest') is None
+    store.release_request('key')
+    assert store.begin_request('key', 'digest') is None
+
+
+def test_expired_responses_are_not_replayed():
+    with CheckpointStore(response_ttl=-1) as store:
+        assert store.begin_request('key', 'digest') is None
+        store.finish_request('key', 200, {'0': 1})
+        assert store.begin_request('key', 'digest') is None
+
+
+def test_request_hash_ignores_key_order():
+    assert request_hash({'a': 1, 'b': [1, 2]}) == request_hash({'b': [1, 2], 'a': 1})
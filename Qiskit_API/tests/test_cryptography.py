@@ -18,11 +18,67 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-# TODO: Implement test_cryptography.py
-def placeholder_function():
-    # TODO: Replace with actual code
-    pass
-
-# TODO: Content to be added
-# TODO: Content to be added
-# TODO: Content to be added
+import pytest
+
+pytest.importorskip('Crypto')
+
+from Crypto.PublicKey import RSA
+
+from Qiskit_API.cryptography import AdvancedCryptography, open_envelope, seal_envelope
+
+
+@pytest.fixture(scope='module')
+def keypair():
+    key = RSA.generate(2048)
+    return key.export_key(), key.publickey().export_key()
+
+
+@pytest.fixture
+def crypto(tmp_path):
+    return AdvancedCryptography({'rsa_key_size': 2048, 'log_file': str(tmp_path / 'crypto.log'),
+                                 'envelope_workers': 2})
+
+
+def test_envelope_round_trip(keypair):
+    private_key, public_key = keypair
+    payload = b'\x00measurement results\xff' * 1000
+    envelope = seal_envelope(payload, public_key, b'job-1')
+    assert open_envelope(envelope, private_key, b'job-1') == payload
+    # Parsed keys and their encoded form share the same cache entry
+    assert open_envelope(envelope, RSA.import_key(private_key), b'job-1') == payload
+    # Every envelope gets its own data key and nonce
+    assert seal_envelope(payload, public_key, b'job-1') != envelope
+
+
+def test_envelope_authentication(keypair):
+    private_key, public_key = keypair
+    envelope = seal_envelope(b'payload', public_key, b'job-1')
+    with pytest.raises(ValueError):
+        open_envelope(envelope, private_key, b'job-2')
+    tampered = bytearray(envelope)
+    tampered[-1] ^= 1
+    with pytest.raises(ValueError):
+        open_envelope(bytes(tampered), private_key, b'job-1')
+    with pytest.raises(ValueError):
+        open_envelope(envelope[:10], private_key, b'job-1')
+    with pytest.raises(ValueError):
+        open_envelope(b'XXXXX' + envelope[5:], private_key, b'job-1')
+
+
+@pytest.mark.parametrize('use_processes', [False, True])
+def test_batch_round_trip(crypto, keypair, use_processes):
+    private_key, public_key = keypair
+    payloads = [bytes([index]) * index for index in range(20)]
+    associated_data = [f'circuit_{index}'.encode() for index in range(20)]
+    envelopes = crypto.encrypt_envelopes(payloads, public_key, associated_data)
+    assert crypto.decrypt_envelopes(envelopes, private_key, associated_data, use_processes=use_processes) == payloads
+    with pytest.raises(ValueError):
+        crypto.decrypt_envelopes(envelopes, private_key, associated_data[:-1], use_processes=use_processes)
+
+
+def test_aes_and_rsa_round_trip(crypto, keypair):
+    private_key, public_key = keypair
+    key = crypto.generate_symmetric_key('password', salt=b'0' * 16)
+    assert key == crypto.generate_symmetric_key('password', salt=b'0' * 16)
+    assert crypto.decrypt_with_aes(crypto.encrypt_with_aes(b'data', key), key) == b'data'
+    assert crypto.decrypt_with_rsa(crypto.encrypt_with_rsa(b'data key', public_key), private_key) == b'data key'
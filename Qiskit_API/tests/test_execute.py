@@ -0,0 +1,53 @@
+# Author: Jacob Thomas Redmond
+# MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import io
+
+import pytest
+
+from Qiskit_API.execute.execute import iter_circuit_records, load_circuit
+
+
+def test_directory_records(tmp_path):
+    (tmp_path / 'b.qasm').write_text('OPENQASM 2.0;')
+    (tmp_path / 'a.json').write_text('{}')
+    (tmp_path / 'notes.txt').write_text('')
+    assert list(iter_circuit_records(str(tmp_path))) == [
+        {'name': 'a', 'path': str(tmp_path / 'a.json')},
+        {'name': 'b', 'path': str(tmp_path / 'b.qasm')},
+    ]
+
+
+def test_malformed_jsonl_lines_become_error_records(monkeypatch):
+    monkeypatch.setattr('sys.stdin', io.StringIO('{"name": "bell", "qasm": "OPENQASM 2.0;"}\n'
+                                                 '{"qasm": \n'
+                                                 '\n'
+                                                 '[1, 2]\n'
+                                                 '{"qasm": "OPENQASM 2.0;"}\n'))
+    records = list(iter_circuit_records('-'))
+    assert [record['name'] for record in records] == ['bell', 'circuit_2', 'circuit_4', 'circuit_5']
+    assert records[1]['error'].startswith('Line 2 is not valid JSON')
+    assert records[2]['error'] == 'Line 4 is not a JSON object'
+    assert 'error' not in records[3]
+
+
+def test_load_circuit_raises_for_error_records():
+    with pytest.raises(ValueError, match='not valid JSON'):
+        load_circuit({'name': 'circuit_2', 'error': 'Line 2 is not valid JSON'})
@@ -0,0 +1,129 @@
+# Author: Jacob Thomas Redmond
+# MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from types import SimpleNamespace
+
+from Qiskit_API.circuits.fingerprint import FingerprintIndex, circuit_fingerprint, dedupe_report, remap_counts
+
+
+def _circuit(num_qubits, gates, num_clbits=0):
+    # Stand-in exposing the parts of QuantumCircuit the fingerprint reads; gates are
+    # (name, qubits[, params[, clbits]]) tuples
+    qubits = [object() for _ in range(num_qubits)]
+    clbits = [object() for _ in range(num_clbits)]
+    data = []
+    for gate in gates:
+        name, qargs = gate[0], gate[1]
+        params = gate[2] if len(gate) > 2 else ()
+        cargs = gate[3] if len(gate) > 3 else ()
+        data.append(SimpleNamespace(operation=SimpleNamespace(name=name, params=list(params), condition=None),
+                                    qubits=[qubits[index] for index in qargs],
+                                    clbits=[clbits[index] for index in cargs]))
+    return SimpleNamespace(qubits=qubits, clbits=clbits, data=data, name='circuit')
+
+
+def test_relabeled_circuits_share_a_digest():
+    first = circuit_fingerprint(_circuit(2, [('h', [0]), ('cx', [0, 1])]))
+    second = circuit_fingerprint(_circuit(2, [('h', [1]), ('cx', [1, 0])]))
+    assert first.digest == second.digest
+    assert first.qubit_map == (0, 1)
+    assert second.qubit_map == (1, 0)
+
+
+def test_commuting_gates_share_a_digest():
+    first = circuit_fingerprint(_circuit(2, [('rz', [0], [0.5]), ('cz', [0, 1])]))
+    second = circuit_fingerprint(_circuit(2, [('cz', [0, 1]), ('rz', [0], [0.5])]))
+    assert first == second
+
+
+def test_non_commuting_gates_differ():
+    first = circuit_fingerprint(_circuit(1, [('h', [0]), ('x', [0])]))
+    second = circuit_fingerprint(_circuit(1, [('x', [0]), ('h', [0])]))
+    assert first.digest != second.digest
+
+
+def test_parameters_differ():
+    first = circuit_fingerprint(_circuit(1, [('rz', [0], [0.1])]))
+    second = circuit_fingerprint(_circuit(1, [('rz', [0], [0.2])]))
+    assert first.digest != second.digest
+
+
+def test_symmetric_gate_ignores_operand_order():
+    first = circuit_fingerprint(_circuit(2, [('h', [0]), ('cz', [0, 1])]))
+    second = circuit_fingerprint(_circuit(2, [('h', [0]), ('cz', [1, 0])]))
+    assert first == second
+
+
+def test_controlled_rotation_keeps_operand_order():
+    # The control of a controlled rotation is not interchangeable with its target
+    first = circuit_fingerprint(_circuit(2, [('h', [0]), ('crz', [0, 1], [0.3])]))
+    second = circuit_fingerprint(_circuit(2, [('h', [0]), ('crz', [1, 0], [0.3])]))
+    assert first.digest != second.digest
+
+    first = circuit_fingerprint(_circuit(2, [('crz', [0, 1], [0.3])]))
+    second = circuit_fingerprint(_circuit(2, [('crz', [1, 0], [0.3])]))
+    assert first.qubit_map != second.qubit_map
+
+
+def test_remap_counts_between_equivalent_circuits():
+    source = _circuit(2, [('x', [0]), ('measure', [0], (), [0]), ('measure', [1], (), [1])], num_clbits=2)
+    target = _circuit(2, [('x', [0]), ('measure', [0], (), [1]), ('measure', [1], (), [0])], num_clbits=2)
+    source_fingerprint = circuit_fingerprint(source)
+    target_fingerprint = circuit_fingerprint(target)
+    assert source_fingerprint.digest == target_fingerprint.digest
+    remapped = remap_counts({'0 1': 7, '1 1': 3}, source_fingerprint.clbit_map, target_fingerprint.clbit_map)
+    assert remapped == {'10': 7, '11': 3}
+
+
+def test_fingerprint_index_and_dedupe_report():
+    circuits = [
+        _circuit(2, [('h', [0]), ('cx', [0, 1])]),
+        _circuit(2, [('h', [1]), ('cx', [1, 0])]),
+        _circuit(2, [('h', [0]), ('cx', [1, 0])]),
+    ]
+    index = FingerprintIndex()
+    index.add(circuits[0], 'value')
+    assert index.lookup(circuits[1])[1] == 'value'
+    assert index.lookup(circuits[2]) is None
+    assert (index.hits, index.misses) == (1, 1)
+
+    report = dedupe_report(circuits, names=['a', 'b', 'c'])
+    assert (report['total'], report['unique'], report['duplicates']) == (3, 2, 1)
+    assert report['groups'] == [{'fingerprint': circuit_fingerprint(circuits[0]).digest, 'count': 2,
+                                 'names': ['a', 'b']}]
+
+
+def test_remap_counts_uses_one_key_format():
+    # Exact and relabeled hits both come back keyed by the target's registers
+    assert remap_counts({'0 1': 7}, (0, 1), (0, 1)) == {'01': 7}
+    assert remap_counts({'01': 7}, (0, 1), (0, 1), register_sizes=[1, 1]) == {'0 1': 7}
+    assert remap_counts({'0 1': 7}, (0, 1), (1, 0), register_sizes=[1, 1]) == {'1 0': 7}
+    assert remap_counts({'011': 2}, (0, 1, 2), (0, 1, 2), register_sizes=[2, 1]) == {'0 11': 2}
+
+
+def test_fingerprint_index_context():
+    circuit = _circuit(1, [('h', [0])])
+    index = FingerprintIndex()
+    index.add(circuit, 'aer', context=('aer_simulator', 1024))
+    assert index.lookup(circuit, context=('aer_simulator', 1024))[1] == 'aer'
+    assert index.lookup(circuit, context=('qasm_simulator', 1024)) is None
+    assert index.lookup(circuit, context=('aer_simulator', 2048)) is None
+    index.add(circuit, 'qasm', context=('qasm_simulator', 1024))
+    assert len(index) == 2
@@ -0,0 +1,159 @@
+# Author: Jacob Thomas Redmond
+# MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from Qiskit_API.execute import mitigation
+from Qiskit_API.execute.mitigation import (ErrorMitigation, calibration_matrices, correct_readout,
+                                           extrapolate_counts, fold_circuit)
+
+# Clbit 0 reads 1 for 10% of |0> and 0 for 20% of |1>; clbit 1 reads 1 for 5% of |0> and 0 for 15% of |1>
+MATRICES = np.array([[[0.9, 0.2], [0.1, 0.8]], [[0.95, 0.15], [0.05, 0.85]]])
+
+
+def _noisy(probabilities, matrices):
+    # Apply per-clbit readout matrices to a distribution over bitstrings (clbit 0 rightmost)
+    num_clbits = len(matrices)
+    tensor = np.zeros(1 << num_clbits)
+    for label, probability in probabilities.items():
+        tensor[int(label, 2)] = probability
+    tensor = tensor.reshape((2,) * num_clbits)
+    for clbit in range(num_clbits):
+        axis = num_clbits - 1 - clbit
+        tensor = np.moveaxis(np.tensordot(matrices[clbit], tensor, axes=([1], [axis])), 0, axis)
+    return {format(outcome, f"0{num_clbits}b"): value for outcome, value in enumerate(tensor.reshape(-1))}
+
+
+def test_calibration_matrices():
+    counts_zero = {'00': 855, '01': 95, '10': 45, '11': 5}
+    counts_one = {'11': 680, '10': 170, '01': 120, '00': 30}
+    matrices = calibration_matrices(counts_zero, counts_one, 2)
+    np.testing.assert_allclose(matrices, MATRICES)
+
+
+def test_calibration_matrices_ignore_register_spaces():
+    matrices = calibration_matrices({'0 0': 90, '0 1': 10}, {'1 1': 80, '1 0': 20}, 2)
+    np.testing.assert_allclose(matrices[0], [[0.9, 0.2], [0.1, 0.8]])
+    np.testing.assert_allclose(matrices[1], np.eye(2))
+
+
+def test_correct_readout_dense():
+    ideal = {'00': 0.5, '11': 0.5}
+    noisy = {label: 1000 * value for label, value in _noisy(ideal, MATRICES).items()}
+    corrected = correct_readout(noisy, MATRICES)
+    assert set(corrected) == {'00', '11'}
+    assert corrected['00'] == pytest.approx(500)
+    assert corrected['11'] == pytest.approx(500)
+
+
+def test_correct_readout_keeps_register_spaces():
+    noisy = {f"{label[0]} {label[1]}": 1000 * value
+             for label, value in _noisy({'01': 1.0}, MATRICES).items()}
+    corrected = correct_readout(noisy, MATRICES)
+    assert corrected == pytest.approx({'0 1': 1000})
+
+
+def test_correct_readout_subspace(monkeypatch):
+    monkeypatch.setattr(mitigation, 'DENSE_READOUT_CLBITS', 1)
+    ideal = {'00': 0.25, '01': 0.25, '10': 0.4, '11': 0.1}
+    noisy = {label: 1000 * value for label, value in _noisy(ideal, MATRICES).items()}
+    corrected = correct_readout(noisy, MATRICES)
+    assert corrected == pytest.approx({label: 1000 * value for label, value in ideal.items()})
+
+
+def test_correct_readout_subspace_limits_outcomes(monkeypatch):
+    monkeypatch.setattr(mitigation, 'DENSE_READOUT_CLBITS', 1)
+    monkeypatch.setattr(mitigation, 'MAX_READOUT_OUTCOMES', 3)
+    with pytest.raises(ValueError):
+        correct_readout({'00': 1, '01': 1, '10': 1, '11': 1}, MATRICES)
+
+
+def test_correct_readout_empty():
+    assert correct_readout({}, MATRICES) == {}
+
+
+@pytest.mark.parametrize('extrapolation', ['richardson', 'linear'])
+def test_extrapolate_counts_linear_decay(extrapolation):
+    # P(00) falls linearly with the noise scale from 0.9 at zero noise
+    scales = (1, 3, 5)
+    scaled_counts = [{'00': 1000 * (0.9 - 0.05 * scale), '11': 1000 * (0.1 + 0.05 * scale)} for scale in scales]
+    counts = extrapolate_counts(scaled_counts, scales, extrapolation)
+    assert counts == pytest.approx({'00': 900, '11': 100})
+
+
+def test_extrapolate_counts_richardson_quadratic():
+    scales = (1, 3, 5)
+    scaled_counts = []
+    for scale in scales:
+        probability = 0.8 - 0.02 * scale - 0.01 * scale ** 2
+        scaled_counts.append({'0': 2000 * probability, '1': 2000 * (1 - probability)})
+    counts = extrapolate_counts(scaled_counts, scales)
+    assert counts['0'] == pytest.approx(1600)
+    assert counts['1'] == pytest.approx(400)
+
+
+def test_extrapolate_counts_unknown_extrapolation():
+    with pytest.raises(ValueError):
+        extrapolate_counts([{'0': 1}], (1,), 'cubic')
+
+
+def _bell_circuit():
+    qiskit = pytest.importorskip('qiskit')
+    circuit = qiskit.QuantumCircuit(2, 2)
+    circuit.h(0)
+    circuit.cx(0, 1)
+    circuit.measure([0, 1], [0, 1])
+    return circuit
+
+
+@pytest.mark.parametrize('scale', [1, 3, 5])
+def test_fold_circuit_scales(scale):
+    circuit = _bell_circuit()
+    from qiskit.quantum_info import Operator
+
+    folded = fold_circuit(circuit, scale)
+    operations = folded.count_ops()
+    assert operations.get('h', 0) == scale
+    assert operations.get('cx', 0) == scale
+    assert operations.get('measure', 0) == 2
+    assert Operator(folded.remove_final_measurements(inplace=False)).equiv(
+        Operator(circuit.remove_final_measurements(inplace=False)))
+
+
+@pytest.mark.parametrize('scale', [0, 2, -1])
+def test_fold_circuit_rejects_even_scales(scale):
+    with pytest.raises(ValueError):
+        fold_circuit(_bell_circuit(), scale)
+
+
+def test_prepare_translates_folds_to_noise_basis():
+    qiskit = pytest.importorskip('qiskit')
+    circuit = qiskit.QuantumCircuit(1, 1)
+    circuit.sx(0)
+    circuit.rz(0.3, 0)
+    circuit.measure(0, 0)
+    noise_model = SimpleNamespace(basis_gates=['sx', 'rz', 'x', 'cx'])
+    plan = ErrorMitigation(readout=False, zne_scales=(1, 3)).prepare(circuit, None, noise_model)
+    (folded,) = plan.circuits
+    assert set(folded.count_ops()) <= {'sx', 'rz', 'x', 'cx', 'barrier', 'measure'}
+    assert folded.count_ops()['barrier'] == 2
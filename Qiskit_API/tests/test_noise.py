@@ -0,0 +1,84 @@
+# Author: Jacob Thomas Redmond
+# MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import json
+
+import pytest
+
+pytest.importorskip('qiskit.providers.aer')
+
+from Qiskit_API.execute import noise
+from Qiskit_API.execute.noise import NoiseModelCache, resolve_backend, save_snapshot
+
+
+@pytest.fixture
+def stamp(monkeypatch):
+    # The calibration timestamp the cache sees; tests move it to simulate a recalibration
+    current = ['2024-01-01T00:00:00']
+    monkeypatch.setattr(noise, '_calibration_stamp', lambda backend: current[0])
+    return current
+
+
+def test_backend_models_are_memoized_by_calibration(stamp):
+    cache = NoiseModelCache()
+    backend = resolve_backend('fake_manila')
+    first = cache.get(backend)
+    assert cache.get(backend) is first
+    assert cache.builds == 1
+
+    stamp[0] = '2024-01-02T00:00:00'
+    second = cache.get(backend)
+    assert second is not first
+    assert cache.builds == 2
+
+
+def test_named_devices_are_rechecked_after_the_refresh_interval(stamp):
+    cache = NoiseModelCache()
+    first = cache.get('fake_manila')
+    stamp[0] = '2024-01-02T00:00:00'
+    assert cache.get('fake_manila') is first
+
+    cache.refresh_interval = 0
+    assert cache.get('fake_manila') is not first
+    assert cache.builds == 2
+
+
+def test_snapshots_of_one_device_get_their_own_models(tmp_path):
+    backend = resolve_backend('fake_manila')
+    paths = []
+    for day in (1, 2):
+        path = tmp_path / f"snapshot{day}.json"
+        save_snapshot(backend, str(path))
+        snapshot = json.loads(path.read_text())
+        snapshot['properties']['last_update_date'] = f"2024-01-0{day}T00:00:00+00:00"
+        path.write_text(json.dumps(snapshot))
+        paths.append(str(path))
+
+    cache = NoiseModelCache()
+    first = cache.get(paths[0])
+    assert cache.get(paths[0]) is first
+    assert cache.get(paths[1]) is not first
+    assert cache.builds == 2
+
+
+def test_device_keeps_the_coupling_map(stamp):
+    backend = resolve_backend('fake_manila')
+    device = NoiseModelCache().get_device(backend)
+    assert device.coupling_map == backend.configuration().coupling_map
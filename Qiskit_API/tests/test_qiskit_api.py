@@ -18,11 +18,30 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-# TODO: Implement test_qiskit_api.py
-def placeholder_function():
-    # TODO: Replace with actual code
-    pass
-
-# TODO: Content to be added
-# TODO: Content to be added
-# TODO: Content to be added
+import subprocess
+import sys
+
+import pytest
+
+import Qiskit_API
+from Qiskit_API.benchmarks.import_time import REPO_ROOT, measure_import
+
+
+@pytest.mark.parametrize('module_name', ['Qiskit_API', 'Qiskit_API.utilities'])
+def test_import_is_lazy(module_name):
+    assert measure_import(module_name)['heavy_modules'] == []
+    # Not even qiskit itself is loaded until a circuit is built
+    probe = f"import sys, {module_name}; print(any(m.split('.')[0] == 'qiskit' for m in sys.modules))"
+    completed = subprocess.run([sys.executable, '-c', probe], cwd=REPO_ROOT, capture_output=True, text=True,
+                               check=True)
+    assert completed.stdout.strip() == 'False'
+
+
+def test_lazy_attributes():
+    from Qiskit_API.execute.checkpoint import CheckpointStore
+
+    assert 'CheckpointStore' in dir(Qiskit_API)
+    assert Qiskit_API.CheckpointStore is CheckpointStore
+    assert vars(Qiskit_API)['CheckpointStore'] is CheckpointStore
+    with pytest.raises(AttributeError):
+        Qiskit_API.not_a_function
@@ -0,0 +1,70 @@
+# Author: Jacob Thomas Redmond
+# MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import pytest
+
+from Qiskit_API.visualizations.service import RenderCache, RenderService, render_key
+
+
+def _draw(text):
+    return text.encode('utf-8')
+
+
+def _fail():
+    raise RuntimeError('render failed')
+
+
+class _CheckingCache(RenderCache):
+    # Records whether the render was still pending when its image was stored
+    def __init__(self):
+        super().__init__()
+        self.pending_at_put = []
+
+    def put(self, key, data):
+        self.pending_at_put.append(key in self.service._pending)
+        super().put(key, data)
+
+
+def test_image_is_cached_before_the_pending_entry_is_dropped():
+    cache = _CheckingCache()
+    service = cache.service = RenderService(cache=cache)
+    key = render_key('text', 'hello')
+    assert service.render(key, _draw, 'hello', inline=True) == b'hello'
+    assert cache.pending_at_put == [True]
+    assert key not in service._pending
+
+    assert service.render(key, _draw, 'other', inline=True) == b'hello'
+    assert cache.hits == 1
+
+
+def test_failed_renders_are_not_cached():
+    service = RenderService()
+    key = render_key('text', 'fail')
+    with pytest.raises(RuntimeError):
+        service.render(key, _fail, inline=True)
+    assert len(service.cache) == 0
+    assert key not in service._pending
+
+
+def test_disk_cache_is_shared(tmp_path):
+    key = render_key('text', 'shared')
+    RenderService(cache=RenderCache(directory=str(tmp_path))).render(key, _draw, 'shared', inline=True)
+    other = RenderCache(directory=str(tmp_path))
+    assert other.get(key) == b'shared'
@@ -0,0 +1,114 @@
+# Author: Jacob Thomas Redmond
+# MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import threading
+
+import pytest
+
+pytest.importorskip('qiskit')
+
+from qiskit import QuantumCircuit
+
+from Qiskit_API.circuits.repository import CircuitRepository
+from Qiskit_API.circuits.update import apply_circuit_diff, diff_circuit_dicts, is_empty_diff
+from Qiskit_API.circuits.serialization import circuit_to_dict
+
+
+def _chain(num_gates, num_qubits=3, edited=None):
+    circuit = QuantumCircuit(num_qubits, name='chain')
+    for index in range(num_gates):
+        circuit.rx(3.0 if index == edited else 0.1 * index, index % num_qubits)
+    return circuit
+
+
+@pytest.fixture
+def repository():
+    with CircuitRepository() as repository:
+        yield repository
+
+
+def test_diffs_are_incremental():
+    old = circuit_to_dict(_chain(100))
+    new = circuit_to_dict(_chain(100, edited=50))
+    diff = diff_circuit_dicts(old, new)
+    assert not diff['fields']
+    assert diff['ops'] == [[50, 51, [new['instructions'][50]]]]
+    assert apply_circuit_diff(old, diff) == new
+    assert is_empty_diff(diff_circuit_dicts(old, old))
+
+
+def test_versions_round_trip(repository):
+    versions = [_chain(count) for count in (4, 6, 5)]
+    repository.create(versions[0], tags=['demo'])
+    for circuit in versions[1:]:
+        repository.update('chain', circuit)
+    # Storing the same circuit again does not create a version
+    summary = repository.update('chain', versions[-1], tags=['demo', 'edited'])
+    assert summary['version'] == 3
+    assert summary['tags'] == ['demo', 'edited']
+
+    assert [entry['version'] for entry in repository.history('chain')] == [1, 2, 3]
+    for number, circuit in enumerate(versions, start=1):
+        assert repository.get('chain', version=number) == circuit
+    assert repository.get('chain') == versions[-1]
+    assert repository.get('chain', version=4) is None
+
+
+def test_listing_and_deleting(repository):
+    repository.create(_chain(2), name='small', tags=['a'])
+    repository.create(_chain(30, num_qubits=5), name='large', tags=['a', 'b'])
+    with pytest.raises(ValueError):
+        repository.create(_chain(2), name='small')
+
+    assert [summary['name'] for summary in repository.list(tag='a')] == ['large', 'small']
+    assert [summary['name'] for summary in repository.list(num_qubits=5)] == ['large']
+    assert [summary['name'] for summary in repository.list(max_depth=1)] == ['small']
+    assert repository.delete('large')
+    assert not repository.delete('large')
+    assert len(repository) == 1 and 'small' in repository
+    with pytest.raises(ValueError):
+        repository.update('large', _chain(3))
+
+
+def test_concurrent_updates_get_distinct_versions(tmp_path):
+    path = str(tmp_path / 'circuits.db')
+    with CircuitRepository(path) as repository:
+        repository.create(_chain(1))
+    errors = []
+
+    def update(offset):
+        try:
+            with CircuitRepository(path) as repository:
+                for count in range(10):
+                    repository.update('chain', _chain(2 + 2 * count + offset))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=update, args=(offset,)) for offset in (0, 1)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    with CircuitRepository(path) as repository:
+        history = repository.history('chain')
+        assert [entry['version'] for entry in history] == list(range(1, 22))
+        # Every stored diff leads back to a readable version
+        assert all(repository.get('chain', version=entry['version']) is not None for entry in history)
@@ -0,0 +1,62 @@
+# Author: Jacob Thomas Redmond
+# MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import pytest
+
+from Qiskit_API.visualizations.results import aggregate_counts, counts_to_text
+
+
+def test_top_k_keeps_the_largest_outcomes():
+    counts = {'00': 50, '01': 30, '10': 15, '11': 5}
+    assert aggregate_counts(counts, k=3) == {'00': 50, '01': 30, 'other (2)': 20}
+    assert aggregate_counts(counts, k=4) == counts
+
+
+def test_top_k_keeps_float_counts():
+    aggregated = aggregate_counts({'00': 10.4, '01': 3.25, '10': 1.5}, k=2)
+    assert aggregated == pytest.approx({'00': 10.4, 'other (2)': 4.75})
+    assert all(isinstance(value, float) for value in aggregated.values())
+
+
+def test_integer_counts_stay_integers():
+    aggregated = aggregate_counts({'000': 6, '011': 3, '111': 1}, 'hamming')
+    assert aggregated == {'w=0': 6, 'w=1': 0, 'w=2': 3, 'w=3': 1}
+    assert all(isinstance(value, int) for value in aggregated.values())
+
+
+def test_hamming_with_float_counts():
+    aggregated = aggregate_counts({'000': 0.6, '011': 0.3, '111': 0.1}, 'hamming')
+    assert aggregated == pytest.approx({'w=0': 0.6, 'w=1': 0.0, 'w=2': 0.3, 'w=3': 0.1})
+
+
+def test_marginal_ignores_register_spaces():
+    counts = {'0 01': 5, '1 11': 2, '1 00': 4}
+    assert aggregate_counts(counts, 'marginal', qubits=[0]) == {'0': 4, '1': 7}
+    assert aggregate_counts(counts, 'marginal', qubits=[0, 2]) == {'01': 5, '10': 4, '11': 2}
+
+
+@pytest.mark.parametrize('kwargs', [{'mode': 'unknown'}, {'k': 1}, {'k': 0}, {'mode': 'marginal'}])
+def test_invalid_arguments(kwargs):
+    with pytest.raises(ValueError):
+        aggregate_counts({'0': 1, '1': 2}, **kwargs)
+
+
+def test_counts_to_text():
+    assert counts_to_text({'1': 1, '0': 2}).splitlines() == ['0 | ' + '#' * 50 + ' 2', '1 | ' + '#' * 25 + ' 1']
@@ -0,0 +1,122 @@
+# Author: Jacob Thomas Redmond
+# MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import math
+
+import pytest
+
+pytest.importorskip('qiskit')
+
+from qiskit import ClassicalRegister, QuantumCircuit, QuantumRegister
+from qiskit.circuit import Parameter
+
+from Qiskit_API.circuits.serialization import (CircuitArchive, CircuitArchiveWriter, circuit_content_hash,
+                                               circuit_from_dict, circuit_to_dict, is_circuit_archive,
+                                               write_circuit_archive)
+
+
+def _sample_circuit(name='sample', theta=0.3):
+    circuit = QuantumCircuit(QuantumRegister(2, 'q'), QuantumRegister(1, 'anc'), ClassicalRegister(2, 'c'),
+                             ClassicalRegister(1, 'flag'), name=name, global_phase=math.pi / 4)
+    circuit.h(0)
+    circuit.rz(theta, 1)
+    circuit.cx(0, 2)
+    circuit.delay(100, 1, unit='dt')
+    circuit.delay(2.5, 0, unit='us')
+    circuit.barrier()
+    circuit.measure([0, 1, 2], [0, 1, 2])
+    return circuit
+
+
+def test_round_trip_keeps_the_instruction_list():
+    circuit = _sample_circuit()
+    data = circuit_to_dict(circuit)
+    assert 'instructions' in data
+    assert data['qregs'] == [['q', 2], ['anc', 1]]
+    assert data['cregs'] == [['c', 2], ['flag', 1]]
+    assert data['global_phase'] == pytest.approx(math.pi / 4)
+
+    rebuilt = circuit_from_dict(data)
+    assert rebuilt == circuit
+    assert rebuilt.name == 'sample'
+    assert float(rebuilt.global_phase) == pytest.approx(math.pi / 4)
+    assert [(op.operation.duration, op.operation.unit) for op in rebuilt.data if op.operation.name == 'delay'] \
+        == [(100, 'dt'), (2.5, 'us')]
+
+
+def test_round_trip_keeps_parameters():
+    circuit = _sample_circuit(theta=Parameter('theta'))
+    rebuilt = circuit_from_dict(circuit_to_dict(circuit))
+    # Rebuilt parameters are new objects with the same name
+    assert [parameter.name for parameter in rebuilt.parameters] == ['theta']
+    assert rebuilt.assign_parameters([0.3]) == _sample_circuit()
+
+
+def test_global_phase_changes_the_content_hash():
+    circuit = QuantumCircuit(1)
+    circuit.h(0)
+    shifted = circuit.copy()
+    shifted.global_phase = math.pi
+    assert circuit_content_hash(circuit_to_dict(circuit)) != circuit_content_hash(circuit_to_dict(shifted))
+
+
+def test_qasm_fallback_keeps_the_global_phase():
+    custom = QuantumCircuit(2, name='custom')
+    custom.cx(0, 1)
+    circuit = QuantumCircuit(2, global_phase=0.5)
+    circuit.h(0)
+    circuit.append(custom.to_gate(), [0, 1])
+    data = circuit_to_dict(circuit)
+    assert 'qasm' in data
+    assert float(circuit_from_dict(data).global_phase) == pytest.approx(0.5)
+
+
+def test_parameterized_global_phase_uses_qpy():
+    circuit = QuantumCircuit(1, global_phase=Parameter('phi'))
+    circuit.h(0)
+    data = circuit_to_dict(circuit)
+    assert 'qpy' in data
+    assert str(circuit_from_dict(data).global_phase) == 'phi'
+
+
+def test_archive_round_trip(tmp_path):
+    path = str(tmp_path / 'circuits.jsonl')
+    circuits = [_sample_circuit(f"circuit{index}") for index in range(5)]
+    assert write_circuit_archive(path, circuits) == 5
+    assert is_circuit_archive(path)
+
+    with CircuitArchiveWriter(path, append=True) as writer:
+        writer.write(_sample_circuit('appended'))
+
+    with CircuitArchive(path) as archive:
+        assert len(archive) == 6
+        assert archive.names[-1] == 'appended'
+        assert archive['circuit3'] == circuits[3]
+        assert archive[-1].name == 'appended'
+        assert [circuit.name for circuit in archive.load()] == archive.names
+
+
+def test_archive_rebuilds_a_missing_index(tmp_path):
+    path = tmp_path / 'circuits.jsonl'
+    write_circuit_archive(str(path), [_sample_circuit(f"circuit{index}") for index in range(3)])
+    (tmp_path / 'circuits.jsonl.idx').unlink()
+    with CircuitArchive(str(path)) as archive:
+        assert archive.names == ['circuit0', 'circuit1', 'circuit2']
+        assert archive[1].name == 'circuit1'
@@ -20,20 +20,23 @@
 
 import logging
 import re
-from qiskit import QuantumCircuit, QiskitError
-from qiskit.quantum_info import Statevector
 
-# Setup logging
+# Output is configured once per process by structured_logging.setup_logging
 logger = logging.getLogger('QiskitAPI.Utilities')
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def validate_input(input_data, data_type):
+# Compiled once; sanitize_parameter and sanitize_payload run on every field of a request
+_SANITIZE_PATTERN = re.compile('[^0-9a-zA-Z]+')
+_SANITIZED_TYPES = (str, dict, list, tuple)
+
+def validate_input(input_data, data_type, log_success=False):
     """
     Validates the input data against the expected data type.
 
     Parameters:
         input_data: The data to validate.
         data_type: The type that input_data should be.
+        log_success (bool): Log an INFO line when validation passes (off by default, as
+            this runs once per field on large payloads).
 
     Returns:
         bool: True if input_data is valid, False otherwise.
@@ -41,12 +44,116 @@ def validate_input(input_data, data_type):
     try:
         if not isinstance(input_data, data_type):
             raise ValueError(f"Input must be of type {data_type.__name__}, got {type(input_data).__name__} instead.")
-        logger.info("Input validation passed.")
+        if log_success:
+            logger.info("Input validation passed.")
         return True
     except ValueError as e:
         logger.error(f"Input validation error: {e}")
         return False
 
+def _format_path(path):
+    # Paths are built as (parent, key) pairs and only joined when an error is reported
+    keys = []
+    while path is not None:
+        path, key = path
+        keys.append(f"[{key}]" if isinstance(key, int) else f".{key}")
+    return '$' + ''.join(reversed(keys))
+
+def _type_name(expected):
+    if isinstance(expected, tuple):
+        return ' or '.join(item.__name__ for item in expected)
+    return expected.__name__
+
+class CompiledSchema:
+    """
+    A payload schema turned into a single checking function (see compile_schema).
+    """
+
+    def __init__(self, check):
+        self.check = check
+
+def compile_schema(schema):
+    """
+    Compiles a payload schema so it can be applied repeatedly without re-interpreting it.
+
+    A schema is a type or tuple of types (checked with isinstance), a dict mapping
+    required keys to schemas (extra keys are allowed), or a one-element list whose
+    schema every item of a list or tuple must match.
+
+    Parameters:
+        schema: The schema to compile.
+
+    Returns:
+        CompiledSchema: The compiled schema.
+    """
+    if isinstance(schema, CompiledSchema):
+        return schema
+    if isinstance(schema, (type, tuple)):
+        expected = schema
+
+        def check(value, path, errors):
+            if not isinstance(value, expected):
+                errors.append(f"{_format_path(path)}: expected {_type_name(expected)}, got {type(value).__name__}")
+        return CompiledSchema(check)
+    if isinstance(schema, dict):
+        fields = [(key, compile_schema(value).check) for key, value in schema.items()]
+
+        def check(value, path, errors):
+            if not isinstance(value, dict):
+                errors.append(f"{_format_path(path)}: expected dict, got {type(value).__name__}")
+                return
+            for key, check_field in fields:
+                if key in value:
+                    check_field(value[key], (path, key), errors)
+                else:
+                    errors.append(f"{_format_path((path, key))}: missing required field")
+        return CompiledSchema(check)
+    if isinstance(schema, list) and len(schema) == 1:
+        item_schema = schema[0]
+        if isinstance(item_schema, (type, tuple)):
+            # Lists of scalars are the bulk of large payloads: check them without a call per item
+            expected = item_schema
+
+            def check(value, path, errors):
+                if not isinstance(value, (list, tuple)):
+                    errors.append(f"{_format_path(path)}: expected list, got {type(value).__name__}")
+                    return
+                for index, item in enumerate(value):
+                    if not isinstance(item, expected):
+                        errors.append(f"{_format_path((path, index))}: expected {_type_name(expected)}, "
+                                      f"got {type(item).__name__}")
+            return CompiledSchema(check)
+        check_item = compile_schema(item_schema).check
+
+        def check(value, path, errors):
+            if not isinstance(value, (list, tuple)):
+                errors.append(f"{_format_path(path)}: expected list, got {type(value).__name__}")
+                return
+            for index, item in enumerate(value):
+                check_item(item, (path, index), errors)
+        return CompiledSchema(check)
+    raise ValueError(f"Unsupported schema: {schema!r}")
+
+def validate_payload(payload, schema, log_success=False):
+    """
+    Validates a whole payload against a schema in one pass.
+
+    Parameters:
+        payload: The payload to validate.
+        schema: A schema (see compile_schema), ideally compiled once and reused.
+        log_success (bool): Log an INFO line when validation passes (off by default).
+
+    Returns:
+        list: One "path: message" string per problem found; empty if the payload is valid.
+    """
+    errors = []
+    compile_schema(schema).check(payload, None, errors)
+    if errors:
+        logger.error(f"Payload validation found {len(errors)} errors, first: {errors[0]}")
+    elif log_success:
+        logger.info("Payload validation passed.")
+    return errors
+
 def sanitize_parameter(parameter):
     """
     Sanitizes parameters to prevent injection attacks.
@@ -59,9 +166,39 @@ def sanitize_parameter(parameter):
     """
     if isinstance(parameter, str):
         # Simple sanitation, this would need to be more robust in a real-world scenario
-        return re.sub('[^0-9a-zA-Z]+', '', parameter)
+        return _SANITIZE_PATTERN.sub('', parameter)
     return parameter
 
+def sanitize_payload(payload):
+    """
+    Sanitizes every string in a nested payload of dicts, lists and tuples.
+
+    Strings are sanitized like sanitize_parameter; already-clean strings are kept
+    without running the regex. Dict keys are left unchanged.
+
+    Parameters:
+        payload: The payload to sanitize.
+
+    Returns:
+        A sanitized copy of the payload.
+    """
+    if isinstance(payload, str):
+        return payload if payload.isascii() and payload.isalnum() else _SANITIZE_PATTERN.sub('', payload)
+    if isinstance(payload, dict):
+        return {key: _sanitize_item(value) if isinstance(value, _SANITIZED_TYPES) else value
+                for key, value in payload.items()}
+    if isinstance(payload, (list, tuple)):
+        # Numbers, the bulk of circuit payloads, are passed through without a call
+        sanitized = [_sanitize_item(item) if isinstance(item, _SANITIZED_TYPES) else item for item in payload]
+        return sanitized if isinstance(payload, list) else tuple(sanitized)
+    return payload
+
+def _sanitize_item(item):
+    # Clean strings skip the regex
+    if isinstance(item, str):
+        return item if item.isascii() and item.isalnum() else _SANITIZE_PATTERN.sub('', item)
+    return sanitize_payload(item)
+
 def handle_error(error_msg, raise_exception=False):
     """
     Handles errors by logging them and optionally raising an exception.
@@ -87,6 +224,10 @@ def convert_to_qiskit_circuit(input_data):
     Returns:
         QuantumCircuit: A Qiskit QuantumCircuit object, or None if conversion fails.
     """
+    # qiskit is only needed here, so importing utilities stays cheap for the web and CLI layers
+    from qiskit import QuantumCircuit, QiskitError
+    from qiskit.quantum_info import Statevector
+
     try:
         # The actual conversion logic will depend on the expected input format.
         # Here we demonstrate a conversion from a Statevector.
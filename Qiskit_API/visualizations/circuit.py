@@ -0,0 +1,388 @@
+import io
+from bisect import bisect_left
+from html import escape
+
+from ..circuits.serialization import circuit_content_hash, circuit_to_dict
+from .service import default_service, render_key
+
+CIRCUIT_FORMATS = ('png', 'svg', 'text', 'light_svg')
+
+# Above this many instructions "auto" skips matplotlib and draws the lightweight SVG
+LARGE_CIRCUIT_GATES = 2000
+
+# Lightweight SVG geometry in pixels
+_COLUMN_WIDTH = 44
+_ROW_HEIGHT = 32
+_BOX_SIZE = 26
+_MARGIN = 48
+
+
+def _render_identity(circuit):
+    # circuit_to_dict keeps register names and the global phase (both drawn); a transpiled
+    # circuit's layout also labels its wires
+    layout = getattr(circuit, 'layout', None) or getattr(circuit, '_layout', None)
+    layout = getattr(layout, 'initial_layout', layout)
+    physical = layout.get_physical_bits() if hasattr(layout, 'get_physical_bits') else None
+    layout_key = None if not physical else sorted((index, repr(bit)) for index, bit in physical.items())
+    return circuit_content_hash(circuit_to_dict(circuit)), layout_key
+
+
+def circuit_layers(circuit):
+    """
+    Assign every instruction to the earliest layer after the instructions it depends on.
+
+    Args:
+        circuit (QuantumCircuit): The circuit.
+
+    Returns:
+        list: The layer index of each instruction in circuit.data.
+    """
+    wire_indices = {bit: index for index, bit in enumerate(circuit.qubits)}
+    wire_indices.update({bit: len(circuit.qubits) + index for index, bit in enumerate(circuit.clbits)})
+    next_free = [0] * len(wire_indices)
+    layers = []
+    for instruction in circuit.data:
+        wires = [wire_indices[bit] for bit in instruction.qubits] + [wire_indices[bit] for bit in instruction.clbits]
+        if not wires:
+            layers.append(0)
+            continue
+        low, high = min(wires), max(wires)
+        # A drawn gate spans every wire between its outermost ones
+        layer = max(next_free[low:high + 1])
+        for wire in range(low, high + 1):
+            next_free[wire] = layer + 1
+        layers.append(layer)
+    return layers
+
+
+def _svg_instruction(instruction, column, qubit_y, clbit_y):
+    # qubit_y maps a qubit to (y, visible); qubits outside a window sit on its top or bottom edge
+    operation = instruction.operation
+    x = _MARGIN + column * _COLUMN_WIDTH + _COLUMN_WIDTH // 2
+    qubit_points = [qubit_y(bit) for bit in instruction.qubits]
+    all_rows = [y for y, _ in qubit_points] + [clbit_y[bit] for bit in instruction.clbits]
+    visible_rows = [y for y, visible in qubit_points if visible]
+    if operation.name == 'barrier':
+        if not visible_rows:
+            return []
+        return [f'<line x1="{x}" y1="{min(visible_rows) - _BOX_SIZE // 2}" x2="{x}" '
+                f'y2="{max(visible_rows) + _BOX_SIZE // 2}" class="barrier"/>']
+    parts = []
+    if len(all_rows) > 1 and min(all_rows) != max(all_rows):
+        parts.append(f'<line x1="{x}" y1="{min(all_rows)}" x2="{x}" y2="{max(all_rows)}" class="link"/>')
+    controls = getattr(operation, 'num_ctrl_qubits', 0)
+    for y, visible in qubit_points[:controls]:
+        if visible:
+            parts.append(f'<circle cx="{x}" cy="{y}" r="4" class="control"/>')
+    label = 'M' if operation.name == 'measure' else getattr(getattr(operation, 'base_gate', None), 'name',
+                                                             operation.name)
+    half = _BOX_SIZE // 2
+    for y, visible in qubit_points[controls:]:
+        if visible:
+            parts.append(f'<rect x="{x - half}" y="{y - half}" width="{_BOX_SIZE}" height="{_BOX_SIZE}" '
+                         f'class="gate"/><text x="{x}" y="{y + 4}">{escape(label[:4])}</text>')
+    return parts
+
+
+def _svg_document(circuit, entries, first_layer, num_columns, first_qubit, num_rows):
+    # entries are (instruction, layer) pairs; rows show qubits first_qubit.. and then every clbit
+    qubit_indices = {bit: index - first_qubit for index, bit in enumerate(circuit.qubits)}
+    top = _MARGIN // 2
+    bottom = top + (num_rows - 1) * _ROW_HEIGHT
+
+    def qubit_y(bit):
+        row = qubit_indices[bit]
+        if row < 0:
+            return top - _ROW_HEIGHT // 2, False
+        if row >= num_rows:
+            return bottom + _ROW_HEIGHT // 2, False
+        return top + row * _ROW_HEIGHT, True
+
+    clbit_y = {bit: top + (num_rows + index) * _ROW_HEIGHT for index, bit in enumerate(circuit.clbits)}
+    width = 2 * _MARGIN + num_columns * _COLUMN_WIDTH
+    height = _MARGIN + (num_rows + len(clbit_y)) * _ROW_HEIGHT
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}" font-family="monospace" font-size="11">',
+        '<style>line{stroke:#000}.classical{stroke:#777;stroke-dasharray:4 2}.barrier{stroke:#999;'
+        'stroke-dasharray:2 2}.gate{fill:#fff;stroke:#33c}.control{fill:#000}text{text-anchor:middle}'
+        '.wire{text-anchor:end}</style>',
+    ]
+    wires = [(f"q{first_qubit + row}", top + row * _ROW_HEIGHT, '') for row in range(num_rows)]
+    wires += [(f"c{index}", y, ' class="classical"') for index, y in enumerate(clbit_y.values())]
+    for label, y, style in wires:
+        parts.append(f'<text x="{_MARGIN - 6}" y="{y + 4}" class="wire">{label}</text>'
+                     f'<line x1="{_MARGIN}" y1="{y}" x2="{width - _MARGIN}" y2="{y}"{style}/>')
+    for instruction, layer in entries:
+        parts.extend(_svg_instruction(instruction, layer - first_layer, qubit_y, clbit_y))
+    parts.append('</svg>')
+    return ''.join(parts)
+
+
+def circuit_to_svg(circuit, layers=None):
+    """
+    Draw a circuit as a compact SVG without matplotlib.
+
+    Gates are boxes labelled with their (truncated) name, controls are dots and
+    multi-wire instructions are joined by a vertical line. It costs a few string
+    operations per instruction, so it suits circuits too large for the mpl drawer.
+
+    Args:
+        circuit (QuantumCircuit): The circuit to draw.
+        layers (list, optional): Precomputed circuit_layers(circuit).
+
+    Returns:
+        str: The SVG document.
+    """
+    if layers is None:
+        layers = circuit_layers(circuit)
+    num_columns = max(layers) + 1 if layers else 0
+    return _svg_document(circuit, zip(circuit.data, layers), 0, num_columns, 0, len(circuit.qubits))
+
+
+def _draw_circuit(circuit, fmt, options):
+    # Runs in a render worker; an explicit Figure keeps pyplot's global state out of it
+    from matplotlib.figure import Figure
+
+    figure = Figure()
+    circuit.draw(output='mpl', ax=figure.add_subplot(), **options)
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format=fmt, bbox_inches='tight')
+    return buffer.getvalue()
+
+
+def _draw_circuit_light(circuit, fmt, options):
+    if fmt == 'text':
+        return str(circuit.draw(output='text', **options)).encode('utf-8')
+    return circuit_to_svg(circuit).encode('utf-8')
+
+
+def render_circuit_async(circuit, fmt='auto', service=None, **options):
+    """
+    Render a circuit image in the background, reusing the cached image of an identical circuit.
+
+    Args:
+        circuit (QuantumCircuit): The circuit to render.
+        fmt (str): One of CIRCUIT_FORMATS, or "auto" for PNG, or the lightweight
+            SVG for circuits over LARGE_CIRCUIT_GATES instructions.
+        service (RenderService, optional): Service to render with (default is the shared one).
+        **options: Extra circuit.draw options (style, fold, ...).
+
+    Returns:
+        Future: Resolves to the image bytes (UTF-8 text for "text", "svg" and "light_svg").
+
+    Raises:
+        ValueError: If the format is unknown.
+    """
+    if fmt == 'auto':
+        fmt = 'light_svg' if len(circuit.data) > LARGE_CIRCUIT_GATES else 'png'
+    if fmt not in CIRCUIT_FORMATS:
+        raise ValueError(f"Unknown circuit format {fmt!r}; expected 'auto' or one of {', '.join(CIRCUIT_FORMATS)}.")
+    service = service or default_service()
+    key = render_key('circuit', _render_identity(circuit), fmt, options)
+    if fmt in ('text', 'light_svg'):
+        return service.render_async(key, _draw_circuit_light, circuit, fmt, options, inline=True)
+    return service.render_async(key, _draw_circuit, circuit, fmt, options)
+
+
+def render_circuit(circuit, fmt='auto', service=None, **options):
+    """
+    Render a circuit image, reusing the cached image of an identical circuit.
+
+    Args:
+        circuit (QuantumCircuit): The circuit to render.
+        fmt (str): One of CIRCUIT_FORMATS, or "auto" (see render_circuit_async).
+        service (RenderService, optional): Service to render with (default is the shared one).
+        **options: Extra circuit.draw options.
+
+    Returns:
+        bytes or str: PNG bytes, or the text/SVG document as a string.
+    """
+    data = render_circuit_async(circuit, fmt, service, **options).result()
+    return data if data[:8] == b'\x89PNG\r\n\x1a\n' else data.decode('utf-8')
+
+
+class WindowedCircuit:
+    """
+    Draws layer and qubit windows of a large circuit on demand.
+
+    Layers are computed once when the object is created, together with an
+    index of the instructions in layer order, so drawing a window only touches
+    the instructions inside it. Windows are rendered lazily through the render
+    service and cached, so a viewer can scroll a circuit of tens of thousands of
+    gates one tile at a time.
+
+    Attributes:
+        circuit (QuantumCircuit): The circuit.
+        layers (list): The layer of each instruction in circuit.data (see circuit_layers).
+        num_layers (int): Number of layers.
+        layers_per_tile (int): Width of a tile in layers.
+        qubits_per_tile (int): Height of a tile in qubits.
+    """
+
+    def __init__(self, circuit, layers_per_tile=100, qubits_per_tile=32, service=None):
+        """
+        Initialize a WindowedCircuit.
+
+        Args:
+            circuit (QuantumCircuit): The circuit to draw. It must not be modified afterwards.
+            layers_per_tile (int): Width of a tile in layers (default is 100).
+            qubits_per_tile (int): Height of a tile in qubits (default is 32).
+            service (RenderService, optional): Service to render with (default is the shared one).
+        """
+        self.circuit = circuit
+        self.layers = circuit_layers(circuit)
+        self.num_layers = max(self.layers) + 1 if self.layers else 0
+        self.layers_per_tile = layers_per_tile
+        self.qubits_per_tile = qubits_per_tile
+        self.service = service
+        # Instruction indices by layer: those of layer L are _order[_layer_starts[L]:_layer_starts[L + 1]]
+        self._order = sorted(range(len(self.layers)), key=self.layers.__getitem__)
+        ordered_layers = [self.layers[index] for index in self._order]
+        self._layer_starts = [bisect_left(ordered_layers, layer) for layer in range(self.num_layers + 1)]
+        self._qubit_indices = {bit: index for index, bit in enumerate(circuit.qubits)}
+        self._identity = None
+
+    @property
+    def tile_shape(self):
+        """
+        Number of tiles as (qubit rows, layer columns).
+        """
+        return (-(-len(self.circuit.qubits) // self.qubits_per_tile), -(-self.num_layers // self.layers_per_tile))
+
+    def _bounds(self, layer_start, layer_stop, qubit_start, qubit_stop):
+        num_qubits = len(self.circuit.qubits)
+        layer_stop = self.num_layers if layer_stop is None else min(layer_stop, self.num_layers)
+        qubit_stop = num_qubits if qubit_stop is None else min(qubit_stop, num_qubits)
+        if not 0 <= layer_start < layer_stop or not 0 <= qubit_start < qubit_stop:
+            raise ValueError(f"Empty window: layers [{layer_start}, {layer_stop}), qubits [{qubit_start}, {qubit_stop}) "
+                             f"of a circuit with {self.num_layers} layers and {num_qubits} qubits.")
+        return layer_start, layer_stop, qubit_start, qubit_stop
+
+    def instructions(self, layer_start=0, layer_stop=None, qubit_start=0, qubit_stop=None):
+        """
+        List the instructions drawn in a window.
+
+        Args:
+            layer_start (int): First layer of the window.
+            layer_stop (int, optional): Layer after the last one (default is the end of the circuit).
+            qubit_start (int): First qubit of the window.
+            qubit_stop (int, optional): Qubit after the last one (default is the last qubit).
+
+        Returns:
+            list: (instruction, layer) pairs of the instructions acting on a qubit in the window.
+        """
+        layer_start, layer_stop, qubit_start, qubit_stop = self._bounds(layer_start, layer_stop, qubit_start,
+                                                                        qubit_stop)
+        data = self.circuit.data
+        entries = []
+        for index in self._order[self._layer_starts[layer_start]:self._layer_starts[layer_stop]]:
+            instruction = data[index]
+            if any(qubit_start <= self._qubit_indices[bit] < qubit_stop for bit in instruction.qubits):
+                entries.append((instruction, self.layers[index]))
+        return entries
+
+    def window_svg(self, layer_start=0, layer_stop=None, qubit_start=0, qubit_stop=None):
+        """
+        Draw a window as a lightweight SVG (see circuit_to_svg).
+
+        Gates crossing the window's qubit edges are drawn up to the edge.
+
+        Returns:
+            str: The SVG document.
+        """
+        entries = self.instructions(layer_start, layer_stop, qubit_start, qubit_stop)
+        layer_start, layer_stop, qubit_start, qubit_stop = self._bounds(layer_start, layer_stop, qubit_start,
+                                                                        qubit_stop)
+        return _svg_document(self.circuit, entries, layer_start, layer_stop - layer_start, qubit_start,
+                             qubit_stop - qubit_start)
+
+    def window_circuit(self, layer_start=0, layer_stop=None, qubit_start=0, qubit_stop=None):
+        """
+        Build a circuit holding a window, for the mpl and text drawers.
+
+        Gates crossing the window's qubit edges are cut to the qubits inside it and
+        shown as opaque gates named after the original with a trailing "*".
+
+        Returns:
+            QuantumCircuit: The window over the window's qubits and every clbit.
+        """
+        from qiskit import QuantumCircuit
+        from qiskit.circuit import Barrier, Gate
+
+        entries = self.instructions(layer_start, layer_stop, qubit_start, qubit_stop)
+        layer_start, layer_stop, qubit_start, qubit_stop = self._bounds(layer_start, layer_stop, qubit_start,
+                                                                        qubit_stop)
+        qubits = self.circuit.qubits[qubit_start:qubit_stop]
+        inside = set(qubits)
+        window = QuantumCircuit(qubits, self.circuit.clbits, name=f"{self.circuit.name}[{layer_start}:{layer_stop}]")
+        for instruction, _ in entries:
+            kept = [bit for bit in instruction.qubits if bit in inside]
+            if len(kept) == len(instruction.qubits):
+                window.append(instruction.operation, instruction.qubits, instruction.clbits)
+            elif instruction.operation.name == 'barrier':
+                window.append(Barrier(len(kept)), kept)
+            else:
+                window.append(Gate(f"{instruction.operation.name}*", len(kept), []), kept)
+        return window
+
+    def render_window_async(self, layer_start=0, layer_stop=None, qubit_start=0, qubit_stop=None, fmt='light_svg',
+                            **options):
+        """
+        Render a window in the background, reusing a cached image of the same window.
+
+        Args:
+            layer_start, layer_stop, qubit_start, qubit_stop: The window (see instructions).
+            fmt (str): One of CIRCUIT_FORMATS (default is "light_svg").
+            **options: Extra circuit.draw options for the other formats.
+
+        Returns:
+            Future: Resolves to the image bytes (UTF-8 text for "text", "svg" and "light_svg").
+        """
+        if fmt not in CIRCUIT_FORMATS:
+            raise ValueError(f"Unknown circuit format {fmt!r}; expected one of {', '.join(CIRCUIT_FORMATS)}.")
+        bounds = self._bounds(layer_start, layer_stop, qubit_start, qubit_stop)
+        if self._identity is None:
+            self._identity = _render_identity(self.circuit)
+        service = self.service or default_service()
+        key = render_key('circuit-window', self._identity, bounds, fmt, options)
+        if fmt == 'light_svg':
+            return service.render_async(key, _encoded_window_svg, self, bounds, inline=True)
+        window = self.window_circuit(*bounds)
+        if fmt == 'text':
+            return service.render_async(key, _draw_circuit_light, window, fmt, options, inline=True)
+        return service.render_async(key, _draw_circuit, window, fmt, options)
+
+    def render_window(self, layer_start=0, layer_stop=None, qubit_start=0, qubit_stop=None, fmt='light_svg',
+                      **options):
+        """
+        Blocking form of render_window_async.
+
+        Returns:
+            bytes or str: PNG bytes, or the text/SVG document as a string.
+        """
+        data = self.render_window_async(layer_start, layer_stop, qubit_start, qubit_stop, fmt, **options).result()
+        return data if data[:8] == b'\x89PNG\r\n\x1a\n' else data.decode('utf-8')
+
+    def tile(self, row, column, fmt='light_svg', **options):
+        """
+        Render one tile of the grid given by layers_per_tile and qubits_per_tile.
+
+        Args:
+            row (int): Tile row (qubits row * qubits_per_tile onwards).
+            column (int): Tile column (layers column * layers_per_tile onwards).
+            fmt (str): One of CIRCUIT_FORMATS (default is "light_svg").
+            **options: Extra circuit.draw options for the other formats.
+
+        Returns:
+            bytes or str: PNG bytes, or the text/SVG document as a string.
+        """
+        layer_start = column * self.layers_per_tile
+        qubit_start = row * self.qubits_per_tile
+        return self.render_window(layer_start, layer_start + self.layers_per_tile, qubit_start,
+                                  qubit_start + self.qubits_per_tile, fmt, **options)
+
+
+def _encoded_window_svg(windowed, bounds):
+    return windowed.window_svg(*bounds).encode('utf-8')
@@ -0,0 +1,254 @@
+import io
+from html import escape
+
+import numpy as np
+
+from .service import default_service, render_key
+
+HISTOGRAM_FORMATS = ('png', 'svg', 'text', 'light_svg')
+
+AGGREGATION_MODES = ('top_k', 'hamming', 'marginal')
+
+# Histograms never draw more bars than this; larger results are reduced to their top outcomes
+MAX_HISTOGRAM_BARS = 64
+
+OTHER_LABEL = 'other'
+
+# Above this many bars "auto" skips matplotlib and draws the lightweight SVG
+LARGE_HISTOGRAM_BARS = 256
+
+# Lightweight SVG geometry in pixels
+_BAR_WIDTH = 14
+_CHART_HEIGHT = 200
+_MARGIN = 40
+_TEXT_BAR_WIDTH = 50
+
+
+def counts_hash(counts):
+    """
+    Hash measurement counts independently of their order.
+
+    Args:
+        counts (dict): Bitstring -> count.
+
+    Returns:
+        str: Hex SHA-256 digest.
+    """
+    return render_key(sorted(counts.items()))
+
+
+def _bit_matrix(labels):
+    # One row of 0/1 per bitstring, parsed in a single pass over the joined labels
+    if ' ' in labels[0]:
+        labels = [label.replace(' ', '') for label in labels]
+    width = len(labels[0])
+    data = ''.join(labels).encode('ascii')
+    if len(data) != width * len(labels):
+        raise ValueError("All bitstrings must have the same number of bits.")
+    bits = np.frombuffer(data, dtype=np.uint8).reshape(len(labels), width) - ord('0')
+    if bits.max(initial=0) > 1:
+        raise ValueError("Counts must be keyed by bitstrings to be aggregated.")
+    return bits
+
+
+def _top_k(labels, values, k, integral):
+    convert = int if integral else float
+    if len(values) <= k:
+        return {label: convert(value) for label, value in zip(labels, values.tolist())}
+    # The largest k - 1 outcomes keep their own bar; the rest share the "other" bar
+    keep = np.argpartition(values, len(values) - (k - 1))[len(values) - (k - 1):]
+    rest = np.ones(len(values), dtype=bool)
+    rest[keep] = False
+    top = {labels[index]: convert(values[index]) for index in keep.tolist()}
+    top[f"{OTHER_LABEL} ({len(values) - len(keep)})"] = convert(values[rest].sum())
+    return top
+
+
+def aggregate_counts(counts, mode='top_k', k=MAX_HISTOGRAM_BARS, qubits=None):
+    """
+    Reduce counts to at most k bars for plotting.
+
+    The bitstrings are parsed into a bit matrix once and every mode works on
+    whole arrays, so a million outcomes aggregate in well under a second.
+
+    Args:
+        counts (dict): Bitstring -> count (clbit 0 rightmost; register spaces are ignored).
+            Counts may be floats, e.g. mitigated counts; results are ints only when every
+            count is an int.
+        mode (str): One of AGGREGATION_MODES:
+            "top_k" keeps the k - 1 most frequent outcomes and sums the rest into an "other" bar;
+            "hamming" sums outcomes by their number of 1 bits, labelled "w=<weight>";
+            "marginal" sums over every bit except the given qubits, labelled by their bitstring.
+        k (int): Maximum number of bars, at least 2 (one outcome and the "other" bar);
+            "hamming" and "marginal" results are reduced with "top_k" when they have more.
+        qubits (sequence, optional): Bit indices kept by "marginal", the first one rightmost
+            (as in qiskit's marginal_counts).
+
+    Returns:
+        dict: Label -> count.
+
+    Raises:
+        ValueError: If the mode is unknown, k is below 2, "marginal" has no qubits, or the
+            bitstrings are malformed.
+    """
+    if mode not in AGGREGATION_MODES:
+        raise ValueError(f"Unknown aggregation mode {mode!r}; expected one of {', '.join(AGGREGATION_MODES)}.")
+    if k < 2:
+        raise ValueError(f"Cannot aggregate into {k} bars; k must be at least 2 (one outcome and the "
+                         f"\"{OTHER_LABEL}\" bar).")
+    if not counts:
+        return {}
+    labels = list(counts)
+    # Summed as float64, which keeps integer counts exact up to 2**53 shots
+    values = np.fromiter(counts.values(), dtype=np.float64, count=len(labels))
+    integral = all(isinstance(value, (int, np.integer)) for value in counts.values())
+    if mode == 'top_k':
+        return _top_k(labels, values, k, integral)
+
+    bits = _bit_matrix(labels)
+    width = bits.shape[1]
+    if mode == 'hamming':
+        totals = np.bincount(bits.sum(axis=1), weights=values, minlength=width + 1)
+        labels = [f"w={weight}" for weight in range(width + 1)]
+    else:
+        if not qubits:
+            raise ValueError("Marginal aggregation needs the qubits to keep.")
+        if any(not 0 <= qubit < width for qubit in qubits):
+            raise ValueError(f"Qubits {list(qubits)} are out of range for {width}-bit outcomes.")
+        # Column of bit i is width - 1 - i; the last kept qubit becomes the most significant bit
+        columns = width - 1 - np.asarray(qubits)[::-1]
+        weights = np.left_shift(1, np.arange(len(columns) - 1, -1, -1, dtype=np.int64))
+        keys, inverse = np.unique(bits[:, columns].astype(np.int64) @ weights, return_inverse=True)
+        totals = np.bincount(inverse.ravel(), weights=values, minlength=len(keys))
+        labels = [format(key, f"0{len(columns)}b") for key in keys.tolist()]
+    return _top_k(labels, totals, k, integral)
+
+
+def counts_to_svg(counts):
+    """
+    Draw counts as a bar chart in SVG without matplotlib.
+
+    Args:
+        counts (dict): Label -> count, drawn in sorted label order.
+
+    Returns:
+        str: The SVG document.
+    """
+    items = sorted(counts.items())
+    peak = max((count for _, count in items), default=0) or 1
+    width = 2 * _MARGIN + len(items) * _BAR_WIDTH
+    height = _CHART_HEIGHT + 2 * _MARGIN
+    base = _MARGIN + _CHART_HEIGHT
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}" font-family="monospace" font-size="9">',
+        '<style>rect{fill:#648fff}text{text-anchor:end}</style>',
+        f'<line x1="{_MARGIN}" y1="{base}" x2="{width - _MARGIN}" y2="{base}" stroke="#000"/>',
+        f'<text x="{_MARGIN - 4}" y="{_MARGIN + 4}">{peak}</text>',
+    ]
+    for index, (label, count) in enumerate(items):
+        x = _MARGIN + index * _BAR_WIDTH
+        bar = _CHART_HEIGHT * count / peak
+        parts.append(f'<rect x="{x + 1}" y="{base - bar:.1f}" width="{_BAR_WIDTH - 2}" height="{bar:.1f}">'
+                     f'<title>{escape(str(label))}: {count}</title></rect>')
+        if len(items) <= LARGE_HISTOGRAM_BARS:
+            center = x + _BAR_WIDTH // 2
+            parts.append(f'<text x="{center}" y="{base + 6}" transform="rotate(-90 {center} {base + 6})">'
+                         f'{escape(str(label))}</text>')
+    parts.append('</svg>')
+    return ''.join(parts)
+
+
+def counts_to_text(counts):
+    """
+    Draw counts as a text bar chart, one line per label.
+
+    Args:
+        counts (dict): Label -> count.
+
+    Returns:
+        str: The chart.
+    """
+    items = sorted(counts.items())
+    peak = max((count for _, count in items), default=0) or 1
+    label_width = max((len(str(label)) for label, _ in items), default=0)
+    return ''.join(f"{str(label):>{label_width}} | {'#' * round(_TEXT_BAR_WIDTH * count / peak)} {count}\n"
+                   for label, count in items)
+
+
+def _draw_histogram(counts, fmt, options):
+    # Runs in a render worker; an explicit Figure keeps pyplot's global state out of it
+    from matplotlib.figure import Figure
+    from qiskit.visualization import plot_histogram
+
+    figure = Figure()
+    plot_histogram(counts, ax=figure.add_subplot(), **options)
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format=fmt, bbox_inches='tight')
+    return buffer.getvalue()
+
+
+def _draw_histogram_light(counts, fmt, options):
+    return (counts_to_text(counts) if fmt == 'text' else counts_to_svg(counts)).encode('utf-8')
+
+
+def render_histogram_async(counts, fmt='auto', service=None, mode=None, k=MAX_HISTOGRAM_BARS, qubits=None,
+                           **options):
+    """
+    Render a histogram of counts in the background, reusing the cached image of identical bars.
+
+    Counts with more than k outcomes are always aggregated first (with "top_k"
+    unless another mode is given), so the rendering cost does not grow with
+    the number of outcomes.
+
+    Args:
+        counts (dict): Bitstring -> count.
+        fmt (str): One of HISTOGRAM_FORMATS, or "auto" for PNG, or the lightweight
+            SVG for more than LARGE_HISTOGRAM_BARS bars.
+        service (RenderService, optional): Service to render with (default is the shared one).
+        mode (str, optional): Aggregation mode (see aggregate_counts).
+        k (int): Maximum number of bars (default is MAX_HISTOGRAM_BARS).
+        qubits (sequence, optional): Qubits kept by the "marginal" mode.
+        **options: Extra plot_histogram options (title, color, ...).
+
+    Returns:
+        Future: Resolves to the image bytes (UTF-8 text for "text", "svg" and "light_svg").
+
+    Raises:
+        ValueError: If the format or aggregation mode is unknown, or k is below 2 when aggregating.
+    """
+    if fmt != 'auto' and fmt not in HISTOGRAM_FORMATS:
+        raise ValueError(f"Unknown histogram format {fmt!r}; expected 'auto' or one of "
+                         f"{', '.join(HISTOGRAM_FORMATS)}.")
+    if mode is not None or len(counts) > k:
+        counts = aggregate_counts(counts, mode or 'top_k', k, qubits)
+    else:
+        counts = dict(counts)
+    if fmt == 'auto':
+        fmt = 'light_svg' if len(counts) > LARGE_HISTOGRAM_BARS else 'png'
+    service = service or default_service()
+    # Keyed by the bars actually drawn, so hashing stays cheap for huge results
+    key = render_key('histogram', counts_hash(counts), fmt, options)
+    if fmt in ('text', 'light_svg'):
+        return service.render_async(key, _draw_histogram_light, counts, fmt, options, inline=True)
+    return service.render_async(key, _draw_histogram, counts, fmt, options)
+
+
+def render_histogram(counts, fmt='auto', service=None, mode=None, k=MAX_HISTOGRAM_BARS, qubits=None, **options):
+    """
+    Render a histogram of counts, reusing the cached image of identical bars.
+
+    Args:
+        counts (dict): Bitstring -> count.
+        fmt (str): One of HISTOGRAM_FORMATS, or "auto" (see render_histogram_async).
+        service (RenderService, optional): Service to render with (default is the shared one).
+        mode (str, optional): Aggregation mode (see aggregate_counts).
+        k (int): Maximum number of bars (default is MAX_HISTOGRAM_BARS).
+        qubits (sequence, optional): Qubits kept by the "marginal" mode.
+        **options: Extra plot_histogram options.
+
+    Returns:
+        bytes or str: PNG bytes, or the text/SVG document as a string.
+    """
+    data = render_histogram_async(counts, fmt, service, mode, k, qubits, **options).result()
+    return data if data[:8] == b'\x89PNG\r\n\x1a\n' else data.decode('utf-8')
@@ -0,0 +1,219 @@
+import atexit
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+
+
+def render_key(*parts):
+    """
+    Build a cache key from JSON-serializable parts (kind, content hash, format, options, ...).
+
+    Returns:
+        str: Hex SHA-256 digest of the parts.
+    """
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+class RenderCache:
+    """
+    Rendered images keyed by render_key, in memory and optionally on disk.
+
+    The in-memory layer is an LRU bounded by total size. The disk layer, when a
+    directory is given, is shared by every process using that directory, so
+    dashboards served by several workers render each image once.
+
+    Attributes:
+        max_bytes (int): Size budget of the in-memory layer.
+        directory (str or None): Directory of the disk layer.
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups that found nothing.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES, directory=None):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def get(self, key):
+        """
+        Look up a rendered image.
+
+        Args:
+            key (str): A render_key digest.
+
+        Returns:
+            bytes: The image, or None if it is not cached.
+        """
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return data
+        if self.directory:
+            try:
+                with open(os.path.join(self.directory, key), 'rb') as file:
+                    data = file.read()
+            except FileNotFoundError:
+                pass
+            else:
+                self._remember(key, data)
+                self.hits += 1
+                return data
+        self.misses += 1
+        return None
+
+    def put(self, key, data):
+        """
+        Store a rendered image.
+
+        Args:
+            key (str): A render_key digest.
+            data (bytes): The image.
+        """
+        self._remember(key, data)
+        if self.directory:
+            path = os.path.join(self.directory, key)
+            temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temporary, 'wb') as file:
+                file.write(data)
+            os.replace(temporary, path)
+
+    def _remember(self, key, data):
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def _init_worker():
+    # Workers never open windows; Agg renders PNG and the SVG backend is always available
+    import matplotlib
+
+    matplotlib.use('Agg')
+
+
+class RenderService:
+    """
+    Renders images in a pool of worker processes and caches them.
+
+    Matplotlib is neither fast nor thread-safe, so figures are drawn in separate
+    processes with the non-interactive Agg backend. Concurrent requests for the
+    same key share one render.
+
+    Attributes:
+        cache (RenderCache): Cache of rendered images.
+        max_workers (int or None): Size of the process pool (None uses the CPU count).
+    """
+
+    def __init__(self, max_workers=None, cache=None):
+        self.cache = cache if cache is not None else RenderCache()
+        self.max_workers = max_workers
+        self._executor = None
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def render_async(self, key, function, *args, inline=False):
+        """
+        Return the cached image for key, or render it with function(*args).
+
+        Args:
+            key (str): A render_key digest identifying the image.
+            function (callable): Module-level function returning the image as bytes.
+            *args: Picklable arguments for function.
+            inline (bool): Run function in the calling thread instead of the pool
+                (for cheap renderers that do not use matplotlib).
+
+        Returns:
+            Future: Resolves to the image bytes.
+        """
+        data = self.cache.get(key)
+        if data is not None:
+            future = Future()
+            future.set_result(data)
+            return future
+        with self._lock:
+            future = self._pending.get(key)
+            if future is not None:
+                return future
+            if inline:
+                future = Future()
+            else:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(self.max_workers, initializer=_init_worker)
+                future = self._executor.submit(function, *args)
+            self._pending[key] = future
+        if inline:
+            try:
+                future.set_result(function(*args))
+            except Exception as e:
+                future.set_exception(e)
+        future.add_done_callback(lambda done: self._finish(key, done))
+        return future
+
+    def render(self, key, function, *args, inline=False):
+        """
+        Blocking form of render_async.
+
+        Returns:
+            bytes: The image.
+        """
+        return self.render_async(key, function, *args, inline=inline).result()
+
+    def _finish(self, key, future):
+        # Cache the image before dropping the pending entry, so no request in between renders it again
+        if not future.cancelled() and future.exception() is None:
+            self.cache.put(key, future.result())
+        with self._lock:
+            self._pending.pop(key, None)
+
+    def shutdown(self):
+        """
+        Stop the worker processes.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+
+_default_service = None
+_default_lock = threading.Lock()
+
+
+def default_service():
+    """
+    Return the process-wide RenderService, creating it on first use.
+
+    Set QISKIT_API_RENDER_CACHE_DIR to share rendered images between processes.
+
+    Returns:
+        RenderService: The shared service.
+    """
+    global _default_service
+    with _default_lock:
+        if _default_service is None:
+            _default_service = RenderService(cache=RenderCache(directory=os.environ.get('QISKIT_API_RENDER_CACHE_DIR')))
+            atexit.register(_default_service.shutdown)
+        return _default_service
@@ -19,15 +19,18 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from flask import Flask, jsonify, request, render_template, session
+from flask import Flask, Response, g, jsonify, request, render_template, session
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from flask_sslify import SSLify
-from qiskit import execute, Aer
-from authentication import authenticate_user
-from utilities import handle_error, validate_input, sanitize_parameter
-import logging
+from .authentication import authenticate_user
+from .utilities import compile_schema, handle_error, sanitize_payload, validate_payload
+from .structured_logging import setup_logging
+from .metrics import HTTP_REQUEST_SECONDS, REGISTRY
+from .profiling import RequestProfiler
+from .execute.checkpoint import CheckpointStore, request_hash
 import os
+import time
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -43,9 +46,77 @@ limiter = Limiter(
     default_limits=["200 per day", "50 per hour"]
 )
 
-# Configure logging
-logging.basicConfig(filename='web_interface.log', level=logging.INFO,
-                    format='%(asctime)s - %(levelname)s - %(message)s')
+def execute_with_aer(circuit_data):
+    # qiskit and Aer are loaded by the first execution request rather than at startup
+    from qiskit import QuantumCircuit, execute, Aer
+
+    # Create a quantum circuit from the sanitized input data
+    circuit = QuantumCircuit.from_qasm_str(circuit_data['qasm'])
+    backend = Aer.get_backend('qasm_simulator')
+    job = execute(circuit, backend)
+    return job.result().get_counts(circuit)
+
+# Runs the circuit data of an execute request and returns its counts; load tests swap in a fake backend here
+app.config['CIRCUIT_EXECUTOR'] = execute_with_aer
+
+# Execute requests are checked against this in one pass; extra circuit fields are allowed
+EXECUTE_REQUEST_SCHEMA = compile_schema({'circuit': {'qasm': str}})
+
+# Responses of execute requests sent with an Idempotency-Key header, replayed when clients retry;
+# set QISKIT_API_IDEMPOTENCY_DB to keep them across restarts and share them between workers
+app.config['IDEMPOTENCY_STORE'] = CheckpointStore(os.environ.get('QISKIT_API_IDEMPOTENCY_DB', ':memory:'))
+
+# Configure logging: JSON lines written by a background thread, off the request path
+setup_logging(filename='web_interface.log')
+
+# Opt-in profiling of slow requests, enabled by setting QISKIT_API_PROFILE_DIR
+profiler = RequestProfiler.from_environment()
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+    if profiler is not None and request.endpoint in PROFILED_ENDPOINTS:
+        g.request_profile = profiler.start(request.url_rule.rule, method=request.method)
+
+@app.after_request
+def record_request_metrics(response):
+    start = g.pop('request_start', None)
+    if start is not None:
+        endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - start, request.method, endpoint, response.status_code)
+    handle = g.pop('request_profile', None)
+    if handle is not None:
+        profiler.finish(handle, status=response.status_code)
+    return response
+
+@app.route('/metrics')
+@limiter.exempt
+def metrics():
+    # Prometheus text exposition format
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
+def _authorized():
+    auth_header = request.headers.get('Authorization')
+    return bool(auth_header) and authenticate_user(auth_header)
+
+@app.route('/admin/profiles')
+@limiter.exempt
+def list_profiles():
+    if not _authorized():
+        return jsonify({"error": "Unauthorized"}), 401
+    if profiler is None:
+        return jsonify({"error": "Profiling is not enabled"}), 404
+    return jsonify(profiler.store.list())
+
+@app.route('/admin/profiles/<profile_id>')
+@limiter.exempt
+def get_profile(profile_id):
+    if not _authorized():
+        return jsonify({"error": "Unauthorized"}), 401
+    profile = profiler.store.load(profile_id) if profiler is not None else None
+    if profile is None:
+        return jsonify({"error": "Profile not found"}), 404
+    return jsonify(profile)
 
 @app.route('/')
 def index():
@@ -60,25 +131,49 @@ def execute_quantum_circuit():
     if not auth_header or not authenticate_user(auth_header):
         return jsonify({"error": "Unauthorized"}), 401
 
-    # Validate and sanitize input
-    circuit_data = request.json.get('circuit')
-    if not validate_input(circuit_data, dict):
-        return jsonify({"error": "Invalid circuit data"}), 400
-    sanitized_circuit_data = sanitize_parameter(circuit_data)
+    # Validate the whole payload, then sanitize it
+    payload = request.get_json(silent=True)
+    errors = validate_payload(payload, EXECUTE_REQUEST_SCHEMA)
+    if errors:
+        return jsonify({"error": "Invalid circuit data", "details": errors}), 400
+    circuit_data = payload['circuit']
+    # The OpenQASM source only goes to the qiskit parser, and stripping its punctuation would
+    # make it unparseable; every other field is sanitized
+    sanitized_circuit_data = sanitize_payload({key: value for key, value in circuit_data.items() if key != 'qasm'})
+    sanitized_circuit_data['qasm'] = circuit_data['qasm']
 
-    # Create a quantum circuit from the sanitized input data
-    # Placeholder: Convert the sanitized_circuit_data into a Qiskit QuantumCircuit object
-    # circuit = convert_to_qiskit_circuit(sanitized_circuit_data)
+    # A retried request with the same key is answered from the store instead of executing again
+    idempotency_key = request.headers.get('Idempotency-Key')
+    store = app.config['IDEMPOTENCY_STORE']
+    if idempotency_key:
+        # Keys are scoped to the credentials that sent them, so clients cannot replay each other's results
+        idempotency_key = f"{request_hash(auth_header)[:16]}:{idempotency_key}"
+        try:
+            previous = store.begin_request(idempotency_key, request_hash(sanitized_circuit_data))
+        except ValueError:
+            return jsonify({"error": "Idempotency key was already used for a different request"}), 422
+        if previous is not None:
+            if previous['status'] == 'running':
+                return jsonify({"error": "A request with this idempotency key is in progress"}), 409
+            response = jsonify(previous['response'])
+            response.status_code = previous['status_code']
+            response.headers['Idempotent-Replayed'] = 'true'
+            return response
 
     try:
         # Execute the quantum circuit
-        backend = Aer.get_backend('qasm_simulator')
-        job = execute(circuit, backend)
-        result = job.result().get_counts(circuit)
-        return jsonify(result)
+        result = app.config['CIRCUIT_EXECUTOR'](sanitized_circuit_data)
     except Exception as e:
+        if idempotency_key:
+            store.release_request(idempotency_key)
         handle_error(f"Quantum execution error: {e}", raise_exception=False)
         return jsonify({"error": "Internal server error"}), 500
+    if idempotency_key:
+        store.finish_request(idempotency_key, 200, result)
+    return jsonify(result)
+
+# Endpoints whose requests may be profiled (the admin and metrics endpoints never are)
+PROFILED_ENDPOINTS = {'execute_quantum_circuit'}
 
 def start_web_server():
     # Configure the Flask web server